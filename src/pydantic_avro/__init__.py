@@ -1,3 +1,27 @@
-from pydantic_avro.to_avro.base import AvroBase as AvroBase
+import importlib
+
+# Not imported from typing, importing typing takes longer than importing this package
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pydantic_avro.to_avro.base import AvroBase as AvroBase
 
 __all__ = ["AvroBase"]
+
+# Attributes and submodules are imported on first access, so importing the package does not import pydantic,
+# the binary serialization, the code generation or the CLI
+_LAZY_ATTRIBUTES = {"AvroBase": "pydantic_avro.to_avro.base"}
+_LAZY_SUBMODULES = {"base", "binary", "from_avro", "profiling", "to_avro"}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY_ATTRIBUTES, *_LAZY_SUBMODULES})
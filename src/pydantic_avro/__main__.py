@@ -1,6 +1,11 @@
 import argparse
+import glob
+import importlib
+import json
+import os
 import sys
-from typing import List
+from contextlib import ExitStack
+from typing import Any, Dict, List
 
 from pydantic_avro.from_avro.avro_to_pydantic import convert_file
 
@@ -12,11 +17,83 @@ def main(input_args: List[str]):
     parser_cache = subparsers.add_parser("avro_to_pydantic")
     parser_cache.add_argument("--asvc", type=str, dest="avsc", required=True)
     parser_cache.add_argument("--output", type=str, dest="output")
+    parser_cache.add_argument("--serializers", action="store_true", dest="serializers")
+    parser_cache.add_argument("--slots", action="store_true", dest="slots")
+
+    parser_precompute = subparsers.add_parser("precompute_schemas")
+    parser_precompute.add_argument("--module", type=str, dest="modules", action="append", required=True)
+    parser_precompute.add_argument("--output", type=str, dest="output", required=True)
+
+    parser_concat = subparsers.add_parser("concat_ocf")
+    parser_concat.add_argument("--input", type=str, dest="inputs", action="append", required=True)
+    parser_concat.add_argument("--output", type=str, dest="output", required=True)
+    parser_concat.add_argument("--codec", type=str, dest="codec")
+    parser_concat.add_argument("--block_size", type=int, dest="block_size")
+    parser_concat.add_argument("--workers", type=int, dest="workers", default=0)
+
+    parser_json = subparsers.add_parser("json_to_avro")
+    json_schema = parser_json.add_mutually_exclusive_group(required=True)
+    # The model is given as module:Class, like --module of precompute_schemas relative to the working directory
+    json_schema.add_argument("--model", type=str, dest="model")
+    json_schema.add_argument("--avsc", type=str, dest="avsc")
+    # Lines are read from stdin by default
+    parser_json.add_argument("--input", type=str, dest="input", default="-")
+    parser_json.add_argument("--output", type=str, dest="output", required=True)
+    parser_json.add_argument("--format", type=str, dest="json_format", default="pydantic")
+    parser_json.add_argument("--codec", type=str, dest="codec", default="null")
+    parser_json.add_argument("--block_size", type=int, dest="block_size")
+    parser_json.add_argument("--workers", type=int, dest="workers", default=0)
+    parser_json.add_argument("--chunk_size", type=int, dest="chunk_size")
+
+    parser_export = subparsers.add_parser("avro_to_json")
+    parser_export.add_argument("--input", type=str, dest="input", required=True)
+    # Lines are written to stdout by default
+    parser_export.add_argument("--output", type=str, dest="output", default="-")
+    parser_export.add_argument("--format", type=str, dest="json_format", default="pydantic")
+    parser_export.add_argument("--workers", type=int, dest="workers", default=0)
 
     args = parser.parse_args(input_args)
 
     if args.sub_command == "avro_to_pydantic":
-        convert_file(args.avsc, args.output)
+        options = {name: True for name in ("serializers", "slots") if getattr(args, name)}
+        convert_file(args.avsc, args.output, **options)
+    elif args.sub_command == "precompute_schemas":
+        from pydantic_avro.to_avro.precompute import write_schema_cache
+
+        # Modules are given like python -m would take them, relative to the working directory
+        sys.path.insert(0, os.getcwd())
+        write_schema_cache(args.modules, args.output)
+    elif args.sub_command == "concat_ocf":
+        from pydantic_avro.binary.concat import concat_ocf_files
+
+        inputs = [path for pattern in args.inputs for path in sorted(glob.glob(pattern)) or [pattern]]
+        concat_ocf_files(
+            inputs, args.output, codec=args.codec, block_size=args.block_size, compression_workers=args.workers
+        )
+    elif args.sub_command == "json_to_avro":
+        from pydantic_avro.binary.jsonl import json_lines_to_ocf, write_avro_json
+
+        json_options: Dict[str, Any] = {
+            name: getattr(args, name) for name in ("block_size", "chunk_size") if getattr(args, name)
+        }
+        json_options.update(codec=args.codec, json_format=args.json_format, workers=args.workers)
+        with ExitStack() as stack:
+            lines = sys.stdin.buffer if args.input == "-" else stack.enter_context(open(args.input, "rb"))
+            out = stack.enter_context(open(args.output, "wb"))
+            if args.model:
+                sys.path.insert(0, os.getcwd())
+                module, _, name = args.model.partition(":")
+                write_avro_json(getattr(importlib.import_module(module), name), out, lines, **json_options)
+            else:
+                with open(args.avsc) as fo:
+                    json_lines_to_ocf(json.load(fo), lines, out, **json_options)
+    elif args.sub_command == "avro_to_json":
+        from pydantic_avro.binary.jsonl import ocf_to_json_lines
+
+        with ExitStack() as stack:
+            source = stack.enter_context(open(args.input, "rb"))
+            target = sys.stdout.buffer if args.output == "-" else stack.enter_context(open(args.output, "wb"))
+            ocf_to_json_lines(source, target, json_format=args.json_format, workers=args.workers)
 
 
 def root_main():
@@ -0,0 +1,80 @@
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from pydantic_avro.binary.aio import AsyncOcfWriter, avro_decode_stream
+    from pydantic_avro.binary.codecs import register_codec
+    from pydantic_avro.binary.columnar import read_columns
+    from pydantic_avro.binary.concat import concat_ocf
+    from pydantic_avro.binary.decoder import compile_decoder, compile_skipper
+    from pydantic_avro.binary.encoder import compile_encoder
+    from pydantic_avro.binary.generate import DataGenerator
+    from pydantic_avro.binary.index import IndexedOcfFile, build_key_index
+    from pydantic_avro.binary.jsonl import (
+        compile_json_decoder,
+        compile_json_encoder,
+        json_lines_to_ocf,
+        ocf_to_json_lines,
+        write_avro_json,
+    )
+    from pydantic_avro.binary.lazy import LazyRecord, decode_lazy, iter_lazy_models
+    from pydantic_avro.binary.metrics import InMemoryCollector, set_metrics_collector, to_prometheus
+    from pydantic_avro.binary.models import iter_avro_models, write_avro_models
+    from pydantic_avro.binary.ocf import OcfReader, OcfStreamParser, OcfWriter
+    from pydantic_avro.binary.predicate import compile_predicate
+    from pydantic_avro.binary.sort import compile_comparator, compile_sort_key, sort_ocf
+    from pydantic_avro.binary.split import file_splits, iter_split_models
+    from pydantic_avro.binary.stats import FileStats
+
+# The public names by the submodule they are imported from on first access. Only the submodules that are used
+# get imported, e.g. reading files does not import asyncio.
+_LAZY_ATTRIBUTES = {
+    "AsyncOcfWriter": "aio",
+    "avro_decode_stream": "aio",
+    "register_codec": "codecs",
+    "read_columns": "columnar",
+    "concat_ocf": "concat",
+    "compile_decoder": "decoder",
+    "compile_skipper": "decoder",
+    "compile_encoder": "encoder",
+    "DataGenerator": "generate",
+    "IndexedOcfFile": "index",
+    "build_key_index": "index",
+    "compile_json_decoder": "jsonl",
+    "compile_json_encoder": "jsonl",
+    "json_lines_to_ocf": "jsonl",
+    "ocf_to_json_lines": "jsonl",
+    "write_avro_json": "jsonl",
+    "LazyRecord": "lazy",
+    "decode_lazy": "lazy",
+    "iter_lazy_models": "lazy",
+    "InMemoryCollector": "metrics",
+    "set_metrics_collector": "metrics",
+    "to_prometheus": "metrics",
+    "iter_avro_models": "models",
+    "write_avro_models": "models",
+    "OcfReader": "ocf",
+    "OcfStreamParser": "ocf",
+    "OcfWriter": "ocf",
+    "compile_predicate": "predicate",
+    "compile_comparator": "sort",
+    "compile_sort_key": "sort",
+    "sort_ocf": "sort",
+    "file_splits": "split",
+    "iter_split_models": "split",
+    "FileStats": "stats",
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(f"{__name__}.{_LAZY_ATTRIBUTES[name]}"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
@@ -0,0 +1,242 @@
+import asyncio
+import inspect
+import json
+import os
+from collections import OrderedDict, deque
+from concurrent.futures import Executor
+from time import perf_counter
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Deque, Dict, Generic, List, Optional, Tuple, Type, Union
+from uuid import uuid4
+
+from pydantic_avro.binary.codecs import get_codec
+from pydantic_avro.binary.decoder import compile_decoder
+from pydantic_avro.binary.encoder import Discriminators, compile_encoder
+from pydantic_avro.binary.metrics import get_metrics_collector
+from pydantic_avro.binary.models import M, dump_model, validate_model
+from pydantic_avro.binary.ocf import SYNC_SIZE, OcfStreamParser, encode_block, encode_header, iter_block_records
+from pydantic_avro.binary.predicate import Filter, compile_predicate
+
+# Default number of records encoded into one block by the async writer
+BLOCK_RECORDS = 1000
+# Default number of blocks that are encoded or decoded concurrently
+MAX_PENDING = 4
+# Chunk size used to read from sources that have a read method
+CHUNK_SIZE = 64 * 1024
+
+# Compiled encoders and decoders per task key, so process pool workers compile a schema once
+_COMPILED: "OrderedDict[str, Any]" = OrderedDict()
+_COMPILED_MAX_SIZE = 64
+
+
+def _compiled(key: str, compile: Callable[[], Any]) -> Any:
+    compiled = _COMPILED.get(key)
+    if compiled is None:
+        compiled = _COMPILED[key] = compile()
+        if len(_COMPILED) > _COMPILED_MAX_SIZE:
+            _COMPILED.popitem(last=False)
+    return compiled
+
+
+class BlockDecoder(Generic[M]):
+    """Decompresses and decodes a block into model instances.
+
+    Instances are picklable, so blocks can be decoded in a thread pool as well as in a process pool.
+    """
+
+    def __init__(self, model: Type[M], schema: dict, codec: str, filters: Optional[List[Filter]] = None):
+        self.model = model
+        self.schema_json = json.dumps(schema)
+        self.codec = codec
+        self.filters = filters
+        self.key = uuid4().hex
+
+    def _compile(self):
+        schema = json.loads(self.schema_json)
+        predicate = compile_predicate(schema, self.filters) if self.filters else None
+        return compile_decoder(schema), predicate
+
+    def __call__(self, data: bytes, count: int) -> List[M]:
+        start = perf_counter()
+        decode, predicate = _compiled(self.key, self._compile)
+        buf = get_codec(self.codec).decompress(data)
+        instances = [validate_model(self.model, record) for record in iter_block_records(buf, count, decode, predicate)]
+        collector = get_metrics_collector()
+        if collector is not None:
+            collector.observe(self.model.__name__, "decode", len(instances), len(buf), perf_counter() - start)
+        return instances
+
+
+class BlockEncoder:
+    """Encodes and compresses records into the data of a block.
+
+    Instances are picklable, so blocks can be encoded in a thread pool as well as in a process pool. The
+    `discriminators` select the records of discriminated unions by their discriminator value, see
+    `model_discriminators`.
+    """
+
+    def __init__(self, schema: dict, codec: str, discriminators: Optional[Discriminators] = None):
+        get_codec(codec)
+        self.name = schema.get("name", "")
+        self.schema_json = json.dumps(schema)
+        self.codec = codec
+        self.discriminators = discriminators
+        self.key = uuid4().hex
+
+    def _compile(self):
+        return compile_encoder(json.loads(self.schema_json), self.discriminators)
+
+    def __call__(self, records: List[Any]) -> Tuple[int, bytes]:
+        start = perf_counter()
+        encode = _compiled(self.key, self._compile)
+        buf = bytearray()
+        for record in records:
+            encode(buf, record if isinstance(record, dict) else dump_model(record))
+        data = get_codec(self.codec).compress(bytes(buf))
+        collector = get_metrics_collector()
+        if collector is not None:
+            collector.observe(self.name, "encode", len(records), len(buf), perf_counter() - start)
+        return len(records), data
+
+
+async def _iter_chunks(source: Any, chunk_size: int) -> AsyncIterator[bytes]:
+    """Yields chunks of a source with an async read method (e.g. asyncio.StreamReader) or of an async iterable"""
+    if hasattr(source, "read"):
+        while True:
+            chunk = await source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        async for chunk in source:
+            yield chunk
+
+
+async def avro_decode_stream(
+    model: Type[M],
+    source: Union[AsyncIterable[bytes], Any],
+    filters: Optional[List[Filter]] = None,
+    executor: Optional[Executor] = None,
+    max_pending: int = MAX_PENDING,
+    chunk_size: int = CHUNK_SIZE,
+) -> AsyncIterator[M]:
+    """Yields model instances for an avro object container file that is read from an async source
+
+    Blocks are decompressed, decoded and validated in the executor, so the event loop stays responsive.
+
+    :param model: The pydantic model to validate the records with
+    :param source: An async iterable of byte chunks or an object with an async read method
+    :param filters: Optional list of (field, operator, value) tuples that all have to match
+    :param executor: Executor to decode the blocks in, the default executor of the loop if not given.
+                     A ProcessPoolExecutor can be used when the model is importable by the worker processes.
+    :param max_pending: Maximum number of blocks that are decoded concurrently
+    :param chunk_size: Number of bytes to read at once from sources with a read method
+    """
+    loop = asyncio.get_running_loop()
+    parser = OcfStreamParser()
+    decoder: Optional[BlockDecoder[M]] = None
+    pending: Deque[asyncio.Future] = deque()
+
+    async for chunk in _iter_chunks(source, chunk_size):
+        for block in parser.feed(chunk):
+            if decoder is None:
+                decoder = BlockDecoder(model, parser.schema, parser.codec, filters)  # type: ignore[arg-type]
+            pending.append(loop.run_in_executor(executor, decoder, block.data, block.num_records))
+            while len(pending) >= max_pending:
+                for instance in await pending.popleft():
+                    yield instance
+        # Hand out finished blocks early, without waiting for the next chunk
+        while pending and pending[0].done():
+            for instance in await pending.popleft():
+                yield instance
+    parser.close()
+    while pending:
+        for instance in await pending.popleft():
+            yield instance
+
+
+class AsyncOcfWriter:
+    """Writes an avro object container file to an async sink.
+
+    Records are collected in blocks of `block_records`, that are encoded and compressed in the executor while
+    the next block is being collected. Blocks are written to the sink in order.
+
+    The sink needs a write method, which is awaited if it returns an awaitable (e.g. aiofiles). A drain method
+    is awaited after every write if available (e.g. asyncio.StreamWriter). The `discriminators` select the records
+    of discriminated unions by their discriminator value, see `model_discriminators`.
+    """
+
+    def __init__(
+        self,
+        sink: Any,
+        schema: dict,
+        codec: str = "null",
+        block_records: int = BLOCK_RECORDS,
+        executor: Optional[Executor] = None,
+        max_pending: int = MAX_PENDING,
+        metadata: Optional[Dict[str, bytes]] = None,
+        discriminators: Optional[Discriminators] = None,
+    ):
+        self._sink = sink
+        self.schema = schema
+        self.codec = codec
+        self.block_records = block_records
+        self.sync_marker = os.urandom(SYNC_SIZE)
+        self._encoder = BlockEncoder(schema, codec, discriminators)
+        self._executor = executor
+        self._max_pending = max_pending
+        self._metadata = metadata
+        self._records: List[Any] = []
+        self._pending: Deque[asyncio.Future] = deque()
+        self._header_written = False
+
+    async def write(self, record: Any) -> None:
+        """Adds a model instance or dict to the file"""
+        self._records.append(record)
+        if len(self._records) >= self.block_records:
+            await self._submit()
+
+    async def write_many(self, records: Any) -> None:
+        for record in records:
+            await self.write(record)
+
+    async def flush(self) -> None:
+        """Writes all records added so far to the sink"""
+        if self._records:
+            await self._submit()
+        while self._pending:
+            await self._write_block(await self._pending.popleft())
+        await self._write_header()
+
+    async def close(self) -> None:
+        await self.flush()
+
+    async def _submit(self) -> None:
+        records, self._records = self._records, []
+        loop = asyncio.get_running_loop()
+        self._pending.append(loop.run_in_executor(self._executor, self._encoder, records))
+        while len(self._pending) > self._max_pending or (self._pending and self._pending[0].done()):
+            await self._write_block(await self._pending.popleft())
+
+    async def _write_header(self) -> None:
+        if not self._header_written:
+            await self._write(encode_header(self.schema, self.codec, self.sync_marker, self._metadata))
+            self._header_written = True
+
+    async def _write_block(self, block: Tuple[int, bytes]) -> None:
+        await self._write_header()
+        count, data = block
+        await self._write(encode_block(count, data, self.sync_marker))
+
+    async def _write(self, data: bytes) -> None:
+        result = self._sink.write(data)
+        if inspect.isawaitable(result):
+            await result
+        drain = getattr(self._sink, "drain", None)
+        if drain is not None:
+            await drain()
+
+    async def __aenter__(self) -> "AsyncOcfWriter":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
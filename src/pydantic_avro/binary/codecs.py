@@ -0,0 +1,109 @@
+import zlib
+from typing import Callable, Dict, NamedTuple
+
+
+class Codec(NamedTuple):
+    """Compression of the data blocks of an object container file"""
+
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+def _identity(data: bytes) -> bytes:
+    return data
+
+
+def deflate_compress(data: bytes) -> bytes:
+    # Avro uses raw deflate data, without zlib header and checksum
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def deflate_decompress(data: bytes) -> bytes:
+    return zlib.decompress(data, -15)
+
+
+def bzip2_compress(data: bytes) -> bytes:
+    import bz2
+
+    return bz2.compress(data)
+
+
+def bzip2_decompress(data: bytes) -> bytes:
+    import bz2
+
+    return bz2.decompress(data)
+
+
+def xz_compress(data: bytes) -> bytes:
+    import lzma
+
+    return lzma.compress(data)
+
+
+def xz_decompress(data: bytes) -> bytes:
+    import lzma
+
+    return lzma.decompress(data)
+
+
+def snappy_compress(data: bytes) -> bytes:
+    import snappy
+
+    # Snappy compressed data is followed by the big-endian CRC32 checksum of the uncompressed data
+    return snappy.compress(data) + zlib.crc32(data).to_bytes(4, "big")
+
+
+def snappy_decompress(data: bytes) -> bytes:
+    import snappy
+
+    result = snappy.decompress(data[:-4])
+    if zlib.crc32(result).to_bytes(4, "big") != data[-4:]:
+        raise ValueError("Invalid checksum of snappy compressed block")
+    return result
+
+
+def zstandard_compress(data: bytes) -> bytes:
+    import zstandard
+
+    return zstandard.ZstdCompressor().compress(data)
+
+
+def zstandard_decompress(data: bytes) -> bytes:
+    import zstandard
+
+    # A decompressobj also handles frames without content size, as written by streaming writers
+    return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+CODECS: Dict[str, Codec] = {
+    "null": Codec(_identity, _identity),
+    "deflate": Codec(deflate_compress, deflate_decompress),
+    "bzip2": Codec(bzip2_compress, bzip2_decompress),
+    "xz": Codec(xz_compress, xz_decompress),
+    "snappy": Codec(snappy_compress, snappy_decompress),
+    "zstandard": Codec(zstandard_compress, zstandard_decompress),
+}
+
+# Python packages needed by the optional codecs
+OPTIONAL_CODEC_PACKAGES = {"snappy": "python-snappy", "zstandard": "zstandard"}
+
+
+def register_codec(name: str, compress: Callable[[bytes], bytes], decompress: Callable[[bytes], bytes]) -> None:
+    """Registers a codec that can be used to write and read object container files"""
+    CODECS[name] = Codec(compress, decompress)
+
+
+def get_codec(name: str) -> Codec:
+    """Returns a registered codec, raises an error if it is unknown or its package is not installed"""
+    codec = CODECS.get(name)
+    if codec is None:
+        raise ValueError(f"Unsupported codec '{name}', should be one of {list(CODECS)}")
+    if name in OPTIONAL_CODEC_PACKAGES:
+        try:
+            __import__(name)
+        except ImportError:
+            raise ImportError(
+                f"The '{name}' codec requires the '{OPTIONAL_CODEC_PACKAGES[name]}' package to be installed"
+            ) from None
+    return codec
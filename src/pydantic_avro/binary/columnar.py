@@ -0,0 +1,117 @@
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic_avro.binary.decoder import DecoderCompiler
+from pydantic_avro.binary.ocf import OcfReader
+from pydantic_avro.binary.predicate import Filter, compile_predicate
+from pydantic_avro.binary.schema import AvroSchema, logical_type, resolve, schema_type
+
+# Numpy dtypes of columns, by logical type or avro type. Only columns of these types are converted to arrays.
+NUMPY_DTYPES = {
+    "timestamp-millis": "datetime64[ms]",
+    "timestamp-micros": "datetime64[us]",
+    "date": "datetime64[D]",
+    "int": "int32",
+    "long": "int64",
+    "float": "float32",
+    "double": "float64",
+    "boolean": "bool",
+}
+# Types of which null values can be stored in an array, as NaT
+NULLABLE_DTYPES = frozenset(["timestamp-millis", "timestamp-micros", "date"])
+
+
+def _import_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("Columns as numpy arrays require the 'numpy' package to be installed") from None
+    return numpy
+
+
+def _column_dtype(schema: AvroSchema, names: Dict[str, dict]) -> Optional[str]:
+    """Returns the numpy dtype of a column, None if the column stays a list"""
+    schema = resolve(schema, names)
+    if schema_type(schema) == "union":
+        branches = [branch for branch in schema if resolve(branch, names) != "null"]
+        if len(branches) != 1:
+            return None
+        key = logical_type(resolve(branches[0], names))
+        return NUMPY_DTYPES.get(key) if key in NULLABLE_DTYPES else None
+    return NUMPY_DTYPES.get(logical_type(schema) or schema_type(schema))
+
+
+def read_columns(
+    fo: IO[bytes],
+    fields: Optional[List[str]] = None,
+    filters: Optional[List[Filter]] = None,
+    raw_timestamps: bool = False,
+    numpy: bool = False,
+) -> Dict[str, Any]:
+    """Reads the top level fields of the records of an avro object container file into columns
+
+    Values are appended to their column directly, without creating a dict per record, and fields that are not
+    selected are skipped without decoding them.
+
+    :param fo: Binary file object to read from
+    :param fields: The fields to read, all fields by default
+    :param filters: Optional list of (field, operator, value) tuples that all have to match
+    :param raw_timestamps: Returns timestamp-millis, timestamp-micros and date values as ints
+    :param numpy: Returns numeric, boolean and timestamp columns as numpy arrays, timestamps and dates as
+                  datetime64 (nulls become NaT). Other columns remain lists, with the timestamps and dates in
+                  them as datetime and date objects unless `raw_timestamps` is set.
+    :return: The columns by field name
+    """
+    np = _import_numpy() if numpy else None
+    reader = OcfReader(fo)
+    compiler = DecoderCompiler(reader.schema, raw_timestamps=raw_timestamps)
+    # Timestamps of array columns are read as ints, which numpy converts to datetime64 without datetime objects
+    array_compiler = DecoderCompiler(reader.schema, raw_timestamps=True) if np is not None else compiler
+    record = resolve(reader.schema, compiler.names)
+    if schema_type(record) not in ("record", "error"):
+        raise ValueError(f"Columns can only be read from records, got '{schema_type(record)}'")
+
+    selected = [f["name"] for f in record["fields"]] if fields is None else fields
+    unknown = set(selected) - {f["name"] for f in record["fields"]}
+    if unknown:
+        raise ValueError(f"Fields {sorted(unknown)} do not exist in record '{record['name']}'")
+
+    columns: Dict[str, List[Any]] = {name: [] for name in selected}
+    dtypes = {f["name"]: _column_dtype(f["type"], compiler.names) if np is not None else None for f in record["fields"]}
+    # A reader and the append of its column for selected fields, a skipper and None for other fields
+    steps: List[Tuple[Any, Optional[Callable[[Any], None]]]] = []
+    for field in record["fields"]:
+        if field["name"] in columns:
+            field_compiler = compiler if dtypes[field["name"]] is None else array_compiler
+            steps.append((field_compiler.reader(field["type"]), columns[field["name"]].append))
+        else:
+            steps.append((compiler.skipper(field["type"]), None))
+
+    def read_record(buf, pos):
+        for step, append in steps:
+            if append is None:
+                pos = step(buf, pos)
+            else:
+                value, pos = step(buf, pos)
+                append(value)
+        return pos
+
+    predicate = compile_predicate(reader.schema, filters) if filters else None
+    for block in reader.iter_blocks():
+        buf = block.data
+        pos = 0
+        for _ in range(block.num_records):
+            if predicate is None:
+                pos = read_record(buf, pos)
+                continue
+            matched, end = predicate(buf, pos)
+            if matched:
+                read_record(buf, pos)
+            pos = end
+
+    if np is None:
+        return columns
+    result: Dict[str, Any] = {}
+    for name, values in columns.items():
+        dtype = dtypes[name]
+        result[name] = values if dtype is None else np.array(values, dtype=dtype)
+    return result
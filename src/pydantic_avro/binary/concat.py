@@ -0,0 +1,77 @@
+import os
+from contextlib import ExitStack
+from typing import IO, Any, Optional, Sequence, Union
+
+from pydantic_avro.binary.ocf import OcfReader, OcfWriter
+
+# A file to concatenate, a path or a binary file object
+Source = Union[str, IO[bytes]]
+
+
+def concat_ocf(
+    sources: Sequence[Source],
+    out: IO[bytes],
+    codec: Optional[str] = None,
+    block_size: Optional[int] = None,
+    compression_workers: int = 0,
+) -> int:
+    """Concatenates object container files with the same schema into one file, without decoding the records
+
+    By default the compressed blocks are copied as they are. With a `codec` other than the codec of a file, its blocks
+    are decompressed and compressed with the new codec. With `block_size`, small blocks are combined into blocks of
+    about `block_size` bytes of uncompressed data, e.g. to compact the files of a streaming sink. Blocks hold the
+    encoded records one after the other, so their decompressed data is concatenated as is. Returns the number of
+    records.
+
+    :param sources: Paths or binary file objects of the files, paths are opened one at a time
+    :param out: Binary file object to write the concatenated file to
+    :param codec: Compression codec of the concatenated file, by default the codec of the first file
+    :param block_size: Target size in bytes of the uncompressed data of the blocks, by default blocks are kept
+    :param compression_workers: Number of threads compressing blocks when blocks are compressed again
+    """
+    if not sources:
+        raise ValueError("No files to concatenate")
+    writer: Optional[OcfWriter] = None
+    count = 0
+    with ExitStack() as stack:
+        for source in sources:
+            with ExitStack() as source_stack:
+                fo = source_stack.enter_context(open(source, "rb")) if isinstance(source, str) else source
+                reader = OcfReader(fo)
+                if writer is None:
+                    metadata = {key: value for key, value in reader.metadata.items() if not key.startswith("avro.")}
+                    writer = stack.enter_context(
+                        OcfWriter(
+                            out,
+                            reader.schema,
+                            codec=codec or reader.codec,
+                            # Without block_size, every block that is compressed again is written on its own
+                            block_size=block_size or 0,
+                            metadata=metadata,
+                            compression_workers=compression_workers,
+                        )
+                    )
+                elif reader.schema != writer.schema:
+                    raise ValueError(f"The schema of {_name(source)} differs from the schema of the first file")
+
+                if block_size is None and reader.codec == writer.codec:
+                    for block in reader.iter_raw_blocks():
+                        writer.write_block(block.num_records, block.data)
+                        count += block.num_records
+                else:
+                    for block in reader.iter_blocks():
+                        writer.write_encoded(block.data, block.num_records)
+                        count += block.num_records
+    return count
+
+
+def concat_ocf_files(paths: Sequence[str], output: str, **kwargs: Any) -> int:
+    """Concatenates object container files into a new file, see `concat_ocf` for the options"""
+    if os.path.abspath(output) in {os.path.abspath(path) for path in paths}:
+        raise ValueError(f"The output {output} is one of the files to concatenate")
+    with open(output, "wb") as out:
+        return concat_ocf(paths, out, **kwargs)
+
+
+def _name(source: Source) -> str:
+    return source if isinstance(source, str) else getattr(source, "name", repr(source))
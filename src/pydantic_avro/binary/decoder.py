@@ -0,0 +1,473 @@
+import struct
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+from uuid import UUID
+
+from pydantic_avro.binary.logical import FROM_AVRO, RAW_TIMESTAMP_TYPES, unscaled_to_decimal
+from pydantic_avro.binary.schema import (
+    AvroSchema,
+    collect_named_types,
+    fullname,
+    logical_type,
+    resolve,
+    schema_type,
+    unwrap,
+)
+
+# A reader decodes a datum starting at a position of the buffer and returns the value and the next position
+Reader = Callable[[Any, int], Tuple[Any, int]]
+# A skipper steps over a datum starting at a position of the buffer and returns the next position
+Skipper = Callable[[Any, int], int]
+
+FLOAT = struct.Struct("<f")
+DOUBLE = struct.Struct("<d")
+
+
+def read_long(buf, pos: int) -> Tuple[int, int]:
+    """Reads a zigzag encoded variable length int or long"""
+    b = buf[pos]
+    pos += 1
+    n = b & 0x7F
+    shift = 7
+    while b & 0x80:
+        b = buf[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        shift += 7
+    return (n >> 1) ^ -(n & 1), pos
+
+
+def skip_long(buf, pos: int) -> int:
+    while buf[pos] & 0x80:
+        pos += 1
+    return pos + 1
+
+
+def read_null(buf, pos: int) -> Tuple[None, int]:
+    return None, pos
+
+
+def read_boolean(buf, pos: int) -> Tuple[bool, int]:
+    return buf[pos] != 0, pos + 1
+
+
+def read_float(buf, pos: int) -> Tuple[float, int]:
+    return FLOAT.unpack_from(buf, pos)[0], pos + 4
+
+
+def read_double(buf, pos: int) -> Tuple[float, int]:
+    return DOUBLE.unpack_from(buf, pos)[0], pos + 8
+
+
+def read_bytes(buf, pos: int) -> Tuple[bytes, int]:
+    n, pos = read_long(buf, pos)
+    end = pos + n
+    return bytes(buf[pos:end]), end
+
+
+def read_bytes_view(buf, pos: int) -> Tuple[Any, int]:
+    """Reads bytes without copying them, the result is a memoryview when the buffer is one"""
+    n, pos = read_long(buf, pos)
+    end = pos + n
+    return buf[pos:end], end
+
+
+def read_string(buf, pos: int) -> Tuple[str, int]:
+    n, pos = read_long(buf, pos)
+    end = pos + n
+    return str(buf[pos:end], "utf-8"), end
+
+
+def interned_string_reader(maxsize: int) -> Reader:
+    """Returns a string reader that returns the same str object for repeated strings.
+
+    The strings are kept in an LRU cache of at most `maxsize` strings, by their encoded bytes.
+    """
+    decode = lru_cache(maxsize=maxsize)(_decode_utf8)
+
+    def read_interned(buf, pos):
+        n, pos = read_long(buf, pos)
+        end = pos + n
+        return decode(bytes(buf[pos:end])), end
+
+    return read_interned
+
+
+def _decode_utf8(data: bytes) -> str:
+    return str(data, "utf-8")
+
+
+def skip_null(buf, pos: int) -> int:
+    return pos
+
+
+def skip_boolean(buf, pos: int) -> int:
+    return pos + 1
+
+
+def skip_float(buf, pos: int) -> int:
+    return pos + 4
+
+
+def skip_double(buf, pos: int) -> int:
+    return pos + 8
+
+
+def skip_bytes(buf, pos: int) -> int:
+    n, pos = read_long(buf, pos)
+    return pos + n
+
+
+PRIMITIVE_READERS: Dict[str, Reader] = {
+    "null": read_null,
+    "boolean": read_boolean,
+    "int": read_long,
+    "long": read_long,
+    "float": read_float,
+    "double": read_double,
+    "bytes": read_bytes,
+    "string": read_string,
+}
+
+PRIMITIVE_SKIPPERS: Dict[str, Skipper] = {
+    "null": skip_null,
+    "boolean": skip_boolean,
+    "int": skip_long,
+    "long": skip_long,
+    "float": skip_float,
+    "double": skip_double,
+    "bytes": skip_bytes,
+    "string": skip_bytes,
+}
+
+
+class DecoderCompiler:
+    """Compiles an Avro schema into nested closures that decode binary encoded datums.
+
+    Records are decoded to dicts, enums to their symbol and logical types to their python type, so the result
+    can be validated by the pydantic model the schema was generated from.
+
+    With `zero_copy`, bytes and fixed values are returned as slices of the buffer instead of copies. These are
+    memoryviews when the buffer is a memoryview, which keep the whole buffer alive while they are referenced.
+    With `raw_timestamps`, timestamp-millis, timestamp-micros and date values are returned as the ints they are
+    encoded as, instead of creating datetime and date objects.
+
+    `intern_strings` holds the maximum number of distinct strings to keep by field name, or by "Record.field" to
+    select the field of one record. The values of these fields, including strings in unions, arrays and maps, are
+    decoded to the same str object for repeated strings, see `interned_string_reader`. Enums of which the class is in
+    `enum_types`, by class name, are decoded to the members of the class instead of their symbol.
+    """
+
+    def __init__(
+        self,
+        schema: AvroSchema,
+        zero_copy: bool = False,
+        raw_timestamps: bool = False,
+        intern_strings: Optional[Dict[str, int]] = None,
+        enum_types: Optional[Iterable[Type[Enum]]] = None,
+    ):
+        self.root_schema = schema
+        self.zero_copy = zero_copy
+        self.raw_timestamps = raw_timestamps
+        self.intern_strings = intern_strings or {}
+        self.enum_types = {enum_type.__name__: enum_type for enum_type in enum_types or ()}
+        self.names = collect_named_types(schema)
+        self._primitive_readers = {**PRIMITIVE_READERS, "bytes": read_bytes_view} if zero_copy else PRIMITIVE_READERS
+        self._readers: Dict[str, Reader] = {}
+        self._skippers: Dict[str, Skipper] = {}
+
+    def reader(self, schema: AvroSchema) -> Reader:
+        """Returns a reader for the given (sub) schema"""
+        schema = unwrap(schema)
+        if isinstance(schema, str) and schema in self._readers:
+            return self._readers[schema]
+        schema = resolve(schema, self.names)
+        t = schema_type(schema)
+        lt = logical_type(schema)
+        if lt is not None:
+            return self._logical_reader(schema, lt)
+        if t in self._primitive_readers:
+            return self._primitive_readers[t]
+        if t in ("record", "error"):
+            return self._record_reader(schema)
+        if t == "enum":
+            return self._enum_reader(schema)
+        if t == "fixed":
+            return self._fixed_reader(schema)
+        if t == "array":
+            return self._array_reader(schema)
+        if t == "map":
+            return self._map_reader(schema)
+        if t == "union":
+            return self._union_reader(schema)
+        raise NotImplementedError(f"Type '{t}' not supported yet")
+
+    def skipper(self, schema: AvroSchema) -> Skipper:
+        """Returns a skipper for the given (sub) schema"""
+        schema = unwrap(schema)
+        if isinstance(schema, str) and schema in self._skippers:
+            return self._skippers[schema]
+        schema = resolve(schema, self.names)
+        t = schema_type(schema)
+        if t in PRIMITIVE_SKIPPERS:
+            return PRIMITIVE_SKIPPERS[t]
+        if t in ("record", "error"):
+            return self._record_skipper(schema)
+        if t == "enum":
+            return skip_long
+        if t == "fixed":
+            size = schema["size"]
+            return lambda buf, pos: pos + size
+        if t == "array":
+            return self._blocks_skipper(self.skipper(schema["items"]))
+        if t == "map":
+            skip_value = self.skipper(schema["values"])
+            return self._blocks_skipper(lambda buf, pos: skip_value(buf, skip_bytes(buf, pos)))
+        if t == "union":
+            return self._union_skipper(schema)
+        raise NotImplementedError(f"Type '{t}' not supported yet")
+
+    def _register(self, registry: Dict[str, Any], schema: dict, func: Any):
+        name = schema["name"]
+        registry[fullname(name, schema.get("namespace"))] = func
+        registry[name.rsplit(".", 1)[-1]] = func
+
+    def _logical_reader(self, schema: dict, lt: str) -> Reader:
+        """Returns a reader converting the underlying avro type to the python type"""
+        base = PRIMITIVE_READERS.get(schema["type"])
+        if schema["type"] == "fixed":
+            base = self._fixed_reader(schema)
+        if base is None:
+            raise NotImplementedError(f"Logical type '{lt}' on '{schema['type']}' not supported yet")
+
+        if lt == "decimal":
+            scale = schema.get("scale", 0)
+
+            def read_decimal(buf, pos):
+                value, pos = base(buf, pos)
+                return unscaled_to_decimal(int.from_bytes(value, "big", signed=True), scale), pos
+
+            if "name" in schema:
+                # Replaces the plain fixed reader, so references to the name read decimals too
+                self._register(self._readers, schema, read_decimal)
+            return read_decimal
+        if lt == "uuid" and schema["type"] == "string":
+
+            def read_uuid(buf, pos):
+                value, pos = read_string(buf, pos)
+                return UUID(value), pos
+
+            return read_uuid
+        convert = FROM_AVRO.get(lt)
+        if convert is None or (self.raw_timestamps and lt in RAW_TIMESTAMP_TYPES):
+            # Unknown logical types are read as their underlying type
+            return base
+
+        def read_logical(buf, pos):
+            value, pos = base(buf, pos)
+            return convert(value), pos
+
+        return read_logical
+
+    def _record_reader(self, schema: dict) -> Reader:
+        """Returns a reader decoding a record to a dict"""
+        implementation: List[Reader] = []
+
+        def forward(buf, pos):
+            # Only used by recursive references to the record while it is being compiled
+            return implementation[0](buf, pos)
+
+        self._register(self._readers, schema, forward)
+        fields = [(field["name"], self._field_reader(schema, field)) for field in schema["fields"]]
+
+        def read_record(buf, pos):
+            record = {}
+            for name, read in fields:
+                record[name], pos = read(buf, pos)
+            return record, pos
+
+        implementation.append(read_record)
+        self._register(self._readers, schema, read_record)
+        return read_record
+
+    def _field_reader(self, schema: dict, field: dict) -> Reader:
+        """Returns the reader of a field of a record, with an interned string reader when configured"""
+        record_name = schema["name"].rsplit(".", 1)[-1]
+        maxsize = self.intern_strings.get(f"{record_name}.{field['name']}", self.intern_strings.get(field["name"]))
+        if maxsize is None:
+            return self.reader(field["type"])
+        return self._interned_reader(field["type"], interned_string_reader(maxsize), f"{record_name}.{field['name']}")
+
+    def _interned_reader(self, schema: AvroSchema, read_interned: Reader, field: str) -> Reader:
+        """Returns a reader for a string, union, array or map schema with `read_interned` as its string reader"""
+        schema = resolve(unwrap(schema), self.names)
+        t = schema_type(schema)
+        if t == "string" and logical_type(schema) is None:
+            return read_interned
+        if t == "union":
+            branches = [read_interned if branch == "string" else self.reader(branch) for branch in map(unwrap, schema)]
+
+            def read_union(buf, pos):
+                index, pos = read_long(buf, pos)
+                return branches[index](buf, pos)
+
+            return read_union
+        if t == "array":
+            return self._array_reader(schema, self._interned_reader(schema["items"], read_interned, field))
+        if t == "map":
+            return self._map_reader(schema, self._interned_reader(schema["values"], read_interned, field))
+        raise ValueError(f"Only strings can be interned, field '{field}' is of type '{t}'")
+
+    def _record_skipper(self, schema: dict) -> Skipper:
+        implementation: List[Skipper] = []
+        self._register(self._skippers, schema, lambda buf, pos: implementation[0](buf, pos))
+        skippers = [self.skipper(field["type"]) for field in schema["fields"]]
+
+        def skip_record(buf, pos):
+            for skip in skippers:
+                pos = skip(buf, pos)
+            return pos
+
+        implementation.append(skip_record)
+        self._register(self._skippers, schema, skip_record)
+        return skip_record
+
+    def _enum_reader(self, schema: dict) -> Reader:
+        symbols = schema["symbols"]
+        enum_type = self.enum_types.get(schema["name"].rsplit(".", 1)[-1])
+        if enum_type is not None:
+            # The members by index, enum values are strings in the schema
+            members = {str(member.value): member for member in enum_type}
+            missing = [symbol for symbol in symbols if symbol not in members]
+            if missing:
+                raise ValueError(f"Symbols {missing} of enum '{schema['name']}' are not in {enum_type.__name__}")
+            symbols = [members[symbol] for symbol in symbols]
+
+        def read_enum(buf, pos):
+            index, pos = read_long(buf, pos)
+            return symbols[index], pos
+
+        self._register(self._readers, schema, read_enum)
+        return read_enum
+
+    def _fixed_reader(self, schema: dict) -> Reader:
+        size = schema["size"]
+
+        def read_fixed(buf, pos):
+            end = pos + size
+            return bytes(buf[pos:end]), end
+
+        if self.zero_copy:
+
+            def read_fixed(buf, pos):
+                end = pos + size
+                return buf[pos:end], end
+
+        if "name" in schema:
+            self._register(self._readers, schema, read_fixed)
+        return read_fixed
+
+    def _array_reader(self, schema: dict, read_item: Optional[Reader] = None) -> Reader:
+        read_item = read_item or self.reader(schema["items"])
+
+        def read_array(buf, pos):
+            items = []
+            append = items.append
+            count, pos = read_long(buf, pos)
+            while count:
+                if count < 0:
+                    # Negative counts are followed by the size of the block in bytes
+                    count = -count
+                    _, pos = read_long(buf, pos)
+                for _ in range(count):
+                    item, pos = read_item(buf, pos)
+                    append(item)
+                count, pos = read_long(buf, pos)
+            return items, pos
+
+        return read_array
+
+    def _map_reader(self, schema: dict, read_value: Optional[Reader] = None) -> Reader:
+        read_value = read_value or self.reader(schema["values"])
+
+        def read_map(buf, pos):
+            result = {}
+            count, pos = read_long(buf, pos)
+            while count:
+                if count < 0:
+                    count = -count
+                    _, pos = read_long(buf, pos)
+                for _ in range(count):
+                    key, pos = read_string(buf, pos)
+                    result[key], pos = read_value(buf, pos)
+                count, pos = read_long(buf, pos)
+            return result, pos
+
+        return read_map
+
+    def _union_reader(self, schema: list) -> Reader:
+        branches = [self.reader(branch) for branch in schema]
+
+        def read_union(buf, pos):
+            index, pos = read_long(buf, pos)
+            return branches[index](buf, pos)
+
+        return read_union
+
+    def _union_skipper(self, schema: list) -> Skipper:
+        branches = [self.skipper(branch) for branch in schema]
+
+        def skip_union(buf, pos):
+            index, pos = read_long(buf, pos)
+            return branches[index](buf, pos)
+
+        return skip_union
+
+    @staticmethod
+    def _blocks_skipper(skip_item: Skipper) -> Skipper:
+        """Returns a skipper for the blocks of an array or map, using the block size when it is available"""
+
+        def skip_blocks(buf, pos):
+            count, pos = read_long(buf, pos)
+            while count:
+                if count < 0:
+                    size, pos = read_long(buf, pos)
+                    pos += size
+                else:
+                    for _ in range(count):
+                        pos = skip_item(buf, pos)
+                count, pos = read_long(buf, pos)
+            return pos
+
+        return skip_blocks
+
+
+def compile_decoder(
+    schema: AvroSchema,
+    zero_copy: bool = False,
+    raw_timestamps: bool = False,
+    intern_strings: Optional[Dict[str, int]] = None,
+    enum_types: Optional[Iterable[Type[Enum]]] = None,
+) -> Reader:
+    """Returns a reader for datums of the given Avro schema
+
+    :param schema: The Avro schema
+    :param zero_copy: Returns bytes and fixed values as memoryviews of the buffer instead of copies
+    :param raw_timestamps: Returns timestamp-millis, timestamp-micros and date values as ints
+    :param intern_strings: Maximum number of distinct strings to keep per field, by field name or "Record.field"
+    :param enum_types: Enum classes to decode the enums with the same name to
+    """
+    reader = DecoderCompiler(schema, zero_copy, raw_timestamps, intern_strings, enum_types).reader(schema)
+    if not zero_copy:
+        return reader
+
+    def read_view(buf, pos):
+        return reader(memoryview(buf), pos)
+
+    return read_view
+
+
+def compile_skipper(schema: AvroSchema) -> Skipper:
+    """Returns a skipper for datums of the given Avro schema"""
+    return DecoderCompiler(schema).skipper(schema)
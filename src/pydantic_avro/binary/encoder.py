@@ -0,0 +1,413 @@
+import struct
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic_avro.binary.logical import TO_AVRO
+from pydantic_avro.binary.schema import (
+    AvroSchema,
+    collect_named_types,
+    fullname,
+    logical_type,
+    resolve,
+    schema_type,
+    unwrap,
+)
+
+# A writer appends the binary encoding of a value to a buffer
+Writer = Callable[[bytearray, Any], None]
+# A matcher tells whether a value can be written with a branch of a union
+Matcher = Callable[[Any], bool]
+# Discriminator property and value of a record in discriminated unions, by record name
+Discriminators = Dict[str, Tuple[str, Any]]
+
+FLOAT = struct.Struct("<f")
+DOUBLE = struct.Struct("<d")
+
+
+def write_long(buf: bytearray, n: int) -> None:
+    """Writes a zigzag encoded variable length int or long"""
+    n = (n << 1) ^ (n >> 63)
+    while n & ~0x7F:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def write_null(buf: bytearray, value: None) -> None:
+    pass
+
+
+def write_boolean(buf: bytearray, value: bool) -> None:
+    buf.append(1 if value else 0)
+
+
+def write_float(buf: bytearray, value: float) -> None:
+    buf += FLOAT.pack(value)
+
+
+def write_double(buf: bytearray, value: float) -> None:
+    buf += DOUBLE.pack(value)
+
+
+def write_bytes(buf: bytearray, value: bytes) -> None:
+    write_long(buf, len(value))
+    buf += value
+
+
+def write_string(buf: bytearray, value: str) -> None:
+    if isinstance(value, Enum):
+        value = value.value
+    data = value.encode("utf-8")
+    write_long(buf, len(data))
+    buf += data
+
+
+def unscaled_decimal(value: Decimal, scale: int) -> int:
+    """Returns the unscaled integer of a decimal for the given scale
+
+    Uses the exact integer ratio of the decimal instead of its digits, which avoids string conversions.
+    """
+    numerator, denominator = value.as_integer_ratio()
+    numerator *= 10**scale
+    if numerator % denominator:
+        raise ValueError(f"Decimal {value} has more than {scale} decimal places")
+    return numerator // denominator
+
+
+def unscaled_to_bytes(unscaled: int, size: Optional[int] = None) -> bytes:
+    """Returns the big-endian two's complement representation of an unscaled decimal
+
+    :param unscaled: The unscaled integer of the decimal
+    :param size: The size of a fixed, by default the minimal number of bytes is used
+    """
+    if size is None:
+        return unscaled.to_bytes(unscaled.bit_length() // 8 + 1, "big", signed=True)
+    try:
+        return unscaled.to_bytes(size, "big", signed=True)
+    except OverflowError:
+        raise ValueError(f"Unscaled decimal {unscaled} does not fit in {size} bytes") from None
+
+
+PRIMITIVE_WRITERS: Dict[str, Writer] = {
+    "null": write_null,
+    "boolean": write_boolean,
+    "int": write_long,
+    "long": write_long,
+    "float": write_float,
+    "double": write_double,
+    "bytes": write_bytes,
+    "string": write_string,
+}
+
+PRIMITIVE_MATCHERS: Dict[str, Matcher] = {
+    "null": lambda v: v is None,
+    "boolean": lambda v: isinstance(v, bool),
+    "int": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "long": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "float": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "double": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "bytes": lambda v: isinstance(v, (bytes, bytearray, memoryview)),
+    "string": lambda v: isinstance(v, str),
+}
+
+# Timestamps and dates also match ints, which are written as is
+LOGICAL_MATCHERS: Dict[str, Matcher] = {
+    "timestamp-millis": lambda v: isinstance(v, (datetime, int)) and not isinstance(v, bool),
+    "timestamp-micros": lambda v: isinstance(v, (datetime, int)) and not isinstance(v, bool),
+    "date": lambda v: isinstance(v, (date, int)) and not isinstance(v, (datetime, bool)),
+    "time-millis": lambda v: isinstance(v, time),
+    "time-micros": lambda v: isinstance(v, time),
+    "uuid": lambda v: isinstance(v, UUID),
+    "decimal": lambda v: isinstance(v, Decimal),
+}
+
+# Python types of the values that branches with a matcher depending on the value can match, the matchers of the
+# other types, and of the logical types on top of these, only depend on the type of a value
+VALUE_MATCHED_TYPES: Dict[str, Tuple[type, ...]] = {
+    "record": (dict,),
+    "error": (dict,),
+    "enum": (str, Enum),
+    "fixed": (bytes, bytearray, memoryview),
+}
+
+
+class EncoderCompiler:
+    """Compiles an Avro schema into nested closures that write binary encoded datums.
+
+    Values are expected in the shape of `model_dump()`: dicts for records, enum members or symbols for enums and
+    python types (datetime, date, time, UUID, Decimal) for logical types.
+
+    :param discriminators: Discriminator property and value by record name, records of unions are then selected by
+                           the value of the property instead of by their fields, see `model_discriminators`
+    """
+
+    def __init__(self, schema: AvroSchema, discriminators: Optional[Discriminators] = None):
+        self.root_schema = schema
+        self.names = collect_named_types(schema)
+        self.discriminators = discriminators or {}
+        self._writers: Dict[str, Writer] = {}
+
+    def writer(self, schema: AvroSchema) -> Writer:
+        """Returns a writer for the given (sub) schema"""
+        schema = unwrap(schema)
+        if isinstance(schema, str) and schema in self._writers:
+            return self._writers[schema]
+        schema = resolve(schema, self.names)
+        t = schema_type(schema)
+        lt = logical_type(schema)
+        if lt is not None:
+            return self._logical_writer(schema, lt)
+        if t in PRIMITIVE_WRITERS:
+            return PRIMITIVE_WRITERS[t]
+        if t in ("record", "error"):
+            return self._record_writer(schema)
+        if t == "enum":
+            return self._enum_writer(schema)
+        if t == "fixed":
+            return self._fixed_writer(schema)
+        if t == "array":
+            return self._array_writer(schema)
+        if t == "map":
+            return self._map_writer(schema)
+        if t == "union":
+            return self._union_writer(schema)
+        raise NotImplementedError(f"Type '{t}' not supported yet")
+
+    def matcher(self, schema: AvroSchema) -> Matcher:
+        """Returns a function that tells whether a value can be written with the given schema"""
+        schema = resolve(schema, self.names)
+        t = schema_type(schema)
+        lt = logical_type(schema)
+        if lt in LOGICAL_MATCHERS:
+            return LOGICAL_MATCHERS[lt]
+        if t in PRIMITIVE_MATCHERS:
+            return PRIMITIVE_MATCHERS[t]
+        if t in ("record", "error"):
+            names = {field["name"] for field in schema["fields"]}
+            required = {field["name"] for field in schema["fields"] if "default" not in field}
+            return lambda v: isinstance(v, dict) and required.issubset(v) and names.issuperset(v)
+        if t == "enum":
+            symbols = set(schema["symbols"])
+            return lambda v: (v.value if isinstance(v, Enum) else v) in symbols
+        if t == "fixed":
+            size = schema["size"]
+            return lambda v: isinstance(v, (bytes, bytearray, memoryview)) and len(v) == size
+        if t == "array":
+            return lambda v: isinstance(v, (list, tuple))
+        if t == "map":
+            return lambda v: isinstance(v, dict)
+        raise NotImplementedError(f"Type '{t}' not supported in unions yet")
+
+    def _register(self, schema: dict, func: Writer):
+        name = schema["name"]
+        self._writers[fullname(name, schema.get("namespace"))] = func
+        self._writers[name.rsplit(".", 1)[-1]] = func
+
+    def _logical_writer(self, schema: dict, lt: str) -> Writer:
+        """Returns a writer converting the python type to the underlying avro type"""
+        base = PRIMITIVE_WRITERS.get(schema["type"])
+        if schema["type"] == "fixed":
+            base = self._fixed_writer(schema)
+        if base is None:
+            raise NotImplementedError(f"Logical type '{lt}' on '{schema['type']}' not supported yet")
+        write = base
+
+        if lt == "decimal":
+            scale = schema.get("scale", 0)
+            size = schema.get("size")
+
+            def write_decimal(buf, value):
+                if not isinstance(value, (Decimal, int)):
+                    value = Decimal(value)
+                write(buf, unscaled_to_bytes(unscaled_decimal(value, scale), size))
+
+            if "name" in schema:
+                # Replaces the plain fixed writer, so references to the name write decimals too
+                self._register(schema, write_decimal)
+            return write_decimal
+        if lt == "uuid":
+
+            def write_uuid(buf, value):
+                write(buf, str(value))
+
+            return write_uuid
+        convert = TO_AVRO.get(lt)
+        if convert is None:
+            # Unknown logical types are written as their underlying type
+            return base
+
+        def write_logical(buf, value):
+            # Values that are already in the avro representation are written as is
+            write(buf, value if isinstance(value, int) else convert(value))
+
+        return write_logical
+
+    def _record_writer(self, schema: dict) -> Writer:
+        """Returns a writer for a record given as dict, missing fields are written with their default"""
+        implementation: List[Writer] = []
+
+        def forward(buf, value):
+            # Only used by recursive references to the record while it is being compiled
+            implementation[0](buf, value)
+
+        self._register(schema, forward)
+        fields: List[Tuple[str, Writer, bool, Any]] = [
+            (field["name"], self.writer(field["type"]), "default" in field, field.get("default"))
+            for field in schema["fields"]
+        ]
+        record_name = schema["name"]
+
+        def write_record(buf, value):
+            for name, write, has_default, default in fields:
+                if name in value:
+                    write(buf, value[name])
+                elif has_default:
+                    write(buf, default)
+                else:
+                    raise ValueError(f"Field '{name}' of record '{record_name}' is missing")
+
+        implementation.append(write_record)
+        self._register(schema, write_record)
+        return write_record
+
+    def _enum_writer(self, schema: dict) -> Writer:
+        indexes = {symbol: i for i, symbol in enumerate(schema["symbols"])}
+        enum_name = schema["name"]
+
+        def write_enum(buf, value):
+            if isinstance(value, Enum):
+                value = value.value
+            try:
+                write_long(buf, indexes[value])
+            except KeyError:
+                raise ValueError(f"'{value}' is not a symbol of enum '{enum_name}'") from None
+
+        self._register(schema, write_enum)
+        return write_enum
+
+    def _fixed_writer(self, schema: dict) -> Writer:
+        size = schema["size"]
+
+        def write_fixed(buf, value):
+            if len(value) != size:
+                raise ValueError(f"Fixed value should have {size} bytes, got {len(value)}")
+            buf += value
+
+        if "name" in schema:
+            self._register(schema, write_fixed)
+        return write_fixed
+
+    def _array_writer(self, schema: dict) -> Writer:
+        write_item = self.writer(schema["items"])
+
+        def write_array(buf, value):
+            if value:
+                write_long(buf, len(value))
+                for item in value:
+                    write_item(buf, item)
+            buf.append(0)
+
+        return write_array
+
+    def _map_writer(self, schema: dict) -> Writer:
+        write_value = self.writer(schema["values"])
+
+        def write_map(buf, value):
+            if value:
+                write_long(buf, len(value))
+                for key, item in value.items():
+                    write_string(buf, key)
+                    write_value(buf, item)
+            buf.append(0)
+
+        return write_map
+
+    def _union_writer(self, schema: list) -> Writer:
+        """Returns a writer for a union, the first branch the value matches is written.
+
+        The branch is looked up by the type of the value, the branches that match values by their type are only
+        matched once per type. Records, enums and fixed match by value, the branches of those that a type can match
+        are tried in order, unless a record is found by the value of its discriminator.
+        """
+        branches: List[Tuple[bytes, Matcher, Writer, Optional[Tuple[type, ...]]]] = []
+        for i, branch in enumerate(schema):
+            tag = bytearray()
+            write_long(tag, i)
+            resolved = resolve(branch, self.names)
+            if logical_type(resolved) in LOGICAL_MATCHERS:
+                value_types = None
+            else:
+                value_types = VALUE_MATCHED_TYPES.get(schema_type(resolved))
+            branches.append((bytes(tag), self.matcher(branch), self.writer(branch), value_types))
+        discriminator, by_discriminator = self._discriminator_table(schema, branches)
+        # (tag, writer) by the type of the values that select a branch by their type only
+        selected: Dict[type, Tuple[bytes, Writer]] = {}
+        # The branches to try in order by the type of the other values
+        candidates: Dict[type, list] = {}
+
+        def select(value):
+            cls = value.__class__
+            tried = candidates.get(cls)
+            if tried is None:
+                tried = []
+                for branch in branches:
+                    value_types = branch[3]
+                    if value_types is None:
+                        if branch[1](value):
+                            # Matches all values of the type, the branches after it are never reached
+                            tried.append(branch)
+                            break
+                    elif issubclass(cls, value_types):
+                        tried.append(branch)
+                if len(tried) == 1 and tried[0][3] is None:
+                    selected[cls] = tried[0][0], tried[0][2]
+                    return selected[cls]
+                candidates[cls] = tried
+            if by_discriminator and isinstance(value, dict):
+                try:
+                    return by_discriminator[value[discriminator]]
+                except (KeyError, TypeError):
+                    pass
+            for tag, matches, write, _ in tried:
+                if matches(value):
+                    return tag, write
+            raise ValueError(f"{value!r} does not match any type of union {schema}")
+
+        def write_union(buf, value):
+            branch = selected.get(value.__class__)
+            if branch is None:
+                branch = select(value)
+            buf += branch[0]
+            branch[1](buf, value)
+
+        return write_union
+
+    def _discriminator_table(
+        self, schema: list, branches: list
+    ) -> Tuple[Optional[str], Dict[Any, Tuple[bytes, Writer]]]:
+        """Returns the discriminator property of the records of a union and the (tag, writer) by its values"""
+        properties: Dict[str, Dict[Any, Tuple[bytes, Writer]]] = {}
+        for branch, (tag, _, write, _) in zip(schema, branches):
+            branch = resolve(branch, self.names)
+            if schema_type(branch) not in ("record", "error"):
+                continue
+            name = branch["name"]
+            found = self.discriminators.get(fullname(name, branch.get("namespace")))
+            found = found or self.discriminators.get(name.rsplit(".", 1)[-1])
+            if found is not None:
+                properties.setdefault(found[0], {}).setdefault(found[1], (tag, write))
+        if len(properties) != 1:
+            return None, {}
+        return next(iter(properties.items()))
+
+
+def compile_encoder(schema: AvroSchema, discriminators: Optional[Discriminators] = None) -> Writer:
+    """Returns a writer for datums of the given Avro schema
+
+    :param schema: The avro schema
+    :param discriminators: Discriminator property and value by record name, see `model_discriminators`
+    """
+    return EncoderCompiler(schema, discriminators).writer(schema)
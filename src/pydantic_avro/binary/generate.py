@@ -0,0 +1,353 @@
+import json
+import os
+import random
+import string
+import struct
+from datetime import datetime, timezone
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple, Union
+from uuid import UUID
+
+from pydantic_avro.binary.encoder import compile_encoder
+from pydantic_avro.binary.logical import FROM_AVRO, RAW_TIMESTAMP_TYPES, datetime_to_micros, unscaled_to_decimal
+from pydantic_avro.binary.ocf import BLOCK_SIZE, OcfWriter
+from pydantic_avro.binary.schema import AvroSchema, collect_named_types, fullname, logical_type, resolve, schema_type
+from pydantic_avro.binary.size import COLLECTION_ITEMS, STRING_SIZE
+
+# A generator of a value of a (sub) schema, called with the nesting depth of records
+Generate = Callable[[int], Any]
+# Constraints of a field, minimum, maximum, exclusiveMinimum, exclusiveMaximum, minLength, maxLength, minItems and
+# maxItems like in the JSON schema of a pydantic model
+Bounds = Dict[str, Any]
+
+BOUND_KEYS = frozenset(
+    ["minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum", "minLength", "maxLength", "minItems", "maxItems"]
+)
+# Ranges of the generated numbers without bounds
+INT_RANGE = (-(2**31), 2**31 - 1)
+LONG_RANGE = (-(2**63), 2**63 - 1)
+FLOAT_RANGE = (-1e6, 1e6)
+# Range of the generated timestamps and dates, in microseconds since epoch
+TIMESTAMP_RANGE = (
+    datetime_to_micros(datetime(2000, 1, 1, tzinfo=timezone.utc)),
+    datetime_to_micros(datetime(2030, 1, 1, tzinfo=timezone.utc)),
+)
+DAY_MICROS = 86_400_000_000
+# Default number of digits of decimals without precision
+DECIMAL_PRECISION = 10
+# Records nested deeper than this only get null or empty values where the schema allows, ending recursive schemas
+MAX_DEPTH = 8
+
+ALPHABET = string.ascii_letters + string.digits
+# Strings are random slices of a random text, which is much faster than picking every character
+TEXT_SIZE = 64 * 1024
+_FLOAT = struct.Struct("<f")
+
+
+def model_bounds(model: type) -> Dict[Tuple[str, str], Bounds]:
+    """Returns the constraints of the fields of a pydantic model and its nested models, by record and field name"""
+    from pydantic_avro.to_avro.config import DEFS_NAME, PYDANTIC_V2
+
+    if PYDANTIC_V2:
+        json_schema = model.model_json_schema(by_alias=True)  # type: ignore[attr-defined]
+    else:
+        json_schema = model.schema(by_alias=True)  # type: ignore[attr-defined]
+    definitions = {json_schema["title"]: json_schema, **json_schema.get(DEFS_NAME, {})}
+    bounds = {}
+    for record, definition in definitions.items():
+        for field, props in definition.get("properties", {}).items():
+            # Constraints of optional fields are on the non-null element of the union
+            candidates = [props, *props.get("anyOf", []), *props.get("allOf", [])]
+            field_bounds = {k: v for c in candidates for k, v in c.items() if k in BOUND_KEYS}
+            if field_bounds:
+                bounds[(record, field)] = field_bounds
+    return bounds
+
+
+def _range(bounds: Optional[Bounds], default: Tuple[Any, Any], step: Any) -> Tuple[Any, Any]:
+    """Returns the inclusive range of numbers within the bounds and the default range"""
+    lo, hi = default
+    if bounds:
+        if bounds.get("minimum") is not None:
+            lo = max(lo, bounds["minimum"])
+        if bounds.get("exclusiveMinimum") is not None:
+            lo = max(lo, bounds["exclusiveMinimum"] + step)
+        if bounds.get("maximum") is not None:
+            hi = min(hi, bounds["maximum"])
+        if bounds.get("exclusiveMaximum") is not None:
+            hi = min(hi, bounds["exclusiveMaximum"] - step)
+    if lo > hi:
+        raise ValueError(f"No values within the bounds {bounds}")
+    return lo, hi
+
+
+def _int_generator(rng: random.Random, lo: int, hi: int) -> Callable[[], int]:
+    """Returns a function returning random ints in the inclusive range, faster than `randint`"""
+    span = hi - lo + 1
+    if span <= 2**53:
+        rand = rng.random
+        return lambda: lo + int(rand() * span)
+    getrandbits, bits = rng.getrandbits, span.bit_length()
+    return lambda: lo + getrandbits(bits) % span
+
+
+def _length_range(bounds: Optional[Bounds], min_key: str, max_key: str, default: int) -> Tuple[int, int]:
+    lo = (bounds or {}).get(min_key) or 0
+    hi = (bounds or {}).get(max_key)
+    return lo, max(lo, default) if hi is None else hi
+
+
+class GeneratorCompiler:
+    """Compiles an Avro schema into nested closures that generate random datums of the schema.
+
+    Datums are like the decoded datums of `DecoderCompiler`: records are dicts, enums their symbol and logical types
+    their python type, or with `raw_timestamps` the ints timestamps and dates are encoded as.
+    """
+
+    def __init__(
+        self,
+        schema: AvroSchema,
+        rng: random.Random,
+        bounds: Optional[Dict[Tuple[str, str], Bounds]] = None,
+        raw_timestamps: bool = False,
+    ):
+        self.rng = rng
+        self.bounds = bounds or {}
+        self.raw_timestamps = raw_timestamps
+        self.names = collect_named_types(schema)
+        self._generators: Dict[str, Generate] = {}
+        self._text = "".join(rng.choices(ALPHABET, k=TEXT_SIZE))
+
+    def generator(self, schema: AvroSchema, bounds: Optional[Bounds] = None) -> Generate:
+        """Returns a generator for the given (sub) schema, numbers, strings and collections within the bounds"""
+        if isinstance(schema, str) and schema in self._generators:
+            return self._generators[schema]
+        schema = resolve(schema, self.names)
+        t = schema_type(schema)
+        lt = logical_type(schema)
+        if lt in FROM_AVRO or lt == "decimal" or (lt == "uuid" and t == "string"):
+            return self._logical_generator(schema, lt)
+        if t in ("record", "error"):
+            return self._record_generator(schema)
+        if t == "enum":
+            return self._enum_generator(schema)
+        if t == "fixed":
+            return self._bytes_generator(schema["size"], schema["size"], schema)
+        if t == "array":
+            return self._array_generator(schema, bounds)
+        if t == "map":
+            return self._map_generator(schema, bounds)
+        if t == "union":
+            return self._union_generator(schema, bounds)
+        return self._primitive_generator(t, bounds)
+
+    def _register(self, schema: dict, func: Generate) -> None:
+        name = schema["name"]
+        self._generators[fullname(name, schema.get("namespace"))] = func
+        self._generators[name.rsplit(".", 1)[-1]] = func
+
+    def _primitive_generator(self, t: str, bounds: Optional[Bounds]) -> Generate:
+        rng = self.rng
+        if t == "null":
+            return lambda depth: None
+        if t == "boolean":
+            return lambda depth: rng.random() < 0.5
+        if t in ("int", "long"):
+            randint = _int_generator(rng, *_range(bounds, INT_RANGE if t == "int" else LONG_RANGE, 1))
+            return lambda depth: randint()
+        if t in ("float", "double"):
+            flo, fhi = _range(bounds, FLOAT_RANGE, 0)
+            uniform = rng.uniform
+            if t == "double":
+                return lambda depth: uniform(flo, fhi)
+            pack, unpack = _FLOAT.pack, _FLOAT.unpack
+            # Rounded to single precision, so the value survives encoding
+            return lambda depth: unpack(pack(uniform(flo, fhi)))[0]
+        if t == "string":
+            return self._string_generator(*_length_range(bounds, "minLength", "maxLength", STRING_SIZE))
+        if t == "bytes":
+            return self._bytes_generator(*_length_range(bounds, "minLength", "maxLength", STRING_SIZE))
+        raise NotImplementedError(f"Type '{t}' not supported yet")
+
+    def _string_generator(self, lo: int, hi: int) -> Generate:
+        text = self._text
+        if hi > len(text):
+            choices, length = self.rng.choices, _int_generator(self.rng, lo, hi)
+            return lambda depth: "".join(choices(ALPHABET, k=length()))
+        length, offset = _int_generator(self.rng, lo, hi), _int_generator(self.rng, 0, len(text) - hi)
+
+        def generate_string(depth):
+            start = offset()
+            return text[start : start + length()]
+
+        return generate_string
+
+    def _bytes_generator(self, lo: int, hi: int, schema: Optional[dict] = None) -> Generate:
+        getrandbits, length = self.rng.getrandbits, _int_generator(self.rng, lo, hi)
+
+        def generate_bytes(depth):
+            size = length()
+            return getrandbits(8 * size).to_bytes(size, "little") if size else b""
+
+        if schema is not None and "name" in schema:
+            self._register(schema, generate_bytes)
+        return generate_bytes
+
+    def _logical_generator(self, schema: dict, lt: str) -> Generate:
+        rng = self.rng
+        if lt == "uuid":
+            getrandbits = rng.getrandbits
+            return lambda depth: UUID(int=getrandbits(128), version=4)
+        if lt == "decimal":
+            scale = schema.get("scale", 0)
+            limit = 10 ** schema.get("precision", DECIMAL_PRECISION) - 1
+            if schema["type"] == "fixed":
+                limit = min(limit, 2 ** (8 * schema["size"] - 1) - 1)
+            unscaled = _int_generator(rng, -limit, limit)
+            return lambda depth: unscaled_to_decimal(unscaled(), scale)
+
+        randint = _int_generator(
+            rng,
+            *{
+                "timestamp-millis": (TIMESTAMP_RANGE[0] // 1000, TIMESTAMP_RANGE[1] // 1000),
+                "timestamp-micros": TIMESTAMP_RANGE,
+                "date": (TIMESTAMP_RANGE[0] // DAY_MICROS, TIMESTAMP_RANGE[1] // DAY_MICROS),
+                "time-millis": (0, DAY_MICROS // 1000 - 1),
+                "time-micros": (0, DAY_MICROS - 1),
+            }[lt],
+        )
+        if self.raw_timestamps and lt in RAW_TIMESTAMP_TYPES:
+            return lambda depth: randint()
+        convert = FROM_AVRO[lt]
+        return lambda depth: convert(randint())
+
+    def _record_generator(self, schema: dict) -> Generate:
+        implementation: List[Generate] = []
+        self._register(schema, lambda depth: implementation[0](depth))
+        fields = [
+            (field["name"], self.generator(field["type"], self.bounds.get((schema["name"], field["name"]))))
+            for field in schema["fields"]
+        ]
+
+        def generate_record(depth):
+            depth += 1
+            return {name: generate(depth) for name, generate in fields}
+
+        implementation.append(generate_record)
+        self._register(schema, generate_record)
+        return generate_record
+
+    def _enum_generator(self, schema: dict) -> Generate:
+        symbols = schema["symbols"]
+        index = _int_generator(self.rng, 0, len(symbols) - 1)
+
+        def generate_enum(depth):
+            return symbols[index()]
+
+        self._register(schema, generate_enum)
+        return generate_enum
+
+    def _array_generator(self, schema: dict, bounds: Optional[Bounds]) -> Generate:
+        generate_item = self.generator(schema["items"])
+        lo, hi = _length_range(bounds, "minItems", "maxItems", COLLECTION_ITEMS)
+        length = _int_generator(self.rng, lo, hi)
+
+        def generate_array(depth):
+            return [generate_item(depth) for _ in range(lo if depth > MAX_DEPTH else length())]
+
+        return generate_array
+
+    def _map_generator(self, schema: dict, bounds: Optional[Bounds]) -> Generate:
+        generate_value = self.generator(schema["values"])
+        generate_key = self._string_generator(1, STRING_SIZE)
+        lo, hi = _length_range(bounds, "minItems", "maxItems", COLLECTION_ITEMS)
+        length = _int_generator(self.rng, lo, hi)
+
+        def generate_map(depth):
+            return {generate_key(depth): generate_value(depth) for _ in range(lo if depth > MAX_DEPTH else length())}
+
+        return generate_map
+
+    def _union_generator(self, schema: list, bounds: Optional[Bounds]) -> Generate:
+        branches = [self.generator(branch, bounds) for branch in schema]
+        # Branch that ends recursion, null if the union has it
+        last = next((i for i, branch in enumerate(schema) if resolve(branch, self.names) == "null"), 0)
+        index = _int_generator(self.rng, 0, len(branches) - 1)
+
+        def generate_union(depth):
+            return branches[last if depth > MAX_DEPTH else index()](depth)
+
+        return generate_union
+
+
+class DataGenerator:
+    """Generates random, valid datums for an AvroBase model or an avro schema, for load tests and benchmarks.
+
+    The values respect the enums, unions, logical types, fixed sizes and decimal precisions of the schema. For
+    models the constraints of the fields (`ge`, `le`, `gt`, `lt`, `min_length`, `max_length`) are respected as well.
+    With a seed the generated data is the same for every run.
+
+    :param source: An AvroBase model, an avro schema, or the path to an .avsc file
+    :param seed: Seed of the random generator
+    """
+
+    def __init__(self, source: Union[type, dict, str, "os.PathLike[str]"], seed: Optional[int] = None):
+        self.model: Optional[type] = None
+        bounds = None
+        if isinstance(source, dict):
+            self.schema = source
+        elif isinstance(source, type):
+            from pydantic_avro.binary.models import model_schema
+
+            self.model = source
+            self.schema = model_schema(source)
+            bounds = model_bounds(source)
+        else:
+            with open(source) as fh:
+                self.schema = json.load(fh)
+        self.rng = random.Random(seed)
+        self._generate = GeneratorCompiler(self.schema, self.rng, bounds).generator(self.schema)
+        # Generates the ints of timestamps and dates for encoding, which saves creating datetimes
+        self._generate_raw = GeneratorCompiler(self.schema, self.rng, bounds, raw_timestamps=True).generator(
+            self.schema
+        )
+        self._encode = compile_encoder(self.schema)
+
+    def records(self, n: int) -> List[Any]:
+        """Returns n datums, like decoded datums with python values for logical types"""
+        generate = self._generate
+        return [generate(0) for _ in range(n)]
+
+    def instances(self, n: int) -> List[Any]:
+        """Returns n validated instances of the model"""
+        if self.model is None:
+            raise ValueError("Instances can only be generated for a model, not for a schema")
+        from pydantic_avro.binary.models import validate_model
+
+        return [validate_model(self.model, record) for record in self.records(n)]
+
+    def encoded(self, n: int, distinct: Optional[int] = None) -> List[bytes]:
+        """Returns n binary encoded datums
+
+        :param n: The number of datums
+        :param distinct: Generates only this many different datums and repeats them, to create large load test
+                         payloads fast
+        """
+        generate, encode = self._generate_raw, self._encode
+        count = n if distinct is None else min(n, distinct)
+        buf = bytearray()
+        ends = []
+        for _ in range(count):
+            encode(buf, generate(0))
+            ends.append(len(buf))
+        data = bytes(buf)
+        encoded = [data[start:end] for start, end in zip([0, *ends], ends)]
+        if count and count < n:
+            encoded = (encoded * (n // count + 1))[:n]
+        return encoded
+
+    def write(self, fo: IO[bytes], n: int, codec: str = "null", block_size: int = BLOCK_SIZE) -> None:
+        """Writes n datums to an avro object container file"""
+        generate = self._generate_raw
+        with OcfWriter(fo, self.schema, codec=codec, block_size=block_size) as writer:
+            for _ in range(n):
+                writer.write(generate(0))
@@ -0,0 +1,182 @@
+import mmap
+import struct
+from typing import Any, Callable, Generic, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from pydantic_avro.binary.decoder import DecoderCompiler, Reader
+from pydantic_avro.binary.lazy import record_layout
+from pydantic_avro.binary.models import model_schema, validate_model
+from pydantic_avro.binary.ocf import SYNC_SIZE, OcfReader
+from pydantic_avro.binary.predicate import PredicateCompiler
+
+M = TypeVar("M", bound=BaseModel)
+
+MAGIC = b"AVIX"
+VERSION = 1
+# Magic, version, kind of the keys, number of entries and the sync marker of the indexed file
+HEADER = struct.Struct(f"<4sBB2xQ{SYNC_SIZE}s")
+# Entries of int keys: key, block offset and position of the record in the block
+INT_ENTRY = struct.Struct("<qQI")
+# Entries of bytes keys: offset and length of the key in the keys that follow the entries, block offset and position
+BYTES_ENTRY = struct.Struct("<QIQI")
+INT_KEYS = 0
+BYTES_KEYS = 1
+
+
+def _key_reader(model: Type[BaseModel], schema: dict, field: str) -> Tuple[Reader, Callable[[Any], Any]]:
+    """Returns the reader of the raw key of the encoded records and the conversion of keys to raw keys"""
+    layout = record_layout(model)
+    if field not in layout.indexes:
+        raise ValueError(f"'{model.__name__}' has no field '{field}'")
+    return PredicateCompiler(schema).field_reader(layout.names[layout.indexes[field]])
+
+
+def index_path_for(path: str, field: str) -> str:
+    """Returns the default path of the index of a field of a file, next to the file"""
+    return f"{path}.{field}.idx"
+
+
+def build_key_index(model: Type[BaseModel], path: str, field: str, index_path: Optional[str] = None) -> str:
+    """Writes a sorted index of a key field of the records of an object container file, returns the path of the index
+
+    The index holds the offset of the block and the position in the block of every record by key, sorted by key, in
+    a binary file that is memory mapped by `KeyIndex`. Keys are ints (also timestamps, dates and enums) or strings
+    and bytes, records with a null key are not indexed.
+
+    :param model: The AvroBase model the file was written with
+    :param path: Path of the object container file
+    :param field: Name or alias of the key field
+    :param index_path: Path of the index, by default next to the file, see `index_path_for`
+    """
+    read_key, _ = _key_reader(model, model_schema(model), field)
+
+    entries: List[Tuple[Any, int, int]] = []
+    with open(path, "rb") as fo:
+        reader = OcfReader(fo)
+        for block in reader.iter_blocks():
+            data, pos = block.data, 0
+            for i in range(block.num_records):
+                key, pos = read_key(data, pos)
+                if key is not None:
+                    entries.append((key, block.offset, i))
+    kinds = {type(key) for key, _, _ in entries}
+    if kinds - {int, bytes} or len(kinds) > 1:
+        raise ValueError(
+            f"Keys should be ints, strings or bytes, field '{field}' has {sorted(k.__name__ for k in kinds)}"
+        )
+    entries.sort(key=lambda entry: entry[0])
+
+    index_path = index_path or index_path_for(path, field)
+    with open(index_path, "wb") as out:
+        if kinds == {bytes}:
+            out.write(HEADER.pack(MAGIC, VERSION, BYTES_KEYS, len(entries), reader.sync_marker))
+            offset = 0
+            for key, block_offset, i in entries:
+                out.write(BYTES_ENTRY.pack(offset, len(key), block_offset, i))
+                offset += len(key)
+            for key, _, _ in entries:
+                out.write(key)
+        else:
+            out.write(HEADER.pack(MAGIC, VERSION, INT_KEYS, len(entries), reader.sync_marker))
+            for entry in entries:
+                out.write(INT_ENTRY.pack(*entry))
+    return index_path
+
+
+class KeyIndex:
+    """Memory mapped index of a key field written by `build_key_index`, keys are looked up by binary search"""
+
+    def __init__(self, index_path: str):
+        with open(index_path, "rb") as fo:
+            self._map = mmap.mmap(fo.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.kind, self.count, self.sync_marker = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{index_path} is not a key index")
+        self._entry = BYTES_ENTRY if self.kind == BYTES_KEYS else INT_ENTRY
+        self._keys = HEADER.size + self.count * self._entry.size
+        self._key_at: Callable[[int], Any] = self._bytes_key if self.kind == BYTES_KEYS else self._int_key
+
+    def _int_key(self, i: int) -> int:
+        return INT_ENTRY.unpack_from(self._map, HEADER.size + i * INT_ENTRY.size)[0]
+
+    def _bytes_key(self, i: int) -> bytes:
+        offset, length, _, _ = BYTES_ENTRY.unpack_from(self._map, HEADER.size + i * BYTES_ENTRY.size)
+        start = self._keys + offset
+        return self._map[start : start + length]
+
+    def lookup(self, key: Any) -> List[Tuple[int, int]]:
+        """Returns the (block offset, position in block) of the records with the raw avro key, in file order"""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        found = []
+        while lo < self.count and self._key_at(lo) == key:
+            found.append(tuple(self._entry.unpack_from(self._map, HEADER.size + lo * self._entry.size)[-2:]))
+            lo += 1
+        return found
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        self._map.close()
+
+
+class IndexedOcfFile(Generic[M]):
+    """Point lookups of model instances by a key field in an object container file with a key index.
+
+    Only the block of a found record is read and decompressed, and only the record itself is decoded. The last read
+    block is kept, so lookups of keys that are close together in the file read the block once.
+
+    :param model: The AvroBase model the file was written with
+    :param path: Path of the object container file
+    :param field: Name or alias of the key field
+    :param index_path: Path of the index written by `build_key_index`, by default next to the file
+    """
+
+    def __init__(self, model: Type[M], path: str, field: str, index_path: Optional[str] = None):
+        self.model = model
+        self.index = KeyIndex(index_path or index_path_for(path, field))
+        self._fo = open(path, "rb")
+        self._reader = OcfReader(self._fo)
+        if self._reader.sync_marker != self.index.sync_marker:
+            self.close()
+            raise ValueError(f"The index of {path} was built for another file")
+        _, self._convert = _key_reader(model, self._reader.schema, field)
+        compiler = DecoderCompiler(self._reader.schema)
+        self._decode = compiler.reader(self._reader.schema)
+        self._skip = compiler.skipper(self._reader.schema)
+        self._block: Optional[Tuple[int, bytes]] = None
+
+    def _record(self, block_offset: int, position: int) -> M:
+        if self._block is None or self._block[0] != block_offset:
+            self._block = block_offset, self._reader.read_block(block_offset).data
+        data, pos = self._block[1], 0
+        for _ in range(position):
+            pos = self._skip(data, pos)
+        return validate_model(self.model, self._decode(data, pos)[0])
+
+    def get(self, key: Any) -> Optional[M]:
+        """Returns the first instance with the key, or None"""
+        found = self.index.lookup(self._convert(key))
+        return self._record(*found[0]) if found else None
+
+    def get_all(self, key: Any) -> List[M]:
+        """Returns the instances with the key, in file order"""
+        return [self._record(*location) for location in self.index.lookup(self._convert(key))]
+
+    def close(self) -> None:
+        self.index.close()
+        self._fo.close()
+
+    def __enter__(self) -> "IndexedOcfFile[M]":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
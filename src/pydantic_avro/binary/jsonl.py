@@ -0,0 +1,861 @@
+import json
+import re
+from collections import deque
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import IO, Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from pydantic_avro.binary.codecs import get_codec
+from pydantic_avro.binary.decoder import PRIMITIVE_READERS, DecoderCompiler, Reader, read_bytes, read_long
+from pydantic_avro.binary.encoder import (
+    DOUBLE,
+    FLOAT,
+    Discriminators,
+    Writer,
+    unscaled_decimal,
+    unscaled_to_bytes,
+    write_long,
+)
+from pydantic_avro.binary.logical import TO_AVRO, days_to_date, micros_to_time, millis_to_time, unscaled_to_decimal
+from pydantic_avro.binary.models import model_discriminators, model_schema
+from pydantic_avro.binary.ocf import BLOCK_SIZE, OcfReader, OcfWriter
+from pydantic_avro.binary.schema import (
+    NAMED_TYPES,
+    AvroSchema,
+    collect_named_types,
+    fullname,
+    logical_type,
+    resolve,
+    schema_type,
+    unwrap,
+)
+
+# The shapes of JSON values: "pydantic" as `model_dump_json(by_alias=True)` writes them (ISO strings for timestamps,
+# dates and times, plain values for unions) and "avro" as the JSON encoding of the avro specification (raw ints for
+# logical types, bytes as code points 0-255 and non-null union values wrapped in {"type name": value})
+JSON_FORMATS = ("pydantic", "avro")
+# Number of lines that are encoded together by a worker process
+CHUNK_SIZE = 10_000
+# Compact like pydantic, non-ASCII characters are written as UTF-8 instead of escaped
+JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+INT_RANGE = range(-(2**31), 2**31)
+LONG_RANGE = range(-(2**63), 2**63)
+# The JSON types of the values that can be written with a schema type, to select the branches of unions
+JSON_TYPES: Dict[str, Tuple[type, ...]] = {
+    "null": (type(None),),
+    "boolean": (bool,),
+    "int": (int, float),
+    "long": (int, float),
+    "float": (int, float),
+    "double": (int, float),
+    "bytes": (str,),
+    "string": (str,),
+    "enum": (str,),
+    "fixed": (str,),
+    "record": (dict,),
+    "error": (dict,),
+    "array": (list,),
+    "map": (dict,),
+}
+# The JSON types that pydantic writes the values of numbers as, the branches of unions of which the type matches
+# the value exactly are tried first, so 1.0 is written to a double rather than to a long
+EXACT_JSON_TYPES: Dict[str, Tuple[type, ...]] = {
+    "int": (int,),
+    "long": (int,),
+    "float": (float,),
+    "double": (float,),
+}
+# The JSON types of the logical types in pydantic JSON
+LOGICAL_JSON_TYPES: Dict[str, Tuple[type, ...]] = {
+    "timestamp-millis": (str,),
+    "timestamp-micros": (str,),
+    "date": (str,),
+    "time-millis": (str,),
+    "time-micros": (str,),
+    "uuid": (str,),
+    "decimal": (str, int, float),
+}
+
+
+def _parse_datetime(value: str) -> datetime:
+    # fromisoformat only accepts the Z of UTC since python 3.11
+    return datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+
+
+# UUIDs as pydantic writes them, other UUIDs are parsed to write them in this form
+CANONICAL_UUID = re.compile("[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+# Conversion of the ISO strings of pydantic JSON to the python value of a logical type
+FROM_JSON = {
+    "timestamp-millis": _parse_datetime,
+    "timestamp-micros": _parse_datetime,
+    "date": date.fromisoformat,
+    "time-millis": time.fromisoformat,
+    "time-micros": time.fromisoformat,
+}
+
+
+class JsonEncoderCompiler:
+    """Compiles an Avro schema into nested closures that validate parsed JSON values and write their binary encoding.
+
+    The values are checked against the schema while they are written, without constructing models, so every line
+    that is written is valid for the schema. Invalid values raise a ValueError.
+
+    :param json_format: The shape of the JSON values, see `JSON_FORMATS`
+    :param discriminators: Discriminator property and value by record name, records of unions are then selected by
+                           the value of the property instead of by their fields, see `model_discriminators`
+    """
+
+    def __init__(
+        self, schema: AvroSchema, json_format: str = "pydantic", discriminators: Optional[Discriminators] = None
+    ):
+        if json_format not in JSON_FORMATS:
+            raise ValueError(f"Unknown JSON format '{json_format}', expected one of {JSON_FORMATS}")
+        self.avro_json = json_format == "avro"
+        self.root_schema = schema
+        self.names = collect_named_types(schema)
+        self.discriminators = discriminators or {}
+        self._writers: Dict[str, Writer] = {}
+        # Set for the compilers of defaults, which hold bytes as code points 0-255 and, in avro JSON, the value of the
+        # first type of unions as the avro specification defines them
+        self._defaults = False
+        self._default_compilers: Optional[List["JsonEncoderCompiler"]] = None
+
+    def writer(self, schema: AvroSchema) -> Writer:
+        """Returns a writer of JSON values for the given (sub) schema"""
+        schema = unwrap(schema)
+        if isinstance(schema, str) and schema in self._writers:
+            return self._writers[schema]
+        schema = resolve(schema, self.names)
+        t = schema_type(schema)
+        lt = logical_type(schema)
+        if lt is not None and (lt in FROM_JSON or lt in ("uuid", "decimal")):
+            return self._logical_writer(schema, lt)
+        if t in ("int", "long"):
+            return self._int_writer(INT_RANGE if t == "int" else LONG_RANGE)
+        if t in ("float", "double"):
+            return self._float_writer(FLOAT if t == "float" else DOUBLE)
+        if t in ("null", "boolean", "string", "bytes"):
+            return getattr(self, f"_{t}_writer")()
+        if t in ("record", "error"):
+            return self._record_writer(schema)
+        if t == "enum":
+            return self._enum_writer(schema)
+        if t == "fixed":
+            return self._fixed_writer(schema)
+        if t == "array":
+            return self._array_writer(schema)
+        if t == "map":
+            return self._map_writer(schema)
+        if t == "union":
+            return self._union_writer(schema)
+        raise NotImplementedError(f"Type '{t}' not supported yet")
+
+    def _register(self, schema: dict, func: Writer):
+        name = schema["name"]
+        self._writers[fullname(name, schema.get("namespace"))] = func
+        self._writers[name.rsplit(".", 1)[-1]] = func
+
+    @staticmethod
+    def _null_writer() -> Writer:
+        def write_null(buf, value):
+            if value is not None:
+                raise ValueError(f"Expected null, got {value!r}")
+
+        return write_null
+
+    @staticmethod
+    def _boolean_writer() -> Writer:
+        def write_boolean(buf, value):
+            if value is True:
+                buf.append(1)
+            elif value is False:
+                buf.append(0)
+            else:
+                raise ValueError(f"Expected a boolean, got {value!r}")
+
+        return write_boolean
+
+    @staticmethod
+    def _int_writer(valid: range) -> Writer:
+        def write_int(buf, value):
+            if value.__class__ is float and value.is_integer():
+                value = int(value)
+            if value.__class__ is not int or value not in valid:
+                raise ValueError(f"Expected an int from {valid.start} to {valid.stop - 1}, got {value!r}")
+            write_long(buf, value)
+
+        return write_int
+
+    @staticmethod
+    def _float_writer(packer) -> Writer:
+        pack = packer.pack
+
+        def write_float(buf, value):
+            if value.__class__ is not float and value.__class__ is not int:
+                raise ValueError(f"Expected a number, got {value!r}")
+            buf += pack(value)
+
+        return write_float
+
+    @staticmethod
+    def _string_writer() -> Writer:
+        def write_string(buf, value):
+            if value.__class__ is not str:
+                raise ValueError(f"Expected a string, got {value!r}")
+            data = value.encode("utf-8")
+            write_long(buf, len(data))
+            buf += data
+
+        return write_string
+
+    def _bytes_writer(self) -> Writer:
+        to_bytes = self._to_bytes()
+
+        def write_bytes(buf, value):
+            data = to_bytes(value)
+            write_long(buf, len(data))
+            buf += data
+
+        return write_bytes
+
+    def _to_bytes(self):
+        """Returns the conversion of the JSON strings of bytes, code points 0-255 in avro JSON and UTF-8 in pydantic"""
+        encoding = "latin-1" if self.avro_json or self._defaults else "utf-8"
+
+        def to_bytes(value):
+            if value.__class__ is not str:
+                raise ValueError(f"Expected bytes as a string, got {value!r}")
+            try:
+                return value.encode(encoding)
+            except UnicodeEncodeError:
+                raise ValueError(f"Expected bytes as {encoding} text, got {value!r}") from None
+
+        return to_bytes
+
+    def _logical_writer(self, schema: dict, lt: str) -> Writer:
+        """Returns a writer of the JSON value of a logical type, avro JSON holds the underlying type"""
+        if self.avro_json and lt != "decimal":
+            return self.writer(schema["type"])
+        if lt == "uuid":
+            write_string = self._string_writer()
+            canonical = CANONICAL_UUID.fullmatch
+
+            def write_uuid(buf, value):
+                if value.__class__ is not str or canonical(value) is None:
+                    try:
+                        value = str(UUID(value))
+                    except (TypeError, ValueError, AttributeError):
+                        raise ValueError(f"Expected a UUID, got {value!r}") from None
+                write_string(buf, value)
+
+            return write_uuid
+        if lt == "decimal":
+            return self._decimal_writer(schema)
+
+        parse, convert = FROM_JSON[lt], TO_AVRO[lt]
+
+        def write_logical(buf, value):
+            try:
+                # The parsed values are always in the range of their underlying type
+                write_long(buf, convert(parse(value)))
+            except (AttributeError, TypeError, ValueError):
+                raise ValueError(f"Expected an ISO formatted {lt}, got {value!r}") from None
+
+        return write_logical
+
+    def _decimal_writer(self, schema: dict) -> Writer:
+        if self.avro_json:
+            # The two's complement bytes as code points, like other bytes
+            return self._fixed_writer(schema) if schema["type"] == "fixed" else self._bytes_writer()
+        scale = schema.get("scale", 0)
+        size = schema.get("size")
+        write_raw = self._fixed_writer(schema, raw=True) if size is not None else None
+
+        def write_decimal(buf, value):
+            if value.__class__ is bool or not isinstance(value, (str, int, float)):
+                raise ValueError(f"Expected a decimal, got {value!r}")
+            try:
+                data = unscaled_to_bytes(unscaled_decimal(Decimal(str(value)), scale), size)
+            except InvalidOperation:
+                raise ValueError(f"Expected a decimal, got {value!r}") from None
+            if write_raw is None:
+                write_long(buf, len(data))
+                buf += data
+            else:
+                write_raw(buf, data)
+
+        if "name" in schema:
+            self._register(schema, write_decimal)
+        return write_decimal
+
+    def _encode_default(self, schema: AvroSchema, default: Any) -> bytes:
+        """Returns the binary encoding of the default of a field.
+
+        Defaults are taken as pydantic writes them, as in the schemas of AvroBase models, or else as the avro
+        specification defines them: the underlying value of logical types and the value of the first type of unions,
+        without naming the type. Bytes are code points 0-255 in both, pydantic only writes defaults of ASCII bytes.
+        """
+        if self._default_compilers is None:
+            self._default_compilers = []
+            for json_format in JSON_FORMATS:
+                compiler = JsonEncoderCompiler(self.root_schema, json_format, self.discriminators)
+                compiler._defaults = True
+                self._default_compilers.append(compiler)
+        errors = []
+        for compiler in self._default_compilers:
+            buf = bytearray()
+            try:
+                compiler.writer(schema)(buf, default)
+                return bytes(buf)
+            except ValueError as e:
+                errors.append(str(e))
+        raise ValueError(f"Invalid default: {errors[0]}")
+
+    def _record_writer(self, schema: dict) -> Writer:
+        """Returns a writer of JSON objects, missing fields are written with their default"""
+        implementation: List[Writer] = []
+
+        def forward(buf, value):
+            # Only used by recursive references to the record while it is being compiled
+            implementation[0](buf, value)
+
+        self._register(schema, forward)
+        fields: List[Tuple[str, Writer, AvroSchema, bool, Any]] = [
+            (field["name"], self.writer(field["type"]), field["type"], "default" in field, field.get("default"))
+            for field in schema["fields"]
+        ]
+        record_name = schema["name"]
+        # The encoded defaults by field name, encoded when a field is first missing
+        defaults: Dict[str, bytes] = {}
+
+        def write_record(buf, value):
+            if value.__class__ is not dict:
+                raise ValueError(f"Expected an object for record '{record_name}', got {value!r}")
+            for name, write, field_type, has_default, default in fields:
+                if name in value:
+                    try:
+                        write(buf, value[name])
+                    except ValueError as e:
+                        raise ValueError(f"{record_name}.{name}: {e}") from None
+                elif has_default:
+                    data = defaults.get(name)
+                    if data is None:
+                        try:
+                            data = defaults[name] = self._encode_default(field_type, default)
+                        except ValueError as e:
+                            raise ValueError(f"{record_name}.{name}: {e}") from None
+                    buf += data
+                else:
+                    raise ValueError(f"Field '{name}' of record '{record_name}' is missing")
+
+        implementation.append(write_record)
+        self._register(schema, write_record)
+        return write_record
+
+    def _enum_writer(self, schema: dict) -> Writer:
+        indexes = {symbol: i for i, symbol in enumerate(schema["symbols"])}
+        enum_name = schema["name"]
+
+        def write_enum(buf, value):
+            index = indexes.get(value) if value.__class__ is str else None
+            if index is None:
+                raise ValueError(f"'{value}' is not a symbol of enum '{enum_name}'")
+            write_long(buf, index)
+
+        self._register(schema, write_enum)
+        return write_enum
+
+    def _fixed_writer(self, schema: dict, raw: bool = False) -> Writer:
+        size = schema["size"]
+        to_bytes = self._to_bytes()
+
+        def write_fixed(buf, value):
+            data = value if raw else to_bytes(value)
+            if len(data) != size:
+                raise ValueError(f"Fixed value should have {size} bytes, got {len(data)}")
+            buf += data
+
+        if "name" in schema and not raw:
+            self._register(schema, write_fixed)
+        return write_fixed
+
+    def _array_writer(self, schema: dict) -> Writer:
+        write_item = self.writer(schema["items"])
+
+        def write_array(buf, value):
+            if value.__class__ is not list:
+                raise ValueError(f"Expected an array, got {value!r}")
+            if value:
+                write_long(buf, len(value))
+                for item in value:
+                    write_item(buf, item)
+            buf.append(0)
+
+        return write_array
+
+    def _map_writer(self, schema: dict) -> Writer:
+        write_value = self.writer(schema["values"])
+
+        def write_map(buf, value):
+            if value.__class__ is not dict:
+                raise ValueError(f"Expected an object for a map, got {value!r}")
+            if value:
+                write_long(buf, len(value))
+                for key, item in value.items():
+                    data = key.encode("utf-8")
+                    write_long(buf, len(data))
+                    buf += data
+                    write_value(buf, item)
+            buf.append(0)
+
+        return write_map
+
+    def _union_writer(self, schema: list) -> Writer:
+        """Returns a writer of unions.
+
+        In avro JSON the branch is named by the value. In pydantic JSON the branches that can hold the JSON type of
+        the value are tried in order and the first one that the value is valid for is written, unless a record is
+        found by the value of its discriminator.
+        """
+        branches: List[Tuple[bytes, str, Writer]] = []
+        for i, branch in enumerate(schema):
+            tag = bytearray()
+            write_long(tag, i)
+            resolved = resolve(branch, self.names)
+            t = schema_type(resolved)
+            name = (
+                fullname(resolved["name"], resolved.get("namespace"))
+                if isinstance(resolved, dict) and "name" in resolved
+                else t
+            )
+            branches.append((bytes(tag), name, self.writer(branch)))
+        if self._defaults and self.avro_json:
+            first_tag, _, write_first = branches[0]
+
+            def write_first_branch(buf, value):
+                buf += first_tag
+                write_first(buf, value)
+
+            return write_first_branch
+        if self.avro_json:
+            return self._named_union_writer(schema, branches)
+
+        types: List[Tuple[Tuple[type, ...], Tuple[type, ...]]] = []
+        for branch in schema:
+            resolved = resolve(branch, self.names)
+            t = schema_type(resolved)
+            lt = logical_type(resolved) or ""
+            if lt in LOGICAL_JSON_TYPES:
+                # Pydantic writes all logical types as strings
+                types.append((LOGICAL_JSON_TYPES[lt], (str,)))
+            else:
+                types.append((JSON_TYPES[t], EXACT_JSON_TYPES.get(t, JSON_TYPES[t])))
+        # The branches to try by the JSON type of the values, those that match the type exactly first
+        candidates: Dict[type, List[Tuple[bytes, Writer]]] = {}
+        for cls in (type(None), bool, int, float, str, list, dict):
+            matching = [
+                (cls not in exact, tag, write)
+                for (tag, _, write), (json_types, exact) in zip(branches, types)
+                if cls in json_types
+            ]
+            # Sorting is stable, the exact and the other matches stay in the order of the union
+            candidates[cls] = [(tag, write) for _, tag, write in sorted(matching, key=lambda m: m[0])]
+        discriminator, by_discriminator = self._discriminator_table(schema, branches)
+
+        def write_union(buf, value):
+            if by_discriminator and value.__class__ is dict:
+                branch = by_discriminator.get(value.get(discriminator))
+                if branch is not None:
+                    buf += branch[0]
+                    branch[1](buf, value)
+                    return
+            tried = candidates.get(value.__class__, ())
+            if len(tried) == 1:
+                buf += tried[0][0]
+                tried[0][1](buf, value)
+                return
+            start = len(buf)
+            for tag, write in tried:
+                try:
+                    buf += tag
+                    write(buf, value)
+                    return
+                except ValueError:
+                    del buf[start:]
+            raise ValueError(f"{value!r} does not match any type of union {schema}")
+
+        return write_union
+
+    @staticmethod
+    def _named_union_writer(schema: list, branches: List[Tuple[bytes, str, Writer]]) -> Writer:
+        by_name: Dict[str, Tuple[bytes, Writer]] = {}
+        null = None
+        for tag, name, write in branches:
+            if name == "null":
+                null = tag
+            by_name.setdefault(name, (tag, write))
+            by_name.setdefault(name.rsplit(".", 1)[-1], (tag, write))
+
+        def write_union(buf, value):
+            if value is None and null is not None:
+                buf += null
+                return
+            if value.__class__ is dict and len(value) == 1:
+                name, item = next(iter(value.items()))
+                branch = by_name.get(name)
+                if branch is not None:
+                    buf += branch[0]
+                    branch[1](buf, item)
+                    return
+            raise ValueError(f"Expected null or {{type name: value}} for union {schema}, got {value!r}")
+
+        return write_union
+
+    def _discriminator_table(
+        self, schema: list, branches: List[Tuple[bytes, str, Writer]]
+    ) -> Tuple[Optional[str], Dict[Any, Tuple[bytes, Writer]]]:
+        """Returns the discriminator property of the records of a union and the (tag, writer) by its values"""
+        properties: Dict[str, Dict[Any, Tuple[bytes, Writer]]] = {}
+        for branch, (tag, name, write) in zip(schema, branches):
+            found = self.discriminators.get(name) or self.discriminators.get(name.rsplit(".", 1)[-1])
+            if found is not None and schema_type(resolve(branch, self.names)) in ("record", "error"):
+                properties.setdefault(found[0], {}).setdefault(found[1], (tag, write))
+        if len(properties) != 1:
+            return None, {}
+        return next(iter(properties.items()))
+
+
+def compile_json_encoder(
+    schema: AvroSchema, json_format: str = "pydantic", discriminators: Optional[Discriminators] = None
+) -> Writer:
+    """Returns a function that validates a parsed JSON value against the schema and appends its binary encoding"""
+    return JsonEncoderCompiler(schema, json_format, discriminators).writer(schema)
+
+
+# The encoder of the worker processes, compiled once per process by `_init_worker`
+_worker_encoder: Optional[Writer] = None
+
+
+def _init_worker(schema: dict, json_format: str, discriminators: Optional[Discriminators]) -> None:
+    global _worker_encoder
+    _worker_encoder = compile_json_encoder(schema, json_format, discriminators)
+
+
+def _encode_lines(encode: Writer, first_line: int, lines: List[Union[str, bytes]]) -> Tuple[bytes, int]:
+    """Returns the encoded records of JSON lines and their number, blank lines are skipped"""
+    buf = bytearray()
+    count = 0
+    for number, line in enumerate(lines, first_line):
+        if not line.strip():
+            continue
+        try:
+            encode(buf, json.loads(line))
+        except ValueError as e:
+            # Also the JSONDecodeError of invalid JSON
+            raise ValueError(f"Line {number}: {e}") from None
+        count += 1
+    return bytes(buf), count
+
+
+def _encode_chunk(first_line: int, lines: List[Union[str, bytes]]) -> Tuple[bytes, int]:
+    assert _worker_encoder is not None
+    return _encode_lines(_worker_encoder, first_line, lines)
+
+
+def _chunks(lines: Iterable[Union[str, bytes]], chunk_size: int) -> Iterator[Tuple[int, List[Union[str, bytes]]]]:
+    """Yields the number of the first line and the lines of chunks of lines"""
+    chunk: List[Union[str, bytes]] = []
+    first_line = 1
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == chunk_size:
+            yield first_line, chunk
+            first_line += chunk_size
+            chunk = []
+    if chunk:
+        yield first_line, chunk
+
+
+def json_lines_to_ocf(
+    schema: dict,
+    lines: Iterable[Union[str, bytes]],
+    out: IO[bytes],
+    codec: str = "null",
+    block_size: int = BLOCK_SIZE,
+    json_format: str = "pydantic",
+    discriminators: Optional[Discriminators] = None,
+    workers: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """Transcodes JSON lines into an avro object container file without constructing models, returns the number of
+    records
+
+    Every line is parsed and validated against the schema while it is encoded, see `JsonEncoderCompiler`. With
+    `workers`, chunks of `chunk_size` lines are encoded in a process pool while the file is written in the order of
+    the lines.
+
+    :param schema: The avro schema of the records
+    :param lines: The JSON lines, e.g. a file object, blank lines are skipped
+    :param out: Binary file object to write the file to
+    :param codec: Compression codec of the blocks
+    :param block_size: Target size in bytes of the uncompressed data of a block
+    :param json_format: The shape of the JSON values, see `JSON_FORMATS`
+    :param discriminators: The discriminators of the records of unions, see `model_discriminators`
+    :param workers: Number of processes encoding chunks of lines, by default lines are encoded in this process
+    :param chunk_size: Number of lines that are encoded together
+    """
+    # Compiled here too, to fail on an invalid schema or format before starting workers
+    encode = compile_json_encoder(schema, json_format, discriminators)
+    count = 0
+    with OcfWriter(out, schema, codec=codec, block_size=block_size) as writer:
+        for data, n in _encoded_chunks(encode, lines, chunk_size, workers, (schema, json_format, discriminators)):
+            writer.write_encoded(data, n)
+            count += n
+    return count
+
+
+def _encoded_chunks(
+    encode: Writer, lines: Iterable[Union[str, bytes]], chunk_size: int, workers: int, init_args: tuple
+) -> Iterator[Tuple[bytes, int]]:
+    """Yields the encoded chunks of lines in order, encoded in a process pool with workers"""
+    if workers <= 0:
+        for first_line, chunk in _chunks(lines, chunk_size):
+            yield _encode_lines(encode, first_line, chunk)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=init_args) as pool:
+        # At most two chunks per worker in flight, so memory stays bounded
+        pending: Deque[Any] = deque()
+        for first_line, chunk in _chunks(lines, chunk_size):
+            pending.append(pool.submit(_encode_chunk, first_line, chunk))
+            while len(pending) > 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_avro_json(model: Type[BaseModel], fo: IO[bytes], lines: Iterable[Union[str, bytes]], **kwargs: Any) -> int:
+    """Transcodes JSON lines of instances of a model, e.g. written with `model_dump_json(by_alias=True)`, into an avro
+    object container file without constructing the instances, see `json_lines_to_ocf` for the options
+
+    The keys of the lines are the field names of the avro schema, which are the aliases of aliased fields.
+
+    :param model: The AvroBase model to take the schema and discriminators from
+    :param fo: Binary file object to write to
+    :param lines: The JSON lines
+    """
+    kwargs.setdefault("discriminators", model_discriminators(model))
+    return json_lines_to_ocf(model_schema(model), lines, fo, **kwargs)
+
+
+# Naive, the exported timestamps are UTC and get a Z like pydantic writes them
+NAIVE_EPOCH = datetime(1970, 1, 1)
+
+
+def _micros_to_iso(value: int) -> str:
+    return (NAIVE_EPOCH + timedelta(microseconds=value)).isoformat() + "Z"
+
+
+def _millis_to_iso(value: int) -> str:
+    return (NAIVE_EPOCH + timedelta(milliseconds=value)).isoformat() + "Z"
+
+
+# Conversion of the avro value of a logical type to the ISO string of pydantic JSON
+TO_JSON: Dict[str, Callable[[Any], str]] = {
+    "timestamp-millis": _millis_to_iso,
+    "timestamp-micros": _micros_to_iso,
+    "date": lambda value: days_to_date(value).isoformat(),
+    "time-millis": lambda value: millis_to_time(value).isoformat(),
+    "time-micros": lambda value: micros_to_time(value).isoformat(),
+}
+
+
+def _read_utf8_bytes(buf, pos: int) -> Tuple[str, int]:
+    n, pos = read_long(buf, pos)
+    end = pos + n
+    try:
+        return bytes(buf[pos:end]).decode("utf-8"), end
+    except UnicodeDecodeError:
+        raise ValueError("Bytes are not valid UTF-8, export binary data in the avro JSON format") from None
+
+
+def _read_latin1_bytes(buf, pos: int) -> Tuple[str, int]:
+    n, pos = read_long(buf, pos)
+    end = pos + n
+    return bytes(buf[pos:end]).decode("latin-1"), end
+
+
+def _finite_reader(read: Reader) -> Reader:
+    def read_finite(buf, pos):
+        value, pos = read(buf, pos)
+        # Like pydantic, infinity and NaN are written as null
+        return (value if value - value == 0 else None), pos
+
+    return read_finite
+
+
+class JsonDecoderCompiler(DecoderCompiler):
+    """Compiles an Avro schema into nested closures that decode binary encoded datums to JSON values.
+
+    The values are ready for `json.dumps`, in the shape of `model_dump_json(by_alias=True)` or of the avro JSON
+    encoding, see `JSON_FORMATS`. Logical types are converted from their avro value to their JSON value directly,
+    without creating python objects like datetimes and UUIDs first.
+    """
+
+    def __init__(self, schema: AvroSchema, json_format: str = "pydantic"):
+        if json_format not in JSON_FORMATS:
+            raise ValueError(f"Unknown JSON format '{json_format}', expected one of {JSON_FORMATS}")
+        super().__init__(schema)
+        self.avro_json = json_format == "avro"
+        if self.avro_json:
+            self._primitive_readers = {**PRIMITIVE_READERS, "bytes": _read_latin1_bytes}
+        else:
+            self._primitive_readers = {
+                **PRIMITIVE_READERS,
+                "bytes": _read_utf8_bytes,
+                "float": _finite_reader(PRIMITIVE_READERS["float"]),
+                "double": _finite_reader(PRIMITIVE_READERS["double"]),
+            }
+
+    def _logical_reader(self, schema: dict, lt: str) -> Reader:
+        """Returns a reader of the JSON value of a logical type, avro JSON holds the underlying type"""
+        base = self._fixed_reader(schema) if schema["type"] == "fixed" else self._primitive_readers[schema["type"]]
+        if self.avro_json or lt == "uuid":
+            return base
+        if lt == "decimal":
+            scale = schema.get("scale", 0)
+            raw = DecoderCompiler._fixed_reader(self, schema) if schema["type"] == "fixed" else read_bytes
+
+            def read_decimal(buf, pos):
+                value, pos = raw(buf, pos)
+                return str(unscaled_to_decimal(int.from_bytes(value, "big", signed=True), scale)), pos
+
+            if "name" in schema:
+                self._register(self._readers, schema, read_decimal)
+            return read_decimal
+        convert = TO_JSON.get(lt)
+        if convert is None:
+            return base
+
+        def read_logical(buf, pos):
+            value, pos = base(buf, pos)
+            return convert(value), pos
+
+        return read_logical
+
+    def _fixed_reader(self, schema: dict) -> Reader:
+        read_raw = super()._fixed_reader(schema)
+        encoding = "latin-1" if self.avro_json else "utf-8"
+
+        def read_fixed(buf, pos):
+            value, pos = read_raw(buf, pos)
+            try:
+                return value.decode(encoding), pos
+            except UnicodeDecodeError:
+                raise ValueError("Bytes are not valid UTF-8, export binary data in the avro JSON format") from None
+
+        if "name" in schema:
+            self._register(self._readers, schema, read_fixed)
+        return read_fixed
+
+    def _union_reader(self, schema: list) -> Reader:
+        if not self.avro_json:
+            return super()._union_reader(schema)
+        # Values other than null are wrapped in {"type name": value}
+        branches = []
+        for branch in schema:
+            resolved = resolve(branch, self.names)
+            t = schema_type(resolved)
+            name = fullname(resolved["name"], resolved.get("namespace")) if t in NAMED_TYPES else t
+            branches.append((None if t == "null" else name, self.reader(branch)))
+
+        def read_union(buf, pos):
+            index, pos = read_long(buf, pos)
+            name, read = branches[index]
+            value, pos = read(buf, pos)
+            return (value if name is None else {name: value}), pos
+
+        return read_union
+
+
+def compile_json_decoder(schema: AvroSchema, json_format: str = "pydantic") -> Reader:
+    """Returns a reader that decodes datums of the schema to JSON values, see `JsonDecoderCompiler`"""
+    return JsonDecoderCompiler(schema, json_format).reader(schema)
+
+
+# The decoder and decompression of the export worker processes, compiled once per process by `_init_export_worker`
+_worker_decoder: Optional[Tuple[Reader, Callable[[bytes], bytes]]] = None
+
+
+def _init_export_worker(schema: dict, codec: str, json_format: str) -> None:
+    global _worker_decoder
+    _worker_decoder = compile_json_decoder(schema, json_format), get_codec(codec).decompress
+
+
+def _block_lines(decode: Reader, data: bytes, count: int) -> bytes:
+    """Returns the JSON lines of the records of the decompressed data of a block"""
+    dumps = JSON_ENCODER.encode
+    lines = []
+    pos = 0
+    for _ in range(count):
+        record, pos = decode(data, pos)
+        lines.append(dumps(record))
+    lines.append("")
+    return "\n".join(lines).encode("utf-8")
+
+
+def _export_block(data: bytes, count: int) -> bytes:
+    assert _worker_decoder is not None
+    decode, decompress = _worker_decoder
+    return _block_lines(decode, decompress(data), count)
+
+
+def ocf_to_json_lines(fo: IO[bytes], out: IO[bytes], json_format: str = "pydantic", workers: int = 0) -> int:
+    """Exports the records of an avro object container file as JSON lines without constructing models, returns the
+    number of records
+
+    The records are decoded to JSON values directly, see `JsonDecoderCompiler`. With `workers`, the blocks are
+    decompressed and decoded in a process pool while the lines are written in the order of the file.
+
+    :param fo: Binary file object of the object container file, is read block by block
+    :param out: Binary file object to write the UTF-8 encoded lines to, preferably buffered
+    :param json_format: The shape of the JSON values, see `JSON_FORMATS`
+    :param workers: Number of processes decoding blocks, by default blocks are decoded in this process
+    """
+    reader = OcfReader(fo)
+    # Compiled here too, to fail on an invalid schema or format before starting workers
+    decode = compile_json_decoder(reader.schema, json_format)
+    count = 0
+    if workers <= 0:
+        for block in reader.iter_blocks():
+            out.write(_block_lines(decode, block.data, block.num_records))
+            count += block.num_records
+        return count
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    init_args = (reader.schema, reader.codec, json_format)
+    with ProcessPoolExecutor(workers, initializer=_init_export_worker, initargs=init_args) as pool:
+        # At most two blocks per worker in flight, so memory stays bounded
+        pending: Deque[Any] = deque()
+        for block in reader.iter_raw_blocks():
+            pending.append(pool.submit(_export_block, block.data, block.num_records))
+            count += block.num_records
+            while len(pending) > 2 * workers:
+                out.write(pending.popleft().result())
+        while pending:
+            out.write(pending.popleft().result())
+    return count
+
+
+def export_json_lines(path: str, output: str, **kwargs: Any) -> int:
+    """Exports an object container file to a JSON lines file, see `ocf_to_json_lines` for the options"""
+    with open(path, "rb") as fo, open(output, "wb") as out:
+        return ocf_to_json_lines(fo, out, **kwargs)
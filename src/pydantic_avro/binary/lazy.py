@@ -0,0 +1,166 @@
+from typing import IO, Any, Dict, Generic, Iterator, List, NamedTuple, Optional, Tuple, Type, TypeVar
+from weakref import WeakKeyDictionary
+
+from pydantic import BaseModel
+
+from pydantic_avro.binary.decoder import DecoderCompiler, Reader, Skipper
+from pydantic_avro.binary.models import model_schema, validate_model
+from pydantic_avro.binary.ocf import OcfReader
+from pydantic_avro.binary.predicate import Filter, compile_predicate
+from pydantic_avro.to_avro.config import PYDANTIC_V2
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class RecordLayout(NamedTuple):
+    """The compiled fields of the avro schema of a model, shared by the lazy records of the model"""
+
+    model: type
+    names: Tuple[str, ...]
+    # Index of the avro field by attribute name and by avro field name, which differ for aliased fields
+    indexes: Dict[str, int]
+    readers: Tuple[Reader, ...]
+    skippers: Tuple[Skipper, ...]
+
+
+_LAYOUTS: "WeakKeyDictionary[type, RecordLayout]" = WeakKeyDictionary()
+
+
+def record_layout(model: Type[BaseModel]) -> RecordLayout:
+    """Returns the layout of the records of an AvroBase model, compiled once per model"""
+    layout = _LAYOUTS.get(model)
+    if layout is not None:
+        return layout
+    schema = model_schema(model)
+    compiler = DecoderCompiler(schema)
+    names = tuple(field["name"] for field in schema["fields"])
+    indexes = {name: i for i, name in enumerate(names)}
+    fields: Dict[str, Any] = model.model_fields if PYDANTIC_V2 else model.__fields__  # type: ignore[assignment]
+    for attribute, field in fields.items():
+        # The serialization alias is only in pydantic v2, in pydantic v1 the alias is the name without an alias
+        alias = getattr(field, "serialization_alias", None) or field.alias or attribute
+        if alias in indexes:
+            indexes.setdefault(attribute, indexes[alias])
+    layout = _LAYOUTS[model] = RecordLayout(
+        model,
+        names,
+        indexes,
+        tuple(compiler.reader(field["type"]) for field in schema["fields"]),
+        tuple(compiler.skipper(field["type"]) for field in schema["fields"]),
+    )
+    return layout
+
+
+class LazyRecord(Generic[M]):
+    """Proxy over an encoded record of a model that decodes a field when it is accessed.
+
+    The position of a field is found by skipping the fields before it, the positions and the decoded values are kept,
+    so every field is skipped and decoded at most once. Fields are decoded like `OcfReader` does, records as dicts
+    and enums as their symbol, `materialize()` returns the validated model instance. `raw` returns the encoded record,
+    which can be forwarded without decoding and encoding it again, e.g. with `OcfWriter.write_encoded`.
+    """
+
+    __slots__ = ("_layout", "_buf", "_offsets", "_values")
+
+    def __init__(self, layout: RecordLayout, buf: Any, pos: int = 0, offsets: Optional[List[int]] = None):
+        self._layout = layout
+        self._buf = buf
+        # Start positions of the fields found so far, followed by the end of the record when all are found
+        self._offsets = offsets or [pos]
+        self._values: Dict[int, Any] = {}
+
+    def _offset(self, index: int) -> int:
+        offsets = self._offsets
+        if index >= len(offsets):
+            skippers, buf, pos = self._layout.skippers, self._buf, offsets[-1]
+            for i in range(len(offsets) - 1, index):
+                pos = skippers[i](buf, pos)
+                offsets.append(pos)
+        return offsets[index]
+
+    def _field(self, index: int) -> Any:
+        try:
+            return self._values[index]
+        except KeyError:
+            value = self._values[index] = self._layout.readers[index](self._buf, self._offset(index))[0]
+            return value
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            # Fields do not start with an underscore, e.g. the slots before __init__ when unpickling
+            raise AttributeError(name)
+        index = self._layout.indexes.get(name)
+        if index is None:
+            raise AttributeError(f"'{self._layout.model.__name__}' has no field '{name}'")
+        return self._field(index)
+
+    def __getitem__(self, name: str) -> Any:
+        """Returns a field by its avro field name"""
+        index = self._layout.indexes.get(name)
+        if index is None:
+            raise KeyError(name)
+        return self._field(index)
+
+    @property
+    def end(self) -> int:
+        """The position after the record in the buffer"""
+        return self._offset(len(self._layout.names))
+
+    @property
+    def raw(self) -> bytes:
+        """The encoded record"""
+        return bytes(self._buf[self._offsets[0] : self.end])
+
+    def to_dict(self) -> dict:
+        """Returns the record as dict by avro field name, decoding the fields that were not accessed yet"""
+        return {name: self._field(i) for i, name in enumerate(self._layout.names)}
+
+    def materialize(self) -> M:
+        """Returns the instance of the model"""
+        return validate_model(self._layout.model, self.to_dict())
+
+    def __repr__(self) -> str:
+        decoded = ", ".join(f"{self._layout.names[i]}={value!r}" for i, value in sorted(self._values.items()))
+        return f"LazyRecord[{self._layout.model.__name__}]({decoded})"
+
+
+def decode_lazy(model: Type[M], data: Any, pos: int = 0) -> LazyRecord[M]:
+    """Returns a lazy record of a model for an encoded record
+
+    :param model: The AvroBase model the record was encoded with
+    :param data: Buffer with the encoded record, which is kept by the lazy record
+    :param pos: Position of the record in the buffer
+    """
+    return LazyRecord(record_layout(model), data, pos)
+
+
+def iter_lazy_models(model: Type[M], fo: IO[bytes], filters: Optional[List[Filter]] = None) -> Iterator[LazyRecord[M]]:
+    """Yields lazy records for the records of an avro object container file
+
+    The records of a block are skipped over to find where they start, which also finds the positions of their fields.
+    The lazy records keep the decompressed data of their block.
+
+    :param model: The AvroBase model the file was written with
+    :param fo: Binary file object to read from, is read block by block
+    :param filters: Optional list of (field, operator, value) tuples that all have to match, see `iter_avro_models`
+    """
+    reader = OcfReader(fo)
+    layout = record_layout(model)
+    if [field["name"] for field in reader.schema["fields"]] != list(layout.names):
+        raise ValueError(f"The schema of the file does not have the fields of '{model.__name__}'")
+    predicate = compile_predicate(reader.schema, filters) if filters else None
+    skippers = layout.skippers
+    for block in reader.iter_blocks():
+        buf = block.data
+        pos = 0
+        for _ in range(block.num_records):
+            if predicate is not None:
+                matched, end = predicate(buf, pos)
+                if not matched:
+                    pos = end
+                    continue
+            offsets = [pos]
+            for skip in skippers:
+                pos = skip(buf, pos)
+                offsets.append(pos)
+            yield LazyRecord(layout, buf, offsets=offsets)
@@ -0,0 +1,90 @@
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import MAX_EMAX, MAX_PREC, MIN_EMIN, Context, Decimal
+from typing import Any, Callable, Dict, Optional
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+EXACT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+
+def datetime_to_micros(value: datetime) -> int:
+    """Returns the microseconds since epoch, naive datetimes are treated as UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def datetime_to_millis(value: datetime) -> int:
+    """Returns the milliseconds since epoch, naive datetimes are treated as UTC"""
+    return datetime_to_micros(value) // 1000
+
+
+def micros_to_datetime(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=value)
+
+
+def millis_to_datetime(value: int) -> datetime:
+    return EPOCH + timedelta(milliseconds=value)
+
+
+def date_to_days(value: date) -> int:
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def days_to_date(value: int) -> date:
+    return date.fromordinal(value + EPOCH_ORDINAL)
+
+
+def time_to_micros(value: time) -> int:
+    return ((value.hour * 60 + value.minute) * 60 + value.second) * 1_000_000 + value.microsecond
+
+
+def time_to_millis(value: time) -> int:
+    return time_to_micros(value) // 1000
+
+
+def micros_to_time(value: int) -> time:
+    seconds, micros = divmod(value, 1_000_000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return time(hours, minutes, seconds, micros)
+
+
+def millis_to_time(value: int) -> time:
+    return micros_to_time(value * 1000)
+
+
+def unscaled_to_decimal(value: int, scale: int) -> Decimal:
+    # Without an exact context, decimals with more than 28 digits would be rounded
+    return Decimal(value).scaleb(-scale, EXACT)
+
+
+# Logical types that can be decoded as their raw int, these are the most expensive to convert
+RAW_TIMESTAMP_TYPES = frozenset(["timestamp-millis", "timestamp-micros", "date"])
+
+# Conversion of the avro value to the python value, by logical type
+FROM_AVRO: Dict[str, Callable[[Any], Any]] = {
+    "timestamp-millis": millis_to_datetime,
+    "timestamp-micros": micros_to_datetime,
+    "date": days_to_date,
+    "time-millis": millis_to_time,
+    "time-micros": micros_to_time,
+}
+
+# Conversion of the python value to the avro value, by logical type
+TO_AVRO: Dict[str, Callable[[Any], Any]] = {
+    "timestamp-millis": datetime_to_millis,
+    "timestamp-micros": datetime_to_micros,
+    "date": date_to_days,
+    "time-millis": time_to_millis,
+    "time-micros": time_to_micros,
+}
+
+
+def to_avro_value(logical: Optional[str], value: Any) -> Any:
+    """Converts a python value to the avro value of a logical type, ints are passed as is"""
+    convert = TO_AVRO.get(logical) if logical else None
+    if convert is None or isinstance(value, int):
+        return value
+    return convert(value)
@@ -0,0 +1,133 @@
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Upper bounds in seconds of the buckets of the latency per record, from 1 microsecond to 10 milliseconds
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2)
+
+
+class MetricsCollector(ABC):
+    """Receives the metrics of the encoding and decoding of models, see `set_metrics_collector`.
+
+    `observe` is called once per batch of records, a block of a file or a chunk of records that is written, so a
+    collector does not add overhead per record.
+    """
+
+    @abstractmethod
+    def observe(self, model: str, operation: str, records: int, nbytes: int, seconds: float) -> None:
+        """Records a batch
+
+        :param model: Name of the model
+        :param operation: "encode" or "decode"
+        :param records: Number of records in the batch
+        :param nbytes: Size of the encoded records, before compression
+        :param seconds: Time spent on the records, including validation, and compression when encoding
+        """
+
+
+class OperationMetrics(NamedTuple):
+    """Totals of an operation of a model, `buckets` holds the number of records per latency bucket"""
+
+    records: int
+    nbytes: int
+    seconds: float
+    buckets: Tuple[int, ...]
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.nbytes / self.seconds if self.seconds else 0.0
+
+
+class InMemoryCollector(MetricsCollector):
+    """Keeps totals and a histogram of the latency per record, per model and operation.
+
+    The latency of a record is the average of its batch, the records of a batch are counted in the same bucket.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # [records, bytes, seconds, *bucket counts] by (model, operation), the last bucket is +Inf
+        self._totals: Dict[Tuple[str, str], list] = {}
+
+    def observe(self, model: str, operation: str, records: int, nbytes: int, seconds: float) -> None:
+        if not records:
+            return
+        bucket = bisect_left(self.buckets, seconds / records)
+        with self._lock:
+            totals = self._totals.get((model, operation))
+            if totals is None:
+                totals = self._totals[(model, operation)] = [0, 0, 0.0] + [0] * (len(self.buckets) + 1)
+            totals[0] += records
+            totals[1] += nbytes
+            totals[2] += seconds
+            totals[3 + bucket] += records
+
+    def metrics(self) -> Dict[Tuple[str, str], OperationMetrics]:
+        """Returns the metrics by (model, operation)"""
+        with self._lock:
+            return {
+                key: OperationMetrics(totals[0], totals[1], totals[2], tuple(totals[3:]))
+                for key, totals in self._totals.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(model: str, operation: str, le: Optional[str] = None) -> str:
+    labels = f'model="{_escape(model)}",operation="{_escape(operation)}"'
+    if le is not None:
+        labels += f',le="{le}"'
+    return "{" + labels + "}"
+
+
+def to_prometheus(collector: InMemoryCollector, prefix: str = "pydantic_avro") -> str:
+    """Returns the metrics of a collector in the Prometheus text exposition format"""
+    metrics = sorted(collector.metrics().items())
+    lines: List[str] = []
+    for name, kind, help_text, index in (
+        ("records_total", "counter", "Number of records encoded or decoded", 0),
+        ("bytes_total", "counter", "Size of the encoded records before compression", 1),
+        ("seconds_total", "counter", "Time spent encoding or decoding records", 2),
+    ):
+        lines += [f"# HELP {prefix}_{name} {help_text}", f"# TYPE {prefix}_{name} {kind}"]
+        lines += [f"{prefix}_{name}{_labels(*key)} {m[index]}" for key, m in metrics]
+
+    name = f"{prefix}_record_latency_seconds"
+    lines += [f"# HELP {name} Time spent per record, averaged per batch", f"# TYPE {name} histogram"]
+    for key, m in metrics:
+        cumulative = 0
+        for bound, count in zip([*map(repr, collector.buckets), "+Inf"], m.buckets):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(*key, le=bound)} {cumulative}")
+        lines.append(f"{name}_sum{_labels(*key)} {m.seconds}")
+        lines.append(f"{name}_count{_labels(*key)} {m.records}")
+    return "\n".join(lines) + "\n"
+
+
+_COLLECTOR: Optional[MetricsCollector] = None
+
+
+def set_metrics_collector(collector: Optional[MetricsCollector]) -> None:
+    """Sets the collector of the metrics of `iter_avro_models`, `write_avro_models`, `avro_decode_stream` and
+    `AsyncOcfWriter`, None disables the metrics.
+
+    The collector is global to the process, blocks decoded or encoded in a process pool are not observed.
+    """
+    global _COLLECTOR
+    _COLLECTOR = collector
+
+
+def get_metrics_collector() -> Optional[MetricsCollector]:
+    return _COLLECTOR
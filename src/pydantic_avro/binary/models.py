@@ -0,0 +1,206 @@
+from itertools import islice
+from time import perf_counter
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Type, TypeVar
+from weakref import WeakKeyDictionary
+
+from pydantic import BaseModel
+
+from pydantic_avro.binary.encoder import Discriminators
+from pydantic_avro.binary.metrics import get_metrics_collector
+from pydantic_avro.binary.ocf import BLOCK_SIZE, OcfReader, OcfWriter, iter_block_records
+from pydantic_avro.binary.predicate import Filter, compile_predicate
+from pydantic_avro.binary.size import SizeEstimator
+from pydantic_avro.binary.stats import FileStats
+from pydantic_avro.to_avro.config import DEFS_NAME, PYDANTIC_V2
+
+M = TypeVar("M", bound=BaseModel)
+
+# Number of records that are written between observations of the metrics collector
+METRICS_CHUNK_SIZE = 1000
+
+_SCHEMAS: "WeakKeyDictionary[type, dict]" = WeakKeyDictionary()
+_SIZE_ESTIMATORS: "WeakKeyDictionary[type, SizeEstimator]" = WeakKeyDictionary()
+_DISCRIMINATORS: "WeakKeyDictionary[type, Discriminators]" = WeakKeyDictionary()
+
+
+def model_schema(model: Type[BaseModel]) -> dict:
+    """Returns the avro schema of an AvroBase model, computed once per model"""
+    schema = _SCHEMAS.get(model)
+    if schema is None:
+        schema = _SCHEMAS[model] = model.avro_schema()  # type: ignore[attr-defined]
+    return schema
+
+
+def model_size_estimator(model: Type[BaseModel]) -> SizeEstimator:
+    """Returns the size estimator of an AvroBase model, which learns from the instances written of the model"""
+    estimator = _SIZE_ESTIMATORS.get(model)
+    if estimator is None:
+        estimator = _SIZE_ESTIMATORS[model] = SizeEstimator(model_schema(model))
+    return estimator
+
+
+def model_discriminators(model: Type[BaseModel]) -> Discriminators:
+    """Returns the discriminator property and value by record name of the discriminated unions of a model.
+
+    Taken from the discriminator mappings of the JSON schema, as the avro schema does not keep the discriminators.
+    Computed once per model.
+    """
+    discriminators = _DISCRIMINATORS.get(model)
+    if discriminators is not None:
+        return discriminators
+    discriminators = {}
+    prefix = f"#/{DEFS_NAME}/"
+    nodes: List[Any] = [model.model_json_schema(by_alias=True) if PYDANTIC_V2 else model.schema(by_alias=True)]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, list):
+            nodes.extend(node)
+        elif isinstance(node, dict):
+            discriminator = node.get("discriminator")
+            if isinstance(discriminator, dict) and "propertyName" in discriminator:
+                for value, ref in discriminator.get("mapping", {}).items():
+                    if ref.startswith(prefix):
+                        discriminators[ref[len(prefix) :]] = (discriminator["propertyName"], value)
+            nodes.extend(node.values())
+    _DISCRIMINATORS[model] = discriminators
+    return discriminators
+
+
+def validate_model(model: Type[M], data: Any) -> M:
+    """Returns an instance of the model for decoded avro data"""
+    if PYDANTIC_V2:
+        return model.model_validate(data)
+    return model.parse_obj(data)
+
+
+def model_constructor(model: Type[M]) -> Callable[[dict], M]:
+    """Returns a function creating instances of a model from a dict with all its fields, without validation.
+
+    This is faster than `model_construct`, which also fills in defaults and handles aliases, and is meant for data
+    that is valid by construction, like records decoded with the schema of the model.
+    """
+    if model.__private_attributes__ or getattr(model, "__pydantic_post_init__", None):
+        if PYDANTIC_V2:
+            return lambda values: model.model_construct(**values)
+        return lambda values: model.construct(**values)
+
+    new = model.__new__
+    setattr_ = object.__setattr__
+
+    if not PYDANTIC_V2:
+
+        def construct_v1(values: dict) -> M:
+            instance = new(model)
+            setattr_(instance, "__dict__", values)
+            setattr_(instance, "__fields_set__", set(values))
+            return instance
+
+        return construct_v1
+
+    extra = model.model_config.get("extra") == "allow"
+
+    def construct(values: dict) -> M:
+        instance = new(model)
+        setattr_(instance, "__dict__", values)
+        setattr_(instance, "__pydantic_fields_set__", set(values))
+        setattr_(instance, "__pydantic_extra__", {} if extra else None)
+        setattr_(instance, "__pydantic_private__", None)
+        return instance
+
+    return construct
+
+
+def dump_model(instance: BaseModel) -> dict:
+    """Returns the data of a model instance to encode, using the aliases like the avro schema does"""
+    if PYDANTIC_V2:
+        return instance.model_dump(by_alias=True)
+    return instance.dict(by_alias=True)
+
+
+def iter_avro_models(
+    model: Type[M],
+    fo: IO[bytes],
+    filters: Optional[List[Filter]] = None,
+    intern_strings: Optional[Dict[str, int]] = None,
+    stats: Optional[FileStats] = None,
+) -> Iterator[M]:
+    """Yields model instances for the records of an avro object container file
+
+    :param model: The pydantic model to validate the records with
+    :param fo: Binary file object to read from, is read block by block
+    :param filters: Optional list of (field, operator, value) tuples that all have to match, e.g.
+                    [("country", "==", "NL"), ("timestamp", ">=", start)]. Records that do not match are skipped
+                    without being decoded or validated.
+    :param intern_strings: Maximum number of distinct strings to keep per field, by field name or "Record.field".
+                           Repeated strings of these fields are shared by the instances instead of copied.
+    :param stats: Statistics of the blocks of the file returned by `write_avro_models`, blocks that can not match the
+                  filters are skipped without reading them
+    """
+    yield from iter_reader_models(model, OcfReader(fo, intern_strings=intern_strings), filters, stats)
+
+
+def iter_reader_models(
+    model: Type[M], reader: OcfReader, filters: Optional[List[Filter]] = None, stats: Optional[FileStats] = None
+) -> Iterator[M]:
+    """Yields model instances for the records that a reader reads, see `iter_avro_models`"""
+    collector = get_metrics_collector()
+    if collector is None:
+        for record in reader.iter_records(filters, stats):
+            yield validate_model(model, record)
+        return
+
+    # With metrics the records are decoded and observed per block
+    predicate = compile_predicate(reader.schema, filters) if filters else None
+    for block in reader.iter_blocks(filters, stats):
+        start = perf_counter()
+        records = iter_block_records(block.data, block.num_records, reader.decoder, predicate)
+        instances = [validate_model(model, record) for record in records]
+        collector.observe(model.__name__, "decode", len(instances), len(block.data), perf_counter() - start)
+        yield from instances
+
+
+def write_avro_models(
+    model: Type[BaseModel],
+    fo: IO[bytes],
+    instances: Iterable[BaseModel],
+    codec: str = "null",
+    block_size: int = BLOCK_SIZE,
+    compression_workers: int = 0,
+    stats_fields: Optional[List[str]] = None,
+) -> Optional[FileStats]:
+    """Writes model instances to an avro object container file, returns the block statistics with `stats_fields`
+
+    :param model: The AvroBase model to take the schema from
+    :param fo: Binary file object to write to
+    :param instances: Instances of the model
+    :param codec: Compression codec of the blocks
+    :param block_size: Target size in bytes of the uncompressed data of a block
+    :param compression_workers: Number of threads compressing blocks while the next block is encoded
+    :param stats_fields: Fields to keep the minimum, maximum and null count of per block, by field name
+    """
+    with OcfWriter(
+        fo,
+        model_schema(model),
+        codec=codec,
+        block_size=block_size,
+        compression_workers=compression_workers,
+        size_estimator=model_size_estimator(model),
+        discriminators=model_discriminators(model),
+        stats_fields=stats_fields,
+    ) as writer:
+        collector = get_metrics_collector()
+        if collector is None:
+            for instance in instances:
+                writer.write(dump_model(instance))
+        else:
+            iterator = iter(instances)
+            while True:
+                start, size = perf_counter(), writer.encoded_bytes
+                count = 0
+                for instance in islice(iterator, METRICS_CHUNK_SIZE):
+                    writer.write(dump_model(instance))
+                    count += 1
+                if not count:
+                    break
+                collector.observe(model.__name__, "encode", count, writer.encoded_bytes - size, perf_counter() - start)
+    return writer.stats
@@ -0,0 +1,466 @@
+import json
+import os
+from collections import deque
+from enum import Enum
+from typing import IO, TYPE_CHECKING, Any, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Type
+
+from pydantic_avro.binary.codecs import get_codec
+from pydantic_avro.binary.decoder import DecoderCompiler, Reader, read_long
+from pydantic_avro.binary.encoder import Discriminators, compile_encoder, write_bytes, write_long
+from pydantic_avro.binary.predicate import Filter, Predicate, compile_predicate
+from pydantic_avro.binary.size import SizeEstimator
+from pydantic_avro.binary.stats import BlockStatsCollector, FileStats
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+MAGIC = b"Obj\x01"
+SYNC_SIZE = 16
+# Default size of the uncompressed data of a block, in bytes
+BLOCK_SIZE = 64 * 1024
+# Size of the chunks that are scanned for the sync marker at the start of a split
+SCAN_SIZE = 64 * 1024
+
+
+class Block(NamedTuple):
+    """A data block of an object container file, the data is decompressed unless stated otherwise"""
+
+    offset: int
+    num_records: int
+    data: bytes
+
+
+def iter_block_records(buf: Any, count: int, decode: Reader, predicate: Optional[Predicate] = None) -> Iterator[Any]:
+    """Yields the decoded records of the decompressed data of a block, skipping records not matching the predicate"""
+    pos = 0
+    if predicate is None:
+        for _ in range(count):
+            record, pos = decode(buf, pos)
+            yield record
+        return
+
+    for _ in range(count):
+        matched, end = predicate(buf, pos)
+        if matched:
+            yield decode(buf, pos)[0]
+        pos = end
+
+
+class OcfReader:
+    """Streaming reader of Avro object container files.
+
+    Only the header is read on construction, blocks are read one at a time from the file object,
+    so the file object does not need to be seekable. To read a part of a seekable file, see `seek_split`.
+
+    With `zero_copy`, bytes and fixed values of records are memoryviews of the block data instead of copies.
+    With `raw_timestamps`, timestamp-millis, timestamp-micros and date values are the ints they are encoded as.
+    With `intern_strings` and `enum_types`, repeated strings and enums are decoded to shared objects, see
+    `DecoderCompiler`.
+    """
+
+    def __init__(
+        self,
+        fo: IO[bytes],
+        zero_copy: bool = False,
+        raw_timestamps: bool = False,
+        intern_strings: Optional[Dict[str, int]] = None,
+        enum_types: Optional[Iterable[Type[Enum]]] = None,
+    ):
+        self._fo = fo
+        self.zero_copy = zero_copy
+        self._offset = 0
+        # Offset at which the blocks of the split end, see `seek_split`
+        self._split_end: Optional[int] = None
+        if self._read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not an avro object container file")
+        self.metadata = self._read_metadata()
+        self.sync_marker = self._read(SYNC_SIZE)
+        self.schema = json.loads(self.metadata["avro.schema"])
+        self.codec = self.metadata.get("avro.codec", b"null").decode()
+        self._decompress = get_codec(self.codec).decompress
+        compiler = DecoderCompiler(self.schema, zero_copy, raw_timestamps, intern_strings, enum_types)
+        self.decoder = compiler.reader(self.schema)
+
+    def _read(self, n: int) -> bytes:
+        data = self._fo.read(n)
+        if len(data) != n:
+            raise EOFError(f"Expected {n} bytes at offset {self._offset}, got {len(data)}")
+        self._offset += n
+        return data
+
+    def _read_long(self) -> Optional[int]:
+        """Reads a long from the file object, returns None at the end of the file"""
+        n = 0
+        shift = 0
+        while True:
+            b = self._fo.read(1)
+            if not b:
+                if shift:
+                    raise EOFError(f"Truncated long at offset {self._offset}")
+                return None
+            self._offset += 1
+            n |= (b[0] & 0x7F) << shift
+            shift += 7
+            if not b[0] & 0x80:
+                return (n >> 1) ^ -(n & 1)
+
+    def _read_metadata(self) -> Dict[str, bytes]:
+        metadata = {}
+        count = self._read_long()
+        while count:
+            if count < 0:
+                count = -count
+                self._read_long()
+            for _ in range(count):
+                key = self._read(self._read_long() or 0).decode()
+                metadata[key] = self._read(self._read_long() or 0)
+            count = self._read_long()
+        return metadata
+
+    def iter_blocks(self, filters: Optional[List[Filter]] = None, stats: Optional[FileStats] = None) -> Iterator[Block]:
+        """Yields the decompressed data blocks of the file
+
+        :param filters: With `stats`, blocks that have no records matching the filters by their statistics are skipped
+                        without decompressing them. The records of the other blocks still have to be filtered.
+        :param stats: Statistics of the blocks of the file, written with the file by `OcfWriter`
+        """
+        if not filters or stats is None:
+            for block in self.iter_raw_blocks():
+                yield Block(block.offset, block.num_records, self._decompress(block.data))
+            return
+
+        if stats.sync_marker != self.sync_marker:
+            raise ValueError("The statistics were written for another file")
+        may_match = stats.block_filter(self.schema, filters)
+        if self._split_end is None:
+            for i, block in enumerate(self.iter_raw_blocks()):
+                if may_match(i):
+                    yield Block(block.offset, block.num_records, self._decompress(block.data))
+            return
+
+        # The blocks of a split are found by their offset, blocks without statistics are read
+        if len(stats.offsets) != len(stats.blocks):
+            raise ValueError("The statistics have no block offsets, which are needed to read a split")
+        indexes = {offset: i for i, offset in enumerate(stats.offsets)}
+        for block in self.iter_raw_blocks():
+            if may_match(indexes.get(block.offset, len(stats.blocks))):
+                yield Block(block.offset, block.num_records, self._decompress(block.data))
+
+    def read_block(self, offset: int) -> Block:
+        """Reads the decompressed data block at an offset of the file, which requires a seekable file object.
+
+        The next blocks are read from after this block.
+        """
+        self._fo.seek(offset)
+        self._offset = offset
+        self._split_end = None
+        for block in self.iter_blocks():
+            return block
+        raise EOFError(f"No block at offset {offset}")
+
+    def seek_split(self, start: int, length: int) -> None:
+        """Restricts the blocks that are read to a split of the file, which requires a seekable file object.
+
+        Like the input splits of Hadoop, the blocks of a split are the blocks of which the preceding sync marker
+        starts in the byte range `[start, start + length)`, the header ends with a sync marker as well. Reading
+        starts after the first sync marker at or after `start` and stops after the block that crosses the end of
+        the range. Splitting a file into adjacent ranges reads every block exactly once, without an index.
+
+        :param start: Offset in the file at which the split starts
+        :param length: Length of the split in bytes
+        """
+        self._split_end = start + length
+        self._fo.seek(start)
+        marker, buf, buf_start = self.sync_marker, b"", start
+        while True:
+            i = buf.find(marker)
+            if i >= 0:
+                self._offset = buf_start + i + SYNC_SIZE
+                self._fo.seek(self._offset)
+                return
+            chunk = self._fo.read(SCAN_SIZE)
+            if not chunk:
+                # No block starts in the split
+                self._offset = self._fo.seek(0, os.SEEK_END)
+                return
+            # Keep the bytes of a marker that crosses the chunks
+            keep = buf[-(SYNC_SIZE - 1) :]
+            buf_start += len(buf) - len(keep)
+            buf = keep + chunk
+
+    def iter_raw_blocks(self) -> Iterator[Block]:
+        """Yields the data blocks of the file, the data is still compressed with the codec of the file"""
+        while True:
+            offset = self._offset
+            if self._split_end is not None and offset - SYNC_SIZE >= self._split_end:
+                return
+            count = self._read_long()
+            if count is None:
+                return
+            size = self._read_long()
+            if size is None:
+                raise EOFError(f"Truncated block at offset {offset}")
+            data = self._read(size)
+            if self._read(SYNC_SIZE) != self.sync_marker:
+                raise ValueError(f"Invalid sync marker after block at offset {offset}")
+            yield Block(offset, count, data)
+
+    def iter_records(self, filters: Optional[List[Filter]] = None, stats: Optional[FileStats] = None) -> Iterator[Any]:
+        """Yields the decoded records of the file
+
+        :param filters: Optional list of (field, operator, value) tuples that all have to match. The filter fields
+                        are evaluated on the encoded record, non-matching records are skipped without decoding them.
+        :param stats: Statistics of the blocks of the file, to skip the blocks without matching records as a whole
+        """
+        predicate = compile_predicate(self.schema, filters) if filters else None
+        for block in self.iter_blocks(filters, stats):
+            data = memoryview(block.data) if self.zero_copy else block.data
+            yield from iter_block_records(data, block.num_records, self.decoder, predicate)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.iter_records()
+
+
+def encode_header(schema: dict, codec: str, sync_marker: bytes, metadata: Optional[Dict[str, bytes]] = None) -> bytes:
+    """Returns the header of an object container file"""
+    meta = {"avro.schema": json.dumps(schema).encode(), "avro.codec": codec.encode(), **(metadata or {})}
+    buf = bytearray(MAGIC)
+    write_long(buf, len(meta))
+    for key, value in meta.items():
+        write_bytes(buf, key.encode())
+        write_bytes(buf, value)
+    buf.append(0)
+    buf += sync_marker
+    return bytes(buf)
+
+
+def encode_block(count: int, data: bytes, sync_marker: bytes) -> bytes:
+    """Returns a data block of an object container file, the data should already be compressed"""
+    header = bytearray()
+    write_long(header, count)
+    write_long(header, len(data))
+    # Joined in one allocation of the final size
+    return b"".join((header, data, sync_marker))
+
+
+class OcfWriter:
+    """Writer of Avro object container files.
+
+    Records are encoded into a buffer that is compressed and written as a block once the next record is expected
+    not to fit in `block_size` anymore. The expected size of a record is taken from the `size_estimator`, which is
+    derived from the schema until the first block is written and the average size of the written records after.
+    With `compression_workers` the blocks are compressed in a thread pool while the next block is being encoded,
+    the compression of the codecs from the standard library releases the GIL. The `discriminators` select the
+    records of discriminated unions by their discriminator value, see `model_discriminators`.
+    With `stats_fields`, the minimum, maximum and null count of these fields are kept per block in `stats`, which
+    readers use to skip blocks that can not match their filters. The statistics are not part of the file, store them
+    next to it with `FileStats.dump`.
+    """
+
+    def __init__(
+        self,
+        fo: IO[bytes],
+        schema: dict,
+        codec: str = "null",
+        block_size: int = BLOCK_SIZE,
+        metadata: Optional[Dict[str, bytes]] = None,
+        sync_marker: Optional[bytes] = None,
+        compression_workers: int = 0,
+        size_estimator: Optional[SizeEstimator] = None,
+        discriminators: Optional[Discriminators] = None,
+        stats_fields: Optional[List[str]] = None,
+    ):
+        self._fo = fo
+        self.schema = schema
+        self.codec = codec
+        self.block_size = block_size
+        self.sync_marker = sync_marker or os.urandom(SYNC_SIZE)
+        self.encoder = compile_encoder(schema, discriminators)
+        self._compress = get_codec(codec).compress
+        self.size_estimator = size_estimator or SizeEstimator(schema)
+        self._size_hint = self.size_estimator.hint
+        self._buffer = bytearray()
+        self._count = 0
+        # Size of the records of the blocks that are done, before compression
+        self._encoded = 0
+        self._executor = None
+        if compression_workers > 0:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._executor = ThreadPoolExecutor(compression_workers)
+        # Blocks being compressed, at most two per worker so memory stays bounded
+        self._pending: Deque[Tuple[int, "Future"]] = deque()
+        self._max_pending = 2 * compression_workers
+        self._stats_collector = BlockStatsCollector(schema, stats_fields) if stats_fields else None
+        self.stats = FileStats(self.sync_marker, self._stats_collector.fields) if self._stats_collector else None
+        header = encode_header(schema, codec, self.sync_marker, metadata)
+        self._fo.write(header)
+        # Offset of the next block from the start of the file
+        self._position = len(header)
+
+    @property
+    def encoded_bytes(self) -> int:
+        """Size of the records written so far, before compression"""
+        return self._encoded + len(self._buffer)
+
+    def write(self, record: Any) -> None:
+        self.encoder(self._buffer, record)
+        self._count += 1
+        if len(self._buffer) + self._size_hint > self.block_size:
+            self._end_block()
+
+    def write_encoded(self, data: bytes, count: int = 1) -> None:
+        """Writes records that are already encoded with the schema of the file, e.g. the data of a decompressed block
+
+        :param data: The encoded records
+        :param count: The number of records in the data
+        """
+        self._buffer += data
+        self._count += count
+        if len(self._buffer) + self._size_hint > self.block_size:
+            self._end_block()
+
+    def write_many(self, records: Iterable[Any]) -> None:
+        for record in records:
+            self.write(record)
+
+    def write_block(self, count: int, data: bytes) -> None:
+        """Writes an already encoded and compressed block, after the buffered records"""
+        self._end_block()
+        self._write_pending(0)
+        if self.stats is not None:
+            self.stats.blocks.append(None)
+        self._write_block(count, data)
+
+    def _end_block(self) -> None:
+        """Compresses the buffered records into a block"""
+        if not self._count:
+            return
+        count, data = self._count, bytes(self._buffer)
+        self._buffer.clear()
+        self._count = 0
+        self._encoded += len(data)
+        self.size_estimator.observe(len(data), count)
+        self._size_hint = self.size_estimator.hint
+        if self._stats_collector is not None:
+            self.stats.blocks.append(self._stats_collector.collect(data, count))  # type: ignore[union-attr]
+        if self._executor is None:
+            self._write_block(count, self._compress(data))
+        else:
+            self._pending.append((count, self._executor.submit(self._compress, data)))
+            self._write_pending(self._max_pending)
+
+    def _write_pending(self, max_pending: int) -> None:
+        """Writes compressed blocks in order, waiting until at most `max_pending` blocks are left"""
+        while len(self._pending) > max_pending or (self._pending and self._pending[0][1].done()):
+            count, future = self._pending.popleft()
+            self._write_block(count, future.result())
+
+    def _write_block(self, count: int, data: bytes) -> None:
+        block = encode_block(count, data, self.sync_marker)
+        if self.stats is not None:
+            self.stats.offsets.append(self._position)
+        self._fo.write(block)
+        self._position += len(block)
+
+    def flush(self) -> None:
+        self._end_block()
+        self._write_pending(0)
+        self._fo.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def __enter__(self) -> "OcfWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class OcfStreamParser:
+    """Push based parser of object container files that arrive in chunks, e.g. from a socket or async stream.
+
+    The header is parsed once enough data has been fed, after that every fed chunk returns the blocks that are
+    complete. The data of the returned blocks is still compressed with the codec of the file.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._offset = 0
+        self.metadata: Optional[Dict[str, bytes]] = None
+        self.sync_marker = b""
+        self.schema: Optional[dict] = None
+        self.codec = "null"
+
+    def feed(self, data: bytes) -> List[Block]:
+        """Adds a chunk of data and returns the blocks that became complete"""
+        self._buffer += data
+        pos = 0
+        if self.metadata is None:
+            pos = self._parse_header()
+            if not pos:
+                return []
+        blocks = []
+        while True:
+            block, end = self._parse_block(pos)
+            if block is None:
+                break
+            blocks.append(block)
+            pos = end
+        del self._buffer[:pos]
+        self._offset += pos
+        return blocks
+
+    def close(self) -> None:
+        """Verifies that all fed data has been parsed"""
+        if self.metadata is None or self._buffer:
+            raise EOFError(f"Truncated object container file at offset {self._offset}")
+
+    def _parse_header(self) -> int:
+        buf = self._buffer
+        if len(buf) < len(MAGIC):
+            return 0
+        if buf[: len(MAGIC)] != MAGIC:
+            raise ValueError("Not an avro object container file")
+        try:
+            pos = len(MAGIC)
+            metadata = {}
+            count, pos = read_long(buf, pos)
+            while count:
+                if count < 0:
+                    count = -count
+                    _, pos = read_long(buf, pos)
+                for _ in range(count):
+                    key, pos = read_long(buf, pos)
+                    name = bytes(buf[pos : pos + key]).decode()
+                    size, pos = read_long(buf, pos + key)
+                    metadata[name] = bytes(buf[pos : pos + size])
+                    pos += size
+                count, pos = read_long(buf, pos)
+        except IndexError:
+            return 0
+        if len(buf) < pos + SYNC_SIZE:
+            return 0
+        self.sync_marker = bytes(buf[pos : pos + SYNC_SIZE])
+        self.metadata = metadata
+        self.schema = json.loads(metadata["avro.schema"])
+        self.codec = metadata.get("avro.codec", b"null").decode()
+        get_codec(self.codec)
+        return pos + SYNC_SIZE
+
+    def _parse_block(self, pos: int):
+        buf = self._buffer
+        try:
+            count, data_pos = read_long(buf, pos)
+            size, data_pos = read_long(buf, data_pos)
+        except IndexError:
+            return None, pos
+        end = data_pos + size + SYNC_SIZE
+        if len(buf) < end:
+            return None, pos
+        if buf[end - SYNC_SIZE : end] != self.sync_marker:
+            raise ValueError(f"Invalid sync marker after block at offset {self._offset + pos}")
+        return Block(self._offset + pos, count, bytes(buf[data_pos : end - SYNC_SIZE])), end
@@ -0,0 +1,208 @@
+import operator
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic_avro.binary.decoder import PRIMITIVE_READERS, DecoderCompiler, Reader, Skipper, read_long
+from pydantic_avro.binary.logical import to_avro_value
+from pydantic_avro.binary.schema import AvroSchema, logical_type, resolve, schema_type
+
+# A filter is a (field, operator, value) tuple, e.g. ("country", "==", "NL") or ("amount", ">=", 100)
+Filter = Tuple[str, str, Any]
+# A predicate scans an encoded record and returns whether it matches and the position after the record
+Predicate = Callable[[Any, int], Tuple[bool, int]]
+
+ORDERING_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+    "in": lambda value, target: value in target,
+    "not in": lambda value, target: value not in target,
+    **ORDERING_OPERATORS,
+}
+
+
+def read_raw_bytes(buf, pos: int) -> Tuple[bytes, int]:
+    """Reads a string or bytes datum without decoding it"""
+    n, pos = read_long(buf, pos)
+    end = pos + n
+    return bytes(buf[pos:end]), end
+
+
+def _encode_text(value: Any) -> Any:
+    """Returns the utf-8 bytes of a string value, UTF-8 byte order is the same as code point order"""
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, UUID):
+        value = str(value)
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    return value
+
+
+class PredicateCompiler:
+    """Compiles filters on the fields of a record schema into a predicate on the encoded record.
+
+    Filtered fields are read in their raw avro representation (ints for timestamps and dates, utf-8 bytes for
+    strings, indexes for enums) and compared with filter values that are converted once to that representation.
+    All other fields are skipped.
+    """
+
+    def __init__(self, schema: AvroSchema):
+        self.compiler = DecoderCompiler(schema)
+        self.record = resolve(schema, self.compiler.names)
+        if schema_type(self.record) not in ("record", "error"):
+            raise ValueError(f"Filters are only supported on records, got '{schema_type(self.record)}'")
+
+    def compile(self, filters: List[Filter]) -> Predicate:
+        by_field: Dict[str, List[Tuple[str, Any]]] = {}
+        for name, op, value in filters:
+            if op not in OPERATORS:
+                raise ValueError(f"Operator '{op}' not supported, should be one of {list(OPERATORS)}")
+            by_field.setdefault(name, []).append((op, value))
+
+        fields = self.record["fields"]
+        unknown = set(by_field) - {field["name"] for field in fields}
+        if unknown:
+            raise ValueError(f"Filter fields {sorted(unknown)} do not exist in record '{self.record['name']}'")
+
+        steps: List[Tuple[Any, Optional[Callable[[Any], bool]], Skipper]] = []
+        for i, field in enumerate(fields):
+            skip_rest = self._chain([self.compiler.skipper(f["type"]) for f in fields[i + 1 :]])
+            if field["name"] in by_field:
+                read, convert = self._raw_reader(field["type"])
+                checks = [self._check(op, value, convert) for op, value in by_field[field["name"]]]
+                steps.append((read, self._all(checks), skip_rest))
+            else:
+                steps.append((self.compiler.skipper(field["type"]), None, skip_rest))
+
+        def predicate(buf, pos):
+            for read, check, skip_rest in steps:
+                if check is None:
+                    pos = read(buf, pos)
+                    continue
+                value, pos = read(buf, pos)
+                if not check(value):
+                    return False, skip_rest(buf, pos)
+            return True, pos
+
+        return predicate
+
+    def field_reader(self, name: str) -> Tuple[Reader, Callable[[Any], Any]]:
+        """Returns a reader of the raw avro value of a field of the encoded record, which steps over the whole record,
+        and the conversion of python values to that raw value"""
+        read, converts = self.fields_reader([name])
+
+        def read_field(buf, pos):
+            values, pos = read(buf, pos)
+            return values[0], pos
+
+        return read_field, converts[0]
+
+    def fields_reader(self, names: List[str]) -> Tuple[Reader, List[Callable[[Any], Any]]]:
+        """Returns a reader of a list of the raw avro values of fields of the encoded record, in the order of the
+        fields in the record, and the conversions of python values to those raw values"""
+        fields = self.record["fields"]
+        unknown = set(names) - {field["name"] for field in fields}
+        if unknown:
+            raise ValueError(f"Fields {sorted(unknown)} do not exist in record '{self.record['name']}'")
+        steps: List[Tuple[Callable, bool]] = []
+        converts = []
+        for field in fields:
+            if field["name"] in names:
+                read, convert = self._raw_reader(field["type"])
+                steps.append((read, True))
+                converts.append(convert)
+            else:
+                steps.append((self.compiler.skipper(field["type"]), False))
+
+        def read_fields(buf, pos):
+            values = []
+            for step, is_read in steps:
+                if is_read:
+                    value, pos = step(buf, pos)
+                    values.append(value)
+                else:
+                    pos = step(buf, pos)
+            return values, pos
+
+        return read_fields, converts
+
+    def _raw_reader(self, schema: AvroSchema) -> Tuple[Reader, Callable[[Any], Any]]:
+        """Returns a reader of the raw avro value and a conversion of filter values to that raw value"""
+        schema = resolve(schema, self.compiler.names)
+        t = schema_type(schema)
+        lt = logical_type(schema)
+        if t in ("int", "long") and isinstance(schema, dict):
+            return read_long, lambda value: to_avro_value(lt, value)
+        if t in ("int", "long", "float", "double", "boolean", "null"):
+            return PRIMITIVE_READERS[t], lambda value: value
+        if t in ("string", "bytes") and lt != "decimal":
+            return read_raw_bytes, _encode_text
+        if t == "enum":
+            symbols = schema["symbols"]
+
+            def enum_index(value):
+                value = value.value if isinstance(value, Enum) else value
+                if value not in symbols:
+                    raise ValueError(f"'{value}' is not a symbol of enum '{schema['name']}'")
+                return symbols.index(value)
+
+            return read_long, enum_index
+        if t == "union" and len(schema) == 2 and "null" in schema:
+            return self._optional_reader(schema)
+        # Everything else is compared with the decoded python value
+        return self.compiler.reader(schema), lambda value: value
+
+    def _optional_reader(self, schema: list) -> Tuple[Reader, Callable[[Any], Any]]:
+        null_index = schema.index("null")
+        read_value, convert = self._raw_reader(schema[1 - null_index])
+
+        def read_optional(buf, pos):
+            index, pos = read_long(buf, pos)
+            if index == null_index:
+                return None, pos
+            return read_value(buf, pos)
+
+        return read_optional, lambda value: None if value is None else convert(value)
+
+    @staticmethod
+    def _check(op: str, value: Any, convert: Callable[[Any], Any]) -> Callable[[Any], bool]:
+        compare = OPERATORS[op]
+        if op in ("in", "not in"):
+            target: Any = frozenset(convert(v) for v in value)
+        else:
+            target = convert(value)
+        if op in ORDERING_OPERATORS:
+            if target is None:
+                raise ValueError(f"Operator '{op}' can not be used with None")
+            # Nulls never match a range
+            return lambda v: v is not None and compare(v, target)
+        return lambda v: compare(v, target)
+
+    @staticmethod
+    def _all(checks: List[Callable[[Any], bool]]) -> Callable[[Any], bool]:
+        if len(checks) == 1:
+            return checks[0]
+        return lambda v: all(check(v) for check in checks)
+
+    @staticmethod
+    def _chain(skippers: List[Skipper]) -> Skipper:
+        def skip_all(buf, pos):
+            for skip in skippers:
+                pos = skip(buf, pos)
+            return pos
+
+        return skip_all
+
+
+def compile_predicate(schema: AvroSchema, filters: List[Filter]) -> Predicate:
+    """Returns a predicate that evaluates all filters on a binary encoded record of the schema"""
+    return PredicateCompiler(schema).compile(filters)
@@ -0,0 +1,79 @@
+from typing import Any, Dict, Optional
+
+PRIMITIVE_TYPES = frozenset(["null", "boolean", "int", "long", "float", "double", "bytes", "string"])
+NAMED_TYPES = frozenset(["record", "error", "enum", "fixed"])
+COMPLEX_TYPES = NAMED_TYPES | {"array", "map"}
+
+# A parsed avro schema: a type name, a list for unions or a dict
+AvroSchema = Any
+
+
+def fullname(name: str, namespace: Optional[str]) -> str:
+    """Returns the full name of a named type"""
+    if "." in name or not namespace:
+        return name
+    return f"{namespace}.{name}"
+
+
+def collect_named_types(
+    schema: AvroSchema, names: Optional[Dict[str, dict]] = None, namespace: Optional[str] = None
+) -> Dict[str, dict]:
+    """Collects all named types (records, enums and fixed) of a schema by their name and full name"""
+    if names is None:
+        names = {}
+    if isinstance(schema, list):
+        for element in schema:
+            collect_named_types(element, names, namespace)
+    elif isinstance(schema, dict):
+        t = schema.get("type")
+        if t in NAMED_TYPES:
+            full = fullname(schema["name"], schema.get("namespace", namespace))
+            names[full] = schema
+            names.setdefault(full.rsplit(".", 1)[-1], schema)
+            child_namespace = full.rsplit(".", 1)[0] if "." in full else None
+            for field in schema.get("fields", []):
+                collect_named_types(field["type"], names, child_namespace)
+        elif t == "array":
+            collect_named_types(schema["items"], names, namespace)
+        elif t == "map":
+            collect_named_types(schema["values"], names, namespace)
+        elif isinstance(t, (dict, list)):
+            collect_named_types(t, names, namespace)
+    return names
+
+
+def unwrap(schema: AvroSchema) -> AvroSchema:
+    """Removes wrapping dicts like {"type": {"type": "record", ...}} or {"type": ["null", "string"]}"""
+    while isinstance(schema, dict) and isinstance(schema.get("type"), (dict, list)):
+        schema = schema["type"]
+    if isinstance(schema, dict) and "logicalType" not in schema and schema.get("type") not in COMPLEX_TYPES:
+        # {"type": "string"} or {"type": "SomeRecord"}
+        return schema["type"]
+    return schema
+
+
+def resolve(schema: AvroSchema, names: Dict[str, dict]) -> AvroSchema:
+    """Returns the definition of a schema, looking up references to named types"""
+    schema = unwrap(schema)
+    if isinstance(schema, str) and schema not in PRIMITIVE_TYPES:
+        d = names.get(schema) or names.get(schema.rsplit(".", 1)[-1])
+        if d is None:
+            raise ValueError(f"Unknown avro type '{schema}'")
+        return d
+    return schema
+
+
+def schema_type(schema: AvroSchema) -> str:
+    """Returns the avro type of a resolved schema, 'union' for unions"""
+    if isinstance(schema, list):
+        return "union"
+    if isinstance(schema, str):
+        return schema
+    return schema["type"]
+
+
+def logical_type(schema: AvroSchema) -> Optional[str]:
+    """Returns the logical type of a resolved schema, if any"""
+    if isinstance(schema, dict):
+        return schema.get("logicalType")
+    return None
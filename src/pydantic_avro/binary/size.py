@@ -0,0 +1,71 @@
+import math
+from typing import Dict, Optional, Set
+
+from pydantic_avro.binary.schema import AvroSchema, collect_named_types, resolve, schema_type
+
+# Encoded sizes of the types with a fixed width, and the upper bound of the varint encoded types
+FIXED_SIZES = {"null": 0, "boolean": 1, "float": 4, "double": 8, "int": 5, "long": 10, "enum": 5}
+# Assumed sizes of values of which the size is only known once records are observed
+STRING_SIZE = 16
+COLLECTION_ITEMS = 4
+
+
+def estimate_size(schema: AvroSchema, names: Optional[Dict[str, dict]] = None) -> int:
+    """Returns an estimate of the encoded size in bytes of a datum of a schema, derived from the schema only.
+
+    Fixed width types take their size, ints and longs their upper bound. Strings and bytes are assumed to be
+    `STRING_SIZE` bytes long and arrays and maps to have `COLLECTION_ITEMS` items, unions take their largest branch.
+    """
+    if names is None:
+        names = collect_named_types(schema)
+    return _estimate(schema, names, set())
+
+
+def _estimate(schema: AvroSchema, names: Dict[str, dict], parents: Set[str]) -> int:
+    schema = resolve(schema, names)
+    t = schema_type(schema)
+    if t in FIXED_SIZES:
+        return FIXED_SIZES[t]
+    if t in ("string", "bytes"):
+        return 1 + STRING_SIZE
+    if t == "fixed":
+        return schema["size"]
+    if t == "union":
+        return 1 + max(_estimate(branch, names, parents) for branch in schema)
+    if t == "array":
+        return 2 + COLLECTION_ITEMS * _estimate(schema["items"], names, parents)
+    if t == "map":
+        return 2 + COLLECTION_ITEMS * (1 + STRING_SIZE + _estimate(schema["values"], names, parents))
+    if t in ("record", "error"):
+        if schema["name"] in parents:
+            # A recursive reference, usually null or an empty collection at some depth
+            return 0
+        nested = parents | {schema["name"]}
+        return sum(_estimate(field["type"], names, nested) for field in schema["fields"])
+    raise ValueError(f"Unsupported avro type '{t}'")
+
+
+class SizeEstimator:
+    """Estimates the encoded size of the records of a schema.
+
+    The estimate starts out derived from the schema, see `estimate_size`. Once encoded records are observed, the
+    average size of the observed records is used instead, which accounts for the actual lengths of strings and
+    collections and the actual values of varints.
+    """
+
+    def __init__(self, schema: AvroSchema):
+        self.schema_estimate = estimate_size(schema)
+        self.records = 0
+        self.nbytes = 0
+
+    def observe(self, nbytes: int, records: int = 1) -> None:
+        """Adds the size of encoded records"""
+        self.records += records
+        self.nbytes += nbytes
+
+    @property
+    def hint(self) -> int:
+        """The expected size in bytes of an encoded record"""
+        if not self.records:
+            return self.schema_estimate
+        return math.ceil(self.nbytes / self.records)
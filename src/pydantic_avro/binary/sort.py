@@ -0,0 +1,270 @@
+import heapq
+import tempfile
+from functools import total_ordering
+from operator import itemgetter
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic_avro.binary.decoder import (
+    DecoderCompiler,
+    Reader,
+    read_boolean,
+    read_bytes,
+    read_double,
+    read_float,
+    read_long,
+    read_null,
+)
+from pydantic_avro.binary.ocf import BLOCK_SIZE, OcfReader, OcfWriter
+from pydantic_avro.binary.schema import AvroSchema, collect_named_types, fullname, resolve, schema_type, unwrap
+
+# Readers of the sort keys of the primitive types. Strings compare by their UTF-8 bytes, which is the same as the
+# code point order of the spec
+PRIMITIVE_KEY_READERS: Dict[str, Reader] = {
+    "null": read_null,
+    "boolean": read_boolean,
+    "int": read_long,
+    "long": read_long,
+    "float": read_float,
+    "double": read_double,
+    "bytes": read_bytes,
+    "string": read_bytes,
+}
+FIELD_ORDERS = ("ascending", "descending", "ignore")
+# Default size in bytes of the encoded records that are sorted in memory before they are spilled to disk
+MEMORY_LIMIT = 256 * 1024 * 1024
+
+
+@total_ordering
+class Descending:
+    """Sort key of a field with descending order, which reverses the order of its key"""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Any):
+        self.key = key
+
+    def __eq__(self, other: Any) -> bool:
+        return self.key == other.key
+
+    def __lt__(self, other: "Descending") -> bool:
+        return other.key < self.key
+
+    def __repr__(self) -> str:
+        return f"Descending({self.key!r})"
+
+
+class SortKeyCompiler:
+    """Compiles an Avro schema into readers of sort keys of encoded datums.
+
+    The keys compare like the sort order of the Avro specification: numbers by value, strings, bytes and fixed by
+    their bytes, enums by the position of the symbol, arrays item by item, unions by branch and then by value and
+    records field by field honoring the `order` of the fields. Maps can not be compared. Values are read as far as
+    needed for the comparison, strings are not decoded and logical types compare as their underlying type.
+    """
+
+    def __init__(self, schema: AvroSchema):
+        self.names = collect_named_types(schema)
+        self._skippers = DecoderCompiler(schema)
+        self._readers: Dict[str, Reader] = {}
+
+    def reader(self, schema: AvroSchema) -> Reader:
+        """Returns a reader of the sort key for the given (sub) schema"""
+        schema = unwrap(schema)
+        if isinstance(schema, str) and schema in self._readers:
+            return self._readers[schema]
+        schema = resolve(schema, self.names)
+        t = schema_type(schema)
+        if t in PRIMITIVE_KEY_READERS:
+            return PRIMITIVE_KEY_READERS[t]
+        if t in ("record", "error"):
+            return self._record_reader(schema, [field["name"] for field in schema["fields"]])
+        if t == "enum":
+            return read_long
+        if t == "fixed":
+            size = schema["size"]
+            return lambda buf, pos: (bytes(buf[pos : pos + size]), pos + size)
+        if t == "array":
+            return self._array_reader(schema)
+        if t == "union":
+            return self._union_reader(schema)
+        if t == "map":
+            raise ValueError("Maps can not be compared, give the fields to sort by")
+        raise NotImplementedError(f"Type '{t}' not supported yet")
+
+    def _register(self, schema: dict, func: Reader):
+        name = schema["name"]
+        self._readers[fullname(name, schema.get("namespace"))] = func
+        self._readers[name.rsplit(".", 1)[-1]] = func
+
+    def _record_reader(self, schema: dict, key_fields: List[str]) -> Reader:
+        """Returns a reader of a tuple of the keys of the given fields, the other fields are skipped"""
+        implementation: List[Reader] = []
+        complete = key_fields == [field["name"] for field in schema["fields"]]
+        if complete:
+            self._register(schema, lambda buf, pos: implementation[0](buf, pos))
+
+        # (reader, order) per field, the fields that are not compared have a skipper and order ignore
+        fields: List[Tuple[Callable, str]] = []
+        for field in schema["fields"]:
+            order = field.get("order", "ascending")
+            if order not in FIELD_ORDERS:
+                raise ValueError(f"Invalid order '{order}' of field '{field['name']}', should be one of {FIELD_ORDERS}")
+            if field["name"] not in key_fields or order == "ignore":
+                fields.append((self._skippers.skipper(field["type"]), "ignore"))
+            else:
+                fields.append((self.reader(field["type"]), order))
+        # The keys are read in the order of the schema and returned in the order of the given fields
+        compared = [field["name"] for field, (_, order) in zip(schema["fields"], fields) if order != "ignore"]
+        permutation = [compared.index(name) for name in key_fields if name in compared]
+        reorder = None if permutation == sorted(permutation) else itemgetter(*permutation)
+
+        def read_record(buf, pos):
+            keys = []
+            for read, order in fields:
+                if order == "ignore":
+                    pos = read(buf, pos)
+                    continue
+                key, pos = read(buf, pos)
+                keys.append(key if order == "ascending" else Descending(key))
+            if reorder is not None:
+                return reorder(keys), pos
+            return tuple(keys), pos
+
+        implementation.append(read_record)
+        if complete:
+            self._register(schema, read_record)
+        return read_record
+
+    def _array_reader(self, schema: dict) -> Reader:
+        read_item = self.reader(schema["items"])
+
+        def read_array(buf, pos):
+            items = []
+            count, pos = read_long(buf, pos)
+            while count:
+                if count < 0:
+                    count = -count
+                    _, pos = read_long(buf, pos)
+                for _ in range(count):
+                    item, pos = read_item(buf, pos)
+                    items.append(item)
+                count, pos = read_long(buf, pos)
+            # Tuples compare item by item and a prefix first, like arrays in the spec
+            return tuple(items), pos
+
+        return read_array
+
+    def _union_reader(self, schema: list) -> Reader:
+        branches = [self.reader(branch) for branch in schema]
+
+        def read_union(buf, pos):
+            index, pos = read_long(buf, pos)
+            key, pos = branches[index](buf, pos)
+            return (index, key), pos
+
+        return read_union
+
+
+def compile_sort_key(schema: AvroSchema, fields: Optional[List[str]] = None) -> Reader:
+    """Returns a reader of the sort key of encoded datums of the given schema
+
+    :param schema: The avro schema
+    :param fields: Fields of a record schema to sort by, in order of precedence. By default all fields are compared
+                   in the order of the schema, fields with "order": "ignore" are not compared in either case.
+    """
+    compiler = SortKeyCompiler(schema)
+    if fields is None:
+        return compiler.reader(schema)
+    record = resolve(schema, compiler.names)
+    missing = set(fields) - {field["name"] for field in record.get("fields", [])}
+    if missing:
+        raise ValueError(f"Fields {sorted(missing)} do not exist in the schema")
+    return compiler._record_reader(record, list(fields))
+
+
+def compile_comparator(schema: AvroSchema, fields: Optional[List[str]] = None) -> Callable[[Any, Any], int]:
+    """Returns a function comparing two encoded datums, returning -1, 0 or 1 like the Avro sort order
+
+    :param schema: The avro schema
+    :param fields: Fields of a record schema to compare, see `compile_sort_key`
+    """
+    read_key = compile_sort_key(schema, fields)
+
+    def compare(a, b) -> int:
+        key_a, key_b = read_key(a, 0)[0], read_key(b, 0)[0]
+        return (key_b < key_a) - (key_a < key_b)
+
+    return compare
+
+
+def _keyed_records(reader: OcfReader, read_key: Reader) -> Iterator[Tuple[Any, bytes]]:
+    """Yields the sort key and the encoded record of the records of a file"""
+    for block in reader.iter_blocks():
+        data, pos = block.data, 0
+        for _ in range(block.num_records):
+            key, end = read_key(data, pos)
+            yield key, data[pos:end]
+            pos = end
+
+
+def sort_ocf(
+    fo: IO[bytes],
+    out: IO[bytes],
+    fields: Optional[List[str]] = None,
+    codec: Optional[str] = None,
+    block_size: int = BLOCK_SIZE,
+    memory_limit: int = MEMORY_LIMIT,
+    tmp_dir: Optional[str] = None,
+) -> int:
+    """Sorts the records of an object container file by the Avro sort order, without decoding them
+
+    Records are sorted in memory in runs of at most `memory_limit` bytes of encoded records. When there is more than
+    one run, the runs are written to temporary files and merged. The sort is stable. Returns the number of records.
+
+    :param fo: Binary file object to read from
+    :param out: Binary file object to write the sorted file to
+    :param fields: Fields to sort by in order of precedence, by default all fields, see `compile_sort_key`
+    :param codec: Compression codec of the sorted file, by default the codec of the input file
+    :param block_size: Target size in bytes of the uncompressed data of a block
+    :param memory_limit: Size in bytes of the encoded records that are sorted in memory
+    :param tmp_dir: Directory of the temporary files, by default the temporary directory of the system
+    """
+    reader = OcfReader(fo)
+    schema = reader.schema
+    metadata = {key: value for key, value in reader.metadata.items() if not key.startswith("avro.")}
+    read_key = compile_sort_key(schema, fields)
+    by_key = itemgetter(0)
+
+    runs: List[IO[bytes]] = []
+    run: List[Tuple[Any, bytes]] = []
+    size = count = 0
+    try:
+        for key, record in _keyed_records(reader, read_key):
+            run.append((key, record))
+            size += len(record)
+            count += 1
+            if size >= memory_limit:
+                run.sort(key=by_key)
+                runs.append(tempfile.TemporaryFile(dir=tmp_dir))
+                with OcfWriter(runs[-1], schema, block_size=block_size) as writer:
+                    for _, record in run:
+                        writer.write_encoded(record)
+                run, size = [], 0
+        run.sort(key=by_key)
+
+        if runs:
+            merged: List[Iterator[Tuple[Any, bytes]]] = []
+            for run_file in runs:
+                run_file.seek(0)
+                merged.append(_keyed_records(OcfReader(run_file), read_key))
+            # The records in memory come last in the input, so are merged last for a stable sort
+            records: Iterator[Tuple[Any, bytes]] = heapq.merge(*merged, iter(run), key=by_key)
+        else:
+            records = iter(run)
+        with OcfWriter(out, schema, codec=codec or reader.codec, block_size=block_size, metadata=metadata) as writer:
+            for _, record in records:
+                writer.write_encoded(record)
+    finally:
+        for run_file in runs:
+            run_file.close()
+    return count
@@ -0,0 +1,82 @@
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from pydantic_avro.binary.models import iter_reader_models
+from pydantic_avro.binary.ocf import OcfReader
+from pydantic_avro.binary.predicate import Filter
+from pydantic_avro.binary.stats import FileStats
+
+M = TypeVar("M", bound=BaseModel)
+
+# Default length of splits in bytes, as the block size of HDFS
+SPLIT_SIZE = 128 * 1024 * 1024
+
+# A (start, length) byte range of a file
+Split = Tuple[int, int]
+
+
+def file_splits(path: str, split_size: int = SPLIT_SIZE) -> List[Split]:
+    """Returns the adjacent (start, length) byte ranges of at most `split_size` bytes that cover a file
+
+    Splits are computed from the size of the file only, the readers of the splits find the blocks themselves. Every
+    block is read by exactly one split, splits that have no block starting in them yield no records.
+    """
+    if split_size <= 0:
+        raise ValueError(f"The split size should be positive, got {split_size}")
+    size = os.path.getsize(path)
+    return [(start, min(split_size, size - start)) for start in range(0, size, split_size)]
+
+
+def iter_split_records(
+    path: str,
+    start: int,
+    length: int,
+    filters: Optional[List[Filter]] = None,
+    stats: Optional[FileStats] = None,
+    **options: Any,
+) -> Iterator[Any]:
+    """Yields the decoded records of the blocks of a split of an object container file, see `OcfReader.seek_split`
+
+    :param path: Path of the object container file
+    :param start: Offset in the file at which the split starts
+    :param length: Length of the split in bytes
+    :param filters: Optional list of (field, operator, value) tuples that all have to match
+    :param stats: Statistics of the blocks of the file, to skip the blocks without matching records as a whole
+    :param options: Options of the `OcfReader`, e.g. `zero_copy`
+    """
+    with open(path, "rb") as fo:
+        reader = OcfReader(fo, **options)
+        reader.seek_split(start, length)
+        yield from reader.iter_records(filters, stats)
+
+
+def iter_split_models(
+    model: Type[M],
+    path: str,
+    start: int,
+    length: int,
+    filters: Optional[List[Filter]] = None,
+    intern_strings: Optional[Dict[str, int]] = None,
+    stats: Optional[FileStats] = None,
+) -> Iterator[M]:
+    """Yields model instances for the records of a split of an object container file, like `iter_avro_models`
+
+    Workers that each read one of the `file_splits` of a file together read all records of the file once, e.g.
+    the tasks of a process pool or of the nodes of a cluster. Only the header and the sync marker of the file are
+    needed to find the blocks of a split.
+
+    :param model: The pydantic model to validate the records with
+    :param path: Path of the object container file
+    :param start: Offset in the file at which the split starts
+    :param length: Length of the split in bytes
+    :param filters: Optional list of (field, operator, value) tuples that all have to match
+    :param intern_strings: Maximum number of distinct strings to keep per field, by field name or "Record.field"
+    :param stats: Statistics of the blocks of the file returned by `write_avro_models`, blocks that can not match the
+                  filters are skipped without reading them
+    """
+    with open(path, "rb") as fo:
+        reader = OcfReader(fo, intern_strings=intern_strings)
+        reader.seek_split(start, length)
+        yield from iter_reader_models(model, reader, filters, stats)
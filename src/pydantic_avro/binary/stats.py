@@ -0,0 +1,163 @@
+import json
+from typing import IO, Any, Callable, Dict, List, Optional
+
+from pydantic_avro.binary.predicate import ORDERING_OPERATORS, Filter, PredicateCompiler
+from pydantic_avro.binary.schema import AvroSchema, resolve, schema_type
+
+# Avro types of which the fields can have statistics, strings are compared by their UTF-8 bytes
+STATS_TYPES = frozenset(["boolean", "int", "long", "float", "double", "string", "enum"])
+
+# Minimum, maximum and number of nulls of a field in a block, the minimum and maximum are None without values
+FieldStats = List[Any]
+# Statistics by field of a block, None for blocks that were written already compressed
+BlockStats = Dict[str, FieldStats]
+# Tells whether a block, by its index, can have records matching filters
+BlockFilter = Callable[[int], bool]
+
+
+def _stats_type(schema: AvroSchema, names: Dict[str, dict]) -> Optional[str]:
+    """Returns the avro type of a field that can have statistics, also of optional fields, None otherwise"""
+    schema = resolve(schema, names)
+    t = schema_type(schema)
+    if t == "union" and len(schema) == 2 and "null" in schema:
+        return _stats_type(schema[1 - schema.index("null")], names)
+    return t if t in STATS_TYPES else None
+
+
+class BlockStatsCollector:
+    """Computes the minimum, maximum and null count of fields for the encoded records of blocks.
+
+    The values are read in their raw avro representation like filters compare them: ints for timestamps and dates,
+    UTF-8 bytes for strings and indexes for enums.
+    """
+
+    def __init__(self, schema: dict, fields: List[str]):
+        compiler = PredicateCompiler(schema)
+        types = {field["name"]: field["type"] for field in compiler.record["fields"]}
+        unknown = set(fields) - set(types)
+        if unknown:
+            raise ValueError(f"Fields {sorted(unknown)} do not exist in record '{compiler.record['name']}'")
+        for name in fields:
+            if _stats_type(types[name], compiler.compiler.names) is None:
+                raise ValueError(f"Field '{name}' has no statistics, only numbers, strings and enums have")
+        # The reader returns the values in the order of the schema
+        self.fields = [name for name in types if name in fields]
+        self._read, _ = compiler.fields_reader(self.fields)
+
+    def collect(self, data: Any, count: int) -> BlockStats:
+        """Returns the statistics by field of the encoded records of a block"""
+        stats: List[FieldStats] = [[None, None, 0] for _ in self.fields]
+        read, pos = self._read, 0
+        for _ in range(count):
+            values, pos = read(data, pos)
+            for field, value in zip(stats, values):
+                if value is None:
+                    field[2] += 1
+                elif value != value:
+                    # NaN matches no filter
+                    continue
+                elif field[0] is None:
+                    field[0] = field[1] = value
+                elif value < field[0]:
+                    field[0] = value
+                elif value > field[1]:
+                    field[1] = value
+        return dict(zip(self.fields, stats))
+
+
+class FileStats:
+    """The statistics of the fields of the blocks of an object container file, see `OcfWriter`.
+
+    Statistics are stored as JSON next to the file, the file is identified by its sync marker. `offsets` holds the
+    offset in the file of every block, which readers of a split use to find the statistics of its blocks.
+    """
+
+    def __init__(
+        self,
+        sync_marker: bytes,
+        fields: List[str],
+        blocks: Optional[List[Optional[BlockStats]]] = None,
+        offsets: Optional[List[int]] = None,
+    ):
+        self.sync_marker = sync_marker
+        self.fields = fields
+        self.blocks = blocks if blocks is not None else []
+        self.offsets = offsets if offsets is not None else []
+
+    def dump(self, fo: IO[str]) -> None:
+        """Writes the statistics as JSON, strings as text"""
+        blocks = [
+            None if block is None else {name: [_to_json(v) for v in s[:2]] + s[2:] for name, s in block.items()}
+            for block in self.blocks
+        ]
+        data = {"sync_marker": self.sync_marker.hex(), "fields": self.fields, "blocks": blocks, "offsets": self.offsets}
+        json.dump(data, fo)
+
+    @classmethod
+    def load(cls, fo: IO[str]) -> "FileStats":
+        """Reads statistics written by `dump`"""
+        data = json.load(fo)
+        blocks = [
+            None if block is None else {name: [_from_json(v) for v in s[:2]] + s[2:] for name, s in block.items()}
+            for block in data["blocks"]
+        ]
+        # Statistics dumped without offsets can not be used to read splits
+        return cls(bytes.fromhex(data["sync_marker"]), data["fields"], blocks, data.get("offsets"))
+
+    def block_filter(self, schema: dict, filters: List[Filter]) -> BlockFilter:
+        """Returns whether a block, by its index from the first block of the file, can have records matching the
+        filters, by the statistics of the filtered fields
+
+        Filters on fields without statistics and with operators other than ==, in and the ordering operators do not
+        rule out blocks.
+        """
+        used = [(name, op, value) for name, op, value in filters if name in self.fields]
+        if not used:
+            return lambda index: True
+        compiler = PredicateCompiler(schema)
+        names = [field["name"] for field in compiler.record["fields"] if field["name"] in self.fields]
+        _, converts = compiler.fields_reader(names)
+        by_name = dict(zip(names, converts))
+        checks = [(name, _block_check(op, value, by_name[name])) for name, op, value in used]
+        blocks = self.blocks
+
+        def may_match(index: int) -> bool:
+            stats = blocks[index] if index < len(blocks) else None
+            if stats is None:
+                # Blocks without statistics, e.g. written after them
+                return True
+            return all(check(stats[name]) for name, check in checks)
+
+        return may_match
+
+
+def _block_check(op: str, value: Any, convert: Callable[[Any], Any]) -> Callable[[FieldStats], bool]:
+    """Returns whether a block with the statistics of a field can have a value matching the filter"""
+    if op in ("==", "="):
+        target = convert(value)
+        if target is None:
+            return lambda stats: stats[2] > 0
+        return lambda stats: stats[0] is not None and stats[0] <= target <= stats[1]
+    if op == "in":
+        targets = [convert(v) for v in value]
+        values = [t for t in targets if t is not None]
+        nulls = len(values) < len(targets)
+        return lambda stats: (nulls and stats[2] > 0) or (
+            stats[0] is not None and any(stats[0] <= t <= stats[1] for t in values)
+        )
+    if op in ORDERING_OPERATORS:
+        target = convert(value)
+        if op in ("<", "<="):
+            compare = ORDERING_OPERATORS[op]
+            return lambda stats: stats[0] is not None and compare(stats[0], target)
+        compare = ORDERING_OPERATORS[op]
+        return lambda stats: stats[1] is not None and compare(stats[1], target)
+    return lambda stats: True
+
+
+def _to_json(value: Any) -> Any:
+    return {"s": value.decode("utf-8")} if isinstance(value, bytes) else value
+
+
+def _from_json(value: Any) -> Any:
+    return value["s"].encode("utf-8") if isinstance(value, dict) else value
@@ -1,8 +1,12 @@
 import json
-from typing import Optional
+from contextlib import nullcontext
+from typing import ContextManager, Optional
 
 from pydantic_avro.from_avro.class_registery import ClassRegistry
+from pydantic_avro.from_avro.serializers import SERIALIZER_IMPORTS, generate_serializers
+from pydantic_avro.from_avro.slots import SLOTS_IMPORTS, generate_slots_classes
 from pydantic_avro.from_avro.types import get_pydantic_type
+from pydantic_avro.profiling import active_profile
 
 
 def validate_schema(schema: dict) -> None:
@@ -14,12 +18,27 @@ def validate_schema(schema: dict) -> None:
         raise AttributeError("Fields are required")
 
 
-def avsc_to_pydantic(schema: dict) -> str:
-    """Generate python code of pydantic of given Avro Schema"""
+def avsc_to_pydantic(schema: dict, serializers: bool = False, slots: bool = False) -> str:
+    """Generate python code of pydantic of given Avro Schema
+
+    :param schema: The Avro schema
+    :param serializers: Adds `to_avro_bytes` and `from_avro_bytes` methods to the records, with encoders and
+        decoders generated for the schema
+    :param slots: Adds a lightweight `__slots__` class without validation for each record, named like the model
+        with a `Record` suffix, that converts to the model with `to_model()`
+    """
     # Ensures that state is clean from previous calls
     ClassRegistry().clear()
     validate_schema(schema)
-    get_pydantic_type(schema)
+    profile = active_profile()
+
+    def phase(name: str) -> ContextManager:
+        return nullcontext() if profile is None else profile.phase(schema["name"], name)
+
+    with phase("types"):
+        get_pydantic_type(schema)
+    if profile is not None:
+        profile.count(schema["name"], "definitions", len(ClassRegistry().classes))
 
     file_content = """
 from datetime import date, datetime, time
@@ -29,18 +48,33 @@ from typing import List, Optional, Dict, Union
 from uuid import UUID
 
 from pydantic import BaseModel, Field
-
-
 """
-    file_content += "\n\n".join(ClassRegistry().classes.values())
+    classes = dict(ClassRegistry().classes)
+    functions = ""
+    imports = ""
+    if slots:
+        with phase("slots"):
+            classes.update(generate_slots_classes(schema))
+        imports += SLOTS_IMPORTS
+    if serializers:
+        with phase("serializers"):
+            methods, functions = generate_serializers(schema, slots=slots)
+        classes = {name: class_def + methods.get(name, "") for name, class_def in classes.items()}
+        imports += SERIALIZER_IMPORTS
+    if imports:
+        file_content += "\n" + imports
+    file_content += "\n\n"
+    file_content += "\n\n".join(classes.values())
+    if functions:
+        file_content += "\n\n" + functions
 
     return file_content
 
 
-def convert_file(avsc_path: str, output_path: Optional[str] = None):
+def convert_file(avsc_path: str, output_path: Optional[str] = None, serializers: bool = False, slots: bool = False):
     with open(avsc_path, "r") as fh:
         avsc_dict = json.load(fh)
-    file_content = avsc_to_pydantic(avsc_dict)
+    file_content = avsc_to_pydantic(avsc_dict, serializers=serializers, slots=slots)
     if output_path is None:
         print(file_content)
     else:
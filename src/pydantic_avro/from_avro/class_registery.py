@@ -1,14 +1,19 @@
+from typing import Optional
+
+
 class ClassRegistry:
     """Singleton class to store generated Pydantic classes."""
 
     _instance = None
     _classes: dict = {}
+    _named_types: dict = {}
 
     def __new__(cls):
         """Singleton implementation."""
         if cls._instance is None:
             cls._instance = super(ClassRegistry, cls).__new__(cls)
             cls._instance._classes = {}
+            cls._instance._named_types = {}
         return cls._instance
 
     def add_class(self, name: str, class_def: str):
@@ -24,6 +29,15 @@ class ClassRegistry:
         """Check if a class is in the registry."""
         return name in self._classes.keys()
 
+    def add_named_type(self, name: str, schema: dict):
+        """Add a named type without a class, like a fixed, to the registry."""
+        self._named_types[name] = schema
+
+    def named_type(self, name: str) -> Optional[dict]:
+        """Get the schema of a named type without a class."""
+        return self._named_types.get(name)
+
     def clear(self):
         """Clear all classes from the registry."""
         self._classes.clear()
+        self._named_types.clear()
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from typing import Any, Tuple
+
+
+def _to_python(value: Any) -> Any:
+    if isinstance(value, SlotsRecord):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_to_python(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _to_python(v) for k, v in value.items()}
+    return value
+
+
+class SlotsRecord(ABC):
+    """Base class of the lightweight `__slots__` records generated next to the pydantic models.
+
+    Records do not validate their values, which makes them much cheaper to create and keep in memory than models.
+    `to_model()` converts a record to the pydantic model, validating it.
+    """
+
+    __slots__: Tuple[str, ...] = ()
+
+    def to_dict(self) -> dict:
+        """Returns the values of the record as a dict, with nested records as dicts as well"""
+        return {name: _to_python(getattr(self, name)) for name in self.__slots__}
+
+    @abstractmethod
+    def to_model(self) -> Any:
+        """Returns the pydantic model of the record"""
+
+    def __eq__(self, other: Any) -> bool:
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
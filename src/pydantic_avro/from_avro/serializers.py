@@ -0,0 +1,313 @@
+from typing import Dict, List, Tuple
+
+from pydantic_avro.binary.schema import AvroSchema, collect_named_types, logical_type, resolve, schema_type
+from pydantic_avro.from_avro.slots import SLOTS_SUFFIX
+
+SERIALIZER_IMPORTS = """from pydantic_avro.binary.decoder import DOUBLE, FLOAT, read_bytes, read_long, read_string
+from pydantic_avro.binary.encoder import unscaled_decimal, unscaled_to_bytes, write_bytes, write_long, write_string
+from pydantic_avro.binary.logical import (
+    date_to_days,
+    datetime_to_micros,
+    datetime_to_millis,
+    days_to_date,
+    micros_to_datetime,
+    micros_to_time,
+    millis_to_datetime,
+    millis_to_time,
+    time_to_micros,
+    time_to_millis,
+    unscaled_to_decimal,
+)
+from pydantic_avro.binary.models import model_constructor
+"""
+
+# Conversions of logical types to and from their underlying long or int
+LOGICAL_TO_AVRO = {
+    "timestamp-millis": "datetime_to_millis",
+    "timestamp-micros": "datetime_to_micros",
+    "date": "date_to_days",
+    "time-millis": "time_to_millis",
+    "time-micros": "time_to_micros",
+}
+LOGICAL_FROM_AVRO = {
+    "timestamp-millis": "millis_to_datetime",
+    "timestamp-micros": "micros_to_datetime",
+    "date": "days_to_date",
+    "time-millis": "millis_to_time",
+    "time-micros": "micros_to_time",
+}
+
+# isinstance checks selecting the branch of a union, by avro type or logical type
+UNION_CHECKS = {
+    "null": "{v} is None",
+    "boolean": "isinstance({v}, bool)",
+    "int": "isinstance({v}, int) and not isinstance({v}, bool)",
+    "long": "isinstance({v}, int) and not isinstance({v}, bool)",
+    "float": "isinstance({v}, (int, float)) and not isinstance({v}, bool)",
+    "double": "isinstance({v}, (int, float)) and not isinstance({v}, bool)",
+    "string": "isinstance({v}, str)",
+    "bytes": "isinstance({v}, bytes)",
+    "fixed": "isinstance({v}, bytes)",
+    "array": "isinstance({v}, list)",
+    "map": "isinstance({v}, dict)",
+    "timestamp-millis": "isinstance({v}, (datetime, int)) and not isinstance({v}, bool)",
+    "timestamp-micros": "isinstance({v}, (datetime, int)) and not isinstance({v}, bool)",
+    "date": "isinstance({v}, (date, int)) and not isinstance({v}, (datetime, bool))",
+    "time-millis": "isinstance({v}, time)",
+    "time-micros": "isinstance({v}, time)",
+    "uuid": "isinstance({v}, UUID)",
+    "decimal": "isinstance({v}, Decimal)",
+}
+
+
+def indent(lines: List[str], level: int = 1) -> List[str]:
+    return ["    " * level + line for line in lines]
+
+
+class SerializerGenerator:
+    """Generates python code of specialized binary encoders and decoders for the records of an Avro schema.
+
+    Every record gets a `_write_<name>` and `_read_<name>` function with the fields written out, so encoding and
+    decoding does not interpret the schema at runtime. Decoded records are constructed without validation, as
+    the avro encoding already guarantees the types. With `slots`, the `__slots__` record classes get functions too.
+    """
+
+    def __init__(self, schema: AvroSchema, slots: bool = False):
+        self.names = collect_named_types(schema)
+        self.suffixes = ["", SLOTS_SUFFIX] if slots else [""]
+        self._suffix = ""
+        self._counter = 0
+
+    def _var(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}_{self._counter}"
+
+    def records(self) -> List[dict]:
+        return [d for name, d in self.names.items() if d["type"] in ("record", "error") and name == d["name"]]
+
+    def enums(self) -> List[dict]:
+        return [d for name, d in self.names.items() if d["type"] == "enum" and name == d["name"]]
+
+    def generate(self) -> Tuple[Dict[str, str], str]:
+        """Returns the methods to add to each record class and the module level functions"""
+        methods = {}
+        functions = []
+        for enum in self.enums():
+            functions.append(f"_{enum['name']}_INDEX = {{s: i for i, s in enumerate({enum['symbols']!r})}}")
+        for self._suffix in self.suffixes:
+            for record in self.records():
+                name = record["name"] + self._suffix
+                methods[name] = self._methods(name)
+                functions.append("\n".join(self._write_function(record)))
+                functions.append("\n".join(self._read_function(record)))
+        # Defined at the end of the module, after the classes they refer to
+        tables = [f"_{enum['name']}_MEMBERS = list({enum['name']})" for enum in self.enums()]
+        tables += [f"_construct_{r['name']} = model_constructor({r['name']})" for r in self.records()]
+        functions.append("\n".join(tables))
+        return methods, "\n\n\n".join(functions) + "\n"
+
+    @staticmethod
+    def _methods(name: str) -> str:
+        return (
+            "\n"
+            "    def to_avro_bytes(self) -> bytes:\n"
+            "        buf = bytearray()\n"
+            f"        _write_{name}(buf, self)\n"
+            "        return bytes(buf)\n"
+            "\n"
+            "    @classmethod\n"
+            f'    def from_avro_bytes(cls, data: bytes) -> "{name}":\n'
+            f"        return _read_{name}(data, 0)[0]\n"
+        )
+
+    @staticmethod
+    def _field_schema(field: dict) -> AvroSchema:
+        # Maps and arrays can be defined on the field itself, like {"name": "x", "type": "map", "values": "long"}
+        if field["type"] in ("array", "map"):
+            return field
+        return field["type"]
+
+    def _write_function(self, record: dict) -> List[str]:
+        body: List[str] = []
+        for field in record["fields"]:
+            body.extend(self._write(self._field_schema(field), f"value.{field['name']}"))
+        return [f"def _write_{record['name']}{self._suffix}(buf, value):", *indent(body or ["pass"])]
+
+    def _read_function(self, record: dict) -> List[str]:
+        body: List[str] = []
+        values = []
+        for field in record["fields"]:
+            target = f"v_{field['name']}"
+            body.extend(self._read(self._field_schema(field), target))
+            values.append((field["name"], target))
+        name = record["name"] + self._suffix
+        if self._suffix:
+            construct = f"{name}({', '.join(f'{n}={target}' for n, target in values)})"
+        else:
+            construct = f"_construct_{name}({{{', '.join(f'{n!r}: {target}' for n, target in values)}}})"
+        return [f"def _read_{name}(buf, pos):", *indent(body), f"    return {construct}, pos"]
+
+    def _write(self, schema: AvroSchema, v: str) -> List[str]:
+        """Returns the statements writing the value expression v"""
+        schema = resolve(schema, self.names)
+        t = schema_type(schema)
+        lt = logical_type(schema)
+        if lt in LOGICAL_TO_AVRO:
+            # Values that are already in the avro representation are written as is
+            return [f"write_long(buf, {v} if {v}.__class__ is int else {LOGICAL_TO_AVRO[lt]}({v}))"]
+        if lt == "uuid":
+            return [f"write_string(buf, str({v}))"]
+        if lt == "decimal" and t == "bytes":
+            return [f"write_bytes(buf, unscaled_to_bytes(unscaled_decimal({v}, {schema.get('scale', 0)})))"]
+        if lt == "decimal" and t == "fixed":
+            return [f"buf += unscaled_to_bytes(unscaled_decimal({v}, {schema.get('scale', 0)}), {schema['size']})"]
+        if t == "null":
+            return []
+        if t == "boolean":
+            return [f"buf.append(1 if {v} else 0)"]
+        if t in ("int", "long"):
+            return [f"write_long(buf, {v})"]
+        if t == "float":
+            return [f"buf += FLOAT.pack({v})"]
+        if t == "double":
+            return [f"buf += DOUBLE.pack({v})"]
+        if t == "string":
+            return [f"write_string(buf, {v})"]
+        if t == "bytes":
+            return [f"write_bytes(buf, {v})"]
+        if t == "fixed":
+            return [f"buf += {v}"]
+        if t == "enum":
+            return [f"write_long(buf, _{schema['name']}_INDEX[{v}])"]
+        if t in ("record", "error"):
+            return [f"_write_{schema['name']}{self._suffix}(buf, {v})"]
+        if t == "array":
+            item = self._var("item")
+            return [
+                f"if {v}:",
+                f"    write_long(buf, len({v}))",
+                f"    for {item} in {v}:",
+                *indent(self._write(schema["items"], item), 2),
+                "buf.append(0)",
+            ]
+        if t == "map":
+            key, item = self._var("key"), self._var("item")
+            return [
+                f"if {v}:",
+                f"    write_long(buf, len({v}))",
+                f"    for {key}, {item} in {v}.items():",
+                f"        write_string(buf, {key})",
+                *indent(self._write(schema["values"], item), 2),
+                "buf.append(0)",
+            ]
+        if t == "union":
+            return self._write_union(schema, v)
+        raise NotImplementedError(f"Type '{t}' not supported yet")
+
+    def _write_union(self, schema: list, v: str) -> List[str]:
+        lines = []
+        for i, branch in enumerate(schema):
+            resolved = resolve(branch, self.names)
+            t = schema_type(resolved)
+            key = logical_type(resolved) or t
+            if t in ("record", "error", "enum"):
+                suffix = "" if t == "enum" else self._suffix
+                check = f"isinstance({v}, {resolved['name']}{suffix})"
+            else:
+                check = UNION_CHECKS[key].format(v=v)
+            lines.append(f"{'if' if i == 0 else 'elif'} {check}:")
+            lines.extend(indent([f"write_long(buf, {i})", *self._write(branch, v)]))
+        lines.extend(["else:", f"    raise ValueError(f'{{{v}!r}} does not match any type of the union')"])
+        return lines
+
+    @staticmethod
+    def _read_long(target: str) -> List[str]:
+        """Returns statements reading a long, with the common single byte case inlined"""
+        return [
+            f"{target} = buf[pos]",
+            f"if {target} < 0x80:",
+            f"    {target} = ({target} >> 1) ^ -({target} & 1)",
+            "    pos += 1",
+            "else:",
+            f"    {target}, pos = read_long(buf, pos)",
+        ]
+
+    def _read(self, schema: AvroSchema, target: str) -> List[str]:
+        """Returns the statements reading a value into the target variable"""
+        schema = resolve(schema, self.names)
+        t = schema_type(schema)
+        lt = logical_type(schema)
+        if lt in LOGICAL_FROM_AVRO:
+            return [*self._read_long(target), f"{target} = {LOGICAL_FROM_AVRO[lt]}({target})"]
+        if lt == "uuid":
+            return [f"{target}, pos = read_string(buf, pos)", f"{target} = UUID({target})"]
+        if lt == "decimal" and t in ("bytes", "fixed"):
+            if t == "bytes":
+                read = [f"{target}, pos = read_bytes(buf, pos)"]
+            else:
+                read = [f"{target} = buf[pos : pos + {schema['size']}]", f"pos += {schema['size']}"]
+            return [
+                *read,
+                f"{target} = unscaled_to_decimal(int.from_bytes({target}, 'big', signed=True), {schema.get('scale', 0)})",
+            ]
+        if t == "null":
+            return [f"{target} = None"]
+        if t == "boolean":
+            return [f"{target} = buf[pos] != 0", "pos += 1"]
+        if t in ("int", "long"):
+            return self._read_long(target)
+        if t == "float":
+            return [f"{target} = FLOAT.unpack_from(buf, pos)[0]", "pos += 4"]
+        if t == "double":
+            return [f"{target} = DOUBLE.unpack_from(buf, pos)[0]", "pos += 8"]
+        if t == "string":
+            return [f"{target}, pos = read_string(buf, pos)"]
+        if t == "bytes":
+            return [f"{target}, pos = read_bytes(buf, pos)"]
+        if t == "fixed":
+            return [f"{target} = bytes(buf[pos : pos + {schema['size']}])", f"pos += {schema['size']}"]
+        if t == "enum":
+            return [*self._read_long(target), f"{target} = _{schema['name']}_MEMBERS[{target}]"]
+        if t in ("record", "error"):
+            return [f"{target}, pos = _read_{schema['name']}{self._suffix}(buf, pos)"]
+        if t in ("array", "map"):
+            return self._read_blocks(schema, target)
+        if t == "union":
+            index = self._var("index")
+            lines = self._read_long(index)
+            for i, branch in enumerate(schema):
+                lines.append(f"{'if' if i == 0 else 'elif'} {index} == {i}:")
+                lines.extend(indent(self._read(branch, target) or ["pass"]))
+            lines.extend(["else:", f"    raise ValueError(f'Invalid union index {{{index}}}')"])
+            return lines
+        raise NotImplementedError(f"Type '{t}' not supported yet")
+
+    def _read_blocks(self, schema: dict, target: str) -> List[str]:
+        count, item = self._var("count"), self._var("item")
+        if schema["type"] == "array":
+            init = f"{target} = []"
+            read_item = [*self._read(schema["items"], item), f"{target}.append({item})"]
+        else:
+            key = self._var("key")
+            init = f"{target} = {{}}"
+            read_item = [
+                f"{key}, pos = read_string(buf, pos)",
+                *self._read(schema["values"], item),
+                f"{target}[{key}] = {item}",
+            ]
+        return [
+            init,
+            *self._read_long(count),
+            f"while {count}:",
+            f"    if {count} < 0:",
+            f"        {count} = -{count}",
+            "        _, pos = read_long(buf, pos)",
+            f"    for _ in range({count}):",
+            *indent(read_item, 2),
+            *indent(self._read_long(count)),
+        ]
+
+
+def generate_serializers(schema: AvroSchema, slots: bool = False) -> Tuple[Dict[str, str], str]:
+    """Returns the methods to add to each generated record class and the module level serializer functions"""
+    return SerializerGenerator(schema, slots).generate()
@@ -0,0 +1,51 @@
+from typing import Dict, List
+
+from pydantic_avro.binary.schema import AvroSchema, collect_named_types
+
+SLOTS_SUFFIX = "Record"
+SLOTS_IMPORTS = """from pydantic_avro.from_avro.records import SlotsRecord
+"""
+
+
+def record_schemas(schema: AvroSchema) -> List[dict]:
+    """Returns the definitions of all records of a schema"""
+    names = collect_named_types(schema)
+    return [d for name, d in names.items() if d["type"] in ("record", "error") and name == d["name"]]
+
+
+def generate_slots_class(record: dict) -> str:
+    """Generates a `__slots__` record class for an Avro record, next to the pydantic model of the record"""
+    name = record["name"]
+    params = []
+    body = []
+    for field in record["fields"]:
+        n = field["name"]
+        if "default" not in field:
+            params.append(n)
+            body.append(f"self.{n} = {n}")
+        elif isinstance(field["default"], (list, dict)):
+            # Mutable defaults are created per instance
+            params.append(f"{n}=None")
+            body.append(f"self.{n} = {field['default']!r} if {n} is None else {n}")
+        else:
+            params.append(f"{n}={field['default']!r}")
+            body.append(f"self.{n} = {n}")
+
+    slots = tuple(field["name"] for field in record["fields"])
+    signature = f"self, *, {', '.join(params)}" if params else "self"
+    init_body = "\n".join(f"        {line}" for line in body) if body else "        pass"
+    return (
+        f"class {name}{SLOTS_SUFFIX}(SlotsRecord):\n"
+        f"    __slots__ = {slots!r}\n"
+        "\n"
+        f"    def __init__({signature}):\n"
+        f"{init_body}\n"
+        "\n"
+        f"    def to_model(self) -> {name}:\n"
+        f"        return {name}(**self.to_dict())\n"
+    )
+
+
+def generate_slots_classes(schema: AvroSchema) -> Dict[str, str]:
+    """Generates a `__slots__` record class for every record of the schema, by class name"""
+    return {record["name"] + SLOTS_SUFFIX: generate_slots_class(record) for record in record_schemas(schema)}
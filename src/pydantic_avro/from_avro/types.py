@@ -57,9 +57,19 @@ def map_type_handler(t: dict) -> str:
 
 def logical_type_handler(t: dict) -> str:
     """Get the Python type of a given Avro logical type"""
+    if "name" in t["type"]:
+        # Named logical types like fixed decimals can be referenced by name
+        ClassRegistry().add_named_type(t["type"]["name"], t["type"])
     return LOGICAL_TYPES[t["type"]["logicalType"]]
 
 
+def fixed_type_handler(t: dict) -> str:
+    """Gets the Python type of a given Avro fixed type and adds it to the registry to be referenced by name"""
+    type_info = t if t["type"] == "fixed" else t["type"]
+    ClassRegistry().add_named_type(type_info["name"], type_info)
+    return "bytes"
+
+
 def enum_type_handler(t: dict) -> str:
     """Gets the enum type of a given Avro enum type and adds it to the class registry"""
     if t["type"] == "enum":
@@ -108,14 +118,34 @@ TYPE_HANDLERS = {
     "enum": enum_type_handler,
     "array": array_type_handler,
     "record": record_type_handler,
+    "fixed": fixed_type_handler,
 }
 
 
+def type_constraints(t: Union[str, list, dict]) -> str:
+    """Get the pydantic constraints of decimal and fixed types, also when they are part of a union"""
+    if isinstance(t, list):
+        return next((c for c in map(type_constraints, t) if c), "")
+    if isinstance(t, str):
+        t = ClassRegistry().named_type(t) or {}
+    if t.get("logicalType") == "decimal" and "precision" in t:
+        return f"max_digits={t['precision']}, decimal_places={t.get('scale', 0)}"
+    if t.get("type") == "fixed" and "logicalType" not in t:
+        return f"min_length={t['size']}, max_length={t['size']}"
+    return ""
+
+
 def generate_field_string(field: dict) -> str:
     """Generate a string representing a field in the Pydantic model."""
     n = field["name"]
     t = get_pydantic_type(field)
     default = field.get("default")
+    constraints = type_constraints(field["type"])
+    if constraints and "default" not in field:
+        return f"    {n}: {t} = Field(..., {constraints})"
+    elif constraints:
+        default_string = default if isinstance(default, (bool, type(None))) else json.dumps(default)
+        return f"    {n}: {t} = Field({default_string}, {constraints})"
     if field["type"] == "int" and "default" in field and isinstance(default, (bool, type(None))):
         return f"    {n}: {t} = Field({default}, ge=-2**31, le=(2**31 - 1))"
     elif field["type"] == "int" and "default" in field:
@@ -132,13 +162,18 @@ def generate_field_string(field: dict) -> str:
 
 def get_pydantic_type(t: Union[str, dict]) -> str:
     """Get the Pydantic type for a given Avro type"""
-    if isinstance(t, str) or isinstance(t, list):
+    if isinstance(t, str) or isinstance(t, list) or "logicalType" in t:
+        # Logical types in unions are types, not fields with a type
         t = {"type": t}
 
     if isinstance(t.get("type"), str):
         if ClassRegistry().has_class(t["type"]):
             return t["type"]
 
+        named_type = ClassRegistry().named_type(t["type"])
+        if named_type is not None:
+            return get_pydantic_type(named_type)
+
         if t["type"] in AVRO_TO_PY_MAPPING:
             return AVRO_TO_PY_MAPPING[t["type"]]
 
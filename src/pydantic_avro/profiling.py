@@ -0,0 +1,97 @@
+import functools
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Callable, DefaultDict, Dict, Iterator, List, Optional, Tuple
+
+# Called with the model, the phase and the seconds spent in it, each time a phase ends
+PhaseCallback = Callable[[str, str, float], None]
+
+
+class ConversionProfile:
+    """Time spent per model and phase of the schema conversions, and counters of what was visited.
+
+    Times are exclusive: the time of a phase does not include the time of the phases nested in it, e.g. the
+    conversion of a referenced model is counted as `references` and not as the `fields` of the model referring to it.
+    """
+
+    def __init__(self, on_phase: Optional[PhaseCallback] = None):
+        self.on_phase = on_phase
+        self.timings: DefaultDict[str, DefaultDict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.counts: DefaultDict[str, DefaultDict[str, int]] = defaultdict(lambda: defaultdict(int))
+        # Time spent in nested phases, per phase that is running
+        self._nested: List[float] = []
+
+    def add(self, model: str, phase: str, seconds: float) -> None:
+        """Adds the seconds spent in a phase of a model"""
+        self.timings[model][phase] += seconds
+        if self.on_phase is not None:
+            self.on_phase(model, phase, seconds)
+
+    def count(self, model: str, counter: str, n: int = 1) -> None:
+        self.counts[model][counter] += n
+
+    @contextmanager
+    def phase(self, model: str, phase: str) -> Iterator[None]:
+        """Times the block as a phase of a model"""
+        self._nested.append(0.0)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            nested = self._nested.pop()
+            if self._nested:
+                self._nested[-1] += elapsed
+            self.add(model, phase, elapsed - nested)
+
+    def slowest(self, n: Optional[int] = None) -> List[Tuple[str, str, float]]:
+        """Returns (model, phase, seconds) tuples, the slowest first"""
+        entries = [(model, phase, s) for model, phases in self.timings.items() for phase, s in phases.items()]
+        return sorted(entries, key=lambda entry: entry[2], reverse=True)[:n]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timings": {model: dict(phases) for model, phases in self.timings.items()},
+            "counts": {model: dict(counters) for model, counters in self.counts.items()},
+        }
+
+
+_PROFILE: ContextVar[Optional[ConversionProfile]] = ContextVar("pydantic_avro_profile", default=None)
+
+
+def active_profile() -> Optional[ConversionProfile]:
+    """Returns the profile of the enclosing `profile_conversions` block, None when not profiling"""
+    return _PROFILE.get()
+
+
+@contextmanager
+def profile_conversions(on_phase: Optional[PhaseCallback] = None) -> Iterator[ConversionProfile]:
+    """Profiles the schema conversions in the block, `avro_schema()` and `avsc_to_pydantic`
+
+    :param on_phase: Optional callback called with the model, the phase and the seconds each time a phase ends
+    :return: The profile, filled while the block runs
+    """
+    profile = ConversionProfile(on_phase)
+    token = _PROFILE.set(profile)
+    try:
+        yield profile
+    finally:
+        _PROFILE.reset(token)
+
+
+def profiled(phase: str) -> Callable[[Callable], Callable]:
+    """Times a method as a phase of `self.model` when `self.profile` is set, calls it as is otherwise"""
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.profile is None:
+                return method(self, *args, **kwargs)
+            with self.profile.phase(self.model, phase):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
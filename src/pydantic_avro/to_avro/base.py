@@ -1,10 +1,27 @@
+from time import perf_counter
 from typing import Literal, Optional
 
 from pydantic import BaseModel
 
+from pydantic_avro.profiling import active_profile
 from pydantic_avro.to_avro.config import PYDANTIC_V2
+from pydantic_avro.to_avro.precompute import get_precomputed_schema
 from pydantic_avro.to_avro.types import AvroTypeConverter
 
+if PYDANTIC_V2:
+    from pydantic.json_schema import GenerateJsonSchema
+
+    class AvroGenerateJsonSchema(GenerateJsonSchema):
+        """Adds the constraints needed by the avro schema that pydantic leaves out of the JSON schema"""
+
+        def decimal_schema(self, schema):
+            json_schema = super().decimal_schema(schema)
+            if schema.get("max_digits") is not None:
+                json_schema["maxDigits"] = schema["max_digits"]
+            if schema.get("decimal_places") is not None:
+                json_schema["decimalPlaces"] = schema["decimal_places"]
+            return json_schema
+
 
 class AvroBase(BaseModel):
     """This class provides functionality to convert a pydantic model to an Avro schema."""
@@ -25,8 +42,20 @@ class AvroBase(BaseModel):
                      Only applicable for Pydantic v2.
         :return: dict with the Avro Schema for the model
         """
+        profile = active_profile()
+        if by_alias and mode == "serialization":
+            # Schemas precomputed with the default arguments, see load_schema_cache
+            precomputed = get_precomputed_schema(cls)
+            if precomputed is not None:
+                if profile is not None:
+                    profile.count(precomputed["name"], "precomputed")
+                if namespace is not None:
+                    precomputed["namespace"] = namespace
+                return precomputed
+
+        start = perf_counter()
         if PYDANTIC_V2:
-            schema = cls.model_json_schema(by_alias=by_alias, mode=mode)
+            schema = cls.model_json_schema(by_alias=by_alias, mode=mode, schema_generator=AvroGenerateJsonSchema)
         else:
             if mode != "serialization":
                 raise ValueError(
@@ -34,6 +63,8 @@ class AvroBase(BaseModel):
                     f"Pydantic v1 does not support different schema modes."
                 )
             schema = cls.schema(by_alias=by_alias)
+        if profile is not None:
+            profile.add(schema["title"], "model_json_schema", perf_counter() - start)
 
         if namespace is None:
             # Default namespace will be based on title
@@ -43,6 +74,17 @@ class AvroBase(BaseModel):
 
         return cls._avro_schema(schema, namespace, avro_type_handler)
 
+    @classmethod
+    def avro_size_hint(cls) -> int:
+        """Returns the expected size in bytes of an encoded instance
+
+        The size is estimated from the avro schema until instances are written with `write_avro_models`, after which
+        it is the average size of the written instances.
+        """
+        from pydantic_avro.binary.models import model_size_estimator
+
+        return model_size_estimator(cls).hint
+
     @staticmethod
     def _avro_schema(schema: dict, namespace: str, avro_type_handler: AvroTypeConverter) -> dict:
         """Return the avro schema for the given pydantic schema"""
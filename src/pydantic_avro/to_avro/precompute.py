@@ -0,0 +1,202 @@
+import hashlib
+import importlib
+import inspect
+import json
+import pkgutil
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional, Tuple, get_args, get_origin
+from uuid import UUID
+from weakref import WeakKeyDictionary
+
+from pydantic import VERSION as PYDANTIC_VERSION
+
+from pydantic_avro.to_avro.config import PYDANTIC_V2
+
+# Precomputed schemas by model key, with the fingerprint of the model they were computed for
+_SCHEMAS: Dict[str, Tuple[str, dict]] = {}
+# Cache files that are registered but not read yet, they are read on the first schema lookup
+_PENDING_PATHS: List[str] = []
+_FINGERPRINTS: "WeakKeyDictionary[type, str]" = WeakKeyDictionary()
+_DESCRIPTIONS: "WeakKeyDictionary[type, str]" = WeakKeyDictionary()
+# Values of which the repr is the same in every process
+_PLAIN_TYPES = (type(None), bool, int, float, str, bytes, Enum, Decimal, date, datetime, time, timedelta, UUID)
+
+
+def model_key(model: type) -> str:
+    """Returns the key of a model in the schema cache"""
+    return f"{model.__module__}.{model.__qualname__}"
+
+
+def _stable(value: Any) -> str:
+    """Returns a representation of a value that is the same in every process, without memory addresses.
+
+    Callables and classes are represented by their qualified name, other objects by their class and attributes.
+    """
+    if isinstance(value, _PLAIN_TYPES):
+        return repr(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_stable(v) for v in value]
+        return f"[{', '.join(sorted(items) if isinstance(value, (set, frozenset)) else items)}]"
+    if isinstance(value, dict):
+        return f"{{{', '.join(sorted(f'{_stable(k)}: {_stable(v)}' for k, v in value.items()))}}}"
+    if callable(value):
+        return f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', type(value).__qualname__)}"
+    cls = type(value)
+    # Attributes of slots classes, like the constraints of annotated_types, and of other objects
+    attributes = {
+        name: getattr(value, name)
+        for klass in cls.__mro__
+        for name in getattr(klass, "__slots__", ())
+        if name not in ("__dict__", "__weakref__") and hasattr(value, name)
+    }
+    attributes.update(getattr(value, "__dict__", {}))
+    return f"{cls.__module__}.{cls.__qualname__}({_stable(attributes)})"
+
+
+def _annotation_classes(annotation: Any) -> Iterator[type]:
+    """Yields the classes in an annotation, also those in the arguments of generics like List and Optional"""
+    if inspect.isclass(annotation) and get_origin(annotation) is None:
+        yield annotation
+    for arg in get_args(annotation):
+        yield from _annotation_classes(arg)
+
+
+def _field_description(field: Any) -> List[str]:
+    """Returns the parts of a field that its schema is derived from"""
+    if PYDANTIC_V2:
+        info, annotation, extra = field, field.annotation, field.json_schema_extra
+        constraints = field.metadata
+    else:
+        info, annotation, extra = field.field_info, field.outer_type_, field.field_info.extra
+        constraints = {name: getattr(info, name) for name in info.get_constraints()}
+    # The symbols of enums are part of the schema
+    enums = [[member.value for member in cls] for cls in _annotation_classes(annotation) if issubclass(cls, Enum)]
+    return [
+        repr(annotation),
+        str(info.alias),
+        str(info.description),
+        _stable(extra),
+        _stable(constraints),
+        _stable(info.default),
+        _stable(info.default_factory),
+        _stable(enums),
+    ]
+
+
+def _model_description(model: type) -> str:
+    description = _DESCRIPTIONS.get(model)
+    if description is None:
+        fields = model.model_fields if PYDANTIC_V2 else model.__fields__  # type: ignore[attr-defined]
+        parts = [
+            model_key(model),
+            model.__dict__.get("__doc__"),
+            [(n, _field_description(f)) for n, f in fields.items()],
+        ]
+        description = _DESCRIPTIONS[model] = repr(parts)
+    return description
+
+
+def _referenced_models(model: type) -> Iterator[type]:
+    """Yields the pydantic models that the fields of a model refer to"""
+    from pydantic import BaseModel
+
+    fields = model.model_fields if PYDANTIC_V2 else model.__fields__  # type: ignore[attr-defined]
+    for field in fields.values():
+        for cls in _annotation_classes(field.annotation if PYDANTIC_V2 else field.outer_type_):
+            if issubclass(cls, BaseModel):
+                yield cls
+
+
+def model_fingerprint(model: type) -> str:
+    """Returns a hash of the fields of a model, of the models it refers to and of the pydantic version.
+
+    A precomputed schema is only used when the fingerprint still matches, so a changed model is not served a stale
+    schema. The fingerprint only hashes parts of the fields that are the same in every process, e.g. the name and
+    not the address of a default factory.
+    """
+    fingerprint = _FINGERPRINTS.get(model)
+    if fingerprint is None:
+        # All models reachable from the model, in the order of their key so recursive models hash the same from
+        # every model of the cycle
+        models = {model_key(model): model}
+        pending = [model]
+        while pending:
+            for referenced in _referenced_models(pending.pop()):
+                if model_key(referenced) not in models:
+                    models[model_key(referenced)] = referenced
+                    pending.append(referenced)
+        descriptions = [_model_description(models[key]) for key in sorted(models)]
+        description = repr([PYDANTIC_VERSION, model_key(model), descriptions])
+        fingerprint = _FINGERPRINTS[model] = hashlib.sha1(description.encode()).hexdigest()
+    return fingerprint
+
+
+def find_avro_models(module_name: str) -> Iterator[type]:
+    """Yields the AvroBase models defined in a module, and in its submodules when it is a package"""
+    from pydantic_avro.to_avro.base import AvroBase
+
+    module = importlib.import_module(module_name)
+    modules = [module]
+    if hasattr(module, "__path__"):
+        for info in pkgutil.walk_packages(module.__path__, prefix=f"{module_name}."):
+            modules.append(importlib.import_module(info.name))
+    for m in modules:
+        for _, obj in inspect.getmembers(m, inspect.isclass):
+            if issubclass(obj, AvroBase) and obj is not AvroBase and obj.__module__ == m.__name__:
+                yield obj
+
+
+def precompute_schemas(module_names: List[str]) -> dict:
+    """Returns the content of a schema cache for all AvroBase models of the given modules"""
+    schemas = {}
+    for module_name in module_names:
+        for model in find_avro_models(module_name):
+            schemas[model_key(model)] = {
+                "fingerprint": model_fingerprint(model),
+                "schema": model.avro_schema(),  # type: ignore[attr-defined]
+            }
+    return {"pydantic_version": PYDANTIC_VERSION, "schemas": schemas}
+
+
+def write_schema_cache(module_names: List[str], output_path: str) -> None:
+    """Writes a schema cache file for all AvroBase models of the given modules"""
+    with open(output_path, "w") as fh:
+        json.dump(precompute_schemas(module_names), fh, indent=2, sort_keys=True)
+
+
+def load_schema_cache(path: str) -> None:
+    """Registers a schema cache file, `avro_schema()` takes the schemas from it instead of deriving them.
+
+    The file is read when the first schema is requested.
+    """
+    _PENDING_PATHS.append(str(path))
+
+
+def clear_schema_cache() -> None:
+    _SCHEMAS.clear()
+    _PENDING_PATHS.clear()
+
+
+def _copy(value: Any) -> Any:
+    """Copies a JSON value, faster than deepcopy"""
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+
+def get_precomputed_schema(model: type) -> Optional[dict]:
+    """Returns a copy of the precomputed schema of a model, None if there is none or it is stale"""
+    while _PENDING_PATHS:
+        with open(_PENDING_PATHS.pop(0)) as fh:
+            content = json.load(fh)
+        for key, entry in content["schemas"].items():
+            _SCHEMAS[key] = (entry["fingerprint"], entry["schema"])
+
+    entry = _SCHEMAS.get(model_key(model))
+    if entry is None or entry[0] != model_fingerprint(model):
+        return None
+    return _copy(entry[1])
@@ -1,6 +1,6 @@
-from copy import deepcopy
 from typing import Any, Dict, List, Optional, Set
 
+from pydantic_avro.profiling import active_profile, profiled
 from pydantic_avro.to_avro.config import DEFS_NAME
 
 STRING_TYPE_MAPPING = {
@@ -63,6 +63,10 @@ AVRO_TYPE_MAPPING = {
 }
 
 PRIMITVE_TYPES = ["int", "long", "float", "double", "boolean", "null"]
+# Avro types of the avro_type option that are not in AVRO_TYPE_MAPPING, as they need a name and size
+NAMED_AVRO_TYPES = ["fixed"]
+# Sort orders of the avro_order option of fields
+FIELD_ORDERS = ["ascending", "descending", "ignore"]
 
 
 def get_definition(ref: str, schema: dict):
@@ -74,6 +78,14 @@ def get_definition(ref: str, schema: dict):
     return d
 
 
+def get_avro_option(field_props: dict, key: str) -> Any:
+    """Returns an avro option of a field like avro_type, for Pydantic v1 also from json_schema_extra"""
+    value = field_props.get(key)
+    if value is None and isinstance(field_props.get("json_schema_extra"), dict):
+        value = field_props["json_schema_extra"].get(key)
+    return value
+
+
 def set_nullability(avro_type_dict: dict) -> dict:
     """Set the nullability of the field"""
     if type(avro_type_dict["type"]) is list:
@@ -99,7 +111,15 @@ class AvroTypeConverter:
     def __init__(self, schema: dict):
         self.root_schema = schema
         self.classes_seen: Set[str] = set()
+        # Set when converting in a profile_conversions block
+        self.profile = active_profile()
+        self.model = schema.get("title", "")
+
+    def _count(self, counter: str, n: int = 1) -> None:
+        if self.profile is not None:
+            self.profile.count(self.model, counter, n)
 
+    @profiled("fields")
     def fields_to_avro_dicts(self, parent_schema: dict) -> List[dict]:
         """Converts fields from the schema to AVRO and returns them as a list of dictionaries.
 
@@ -108,9 +128,15 @@ class AvroTypeConverter:
         fields = []
 
         required = parent_schema.get("required", [])
+        self._count("fields", len(parent_schema.get("properties", {})))
         for name, field_props in parent_schema.get("properties", {}).items():
             avro_type_dict = self._get_avro_type_dict(field_props=field_props)
             avro_type_dict["name"] = name
+            order = get_avro_option(field_props, "avro_order")
+            if order is not None:
+                if order not in FIELD_ORDERS:
+                    raise ValueError(f"Field '{name}' has avro_order '{order}', should be one of {FIELD_ORDERS}")
+                avro_type_dict["order"] = order
             if name not in required:
                 set_nullability(avro_type_dict)
                 avro_type_dict = null_to_first_element(avro_type_dict)
@@ -133,13 +159,7 @@ class AvroTypeConverter:
         t = field_props.get("type")
         f = field_props.get("format")
         r = field_props.get("$ref")
-        at = field_props.get("avro_type")
-        
-        # For Pydantic v1, check json_schema_extra for avro_type
-        if at is None and "json_schema_extra" in field_props:
-            json_schema_extra = field_props.get("json_schema_extra")
-            if isinstance(json_schema_extra, dict):
-                at = json_schema_extra.get("avro_type")
+        at = get_avro_option(field_props, "avro_type")
         
         if "allOf" in field_props and len(field_props["allOf"]) == 1:
             r = field_props["allOf"][0]["$ref"]
@@ -149,21 +169,32 @@ class AvroTypeConverter:
         o = field_props.get("oneOf")
         discriminator = field_props.get("discriminator")
 
+        fixed_size = get_avro_option(field_props, "avro_fixed_size")
+
         if u is not None:
-            return self._union_to_avro(u, avro_type_dict, discriminator, parent_avro_type=at)
+            return self._union_to_avro(
+                u, avro_type_dict, discriminator, parent_avro_type=at, parent_fixed_size=fixed_size
+            )
         elif o is not None:
-            return self._union_to_avro(o, avro_type_dict, discriminator, parent_avro_type=at)
+            return self._union_to_avro(
+                o, avro_type_dict, discriminator, parent_avro_type=at, parent_fixed_size=fixed_size
+            )
         elif r is not None:
             return self._handle_references(r, avro_type_dict)
         elif t is None:
             raise ValueError(f"Field '{field_props}' does not have a defined type.")
         elif at is not None:
-            if not isinstance(at, str) or at not in AVRO_TYPE_MAPPING:
+            if not isinstance(at, str) or (at not in AVRO_TYPE_MAPPING and at not in NAMED_AVRO_TYPES):
                 raise ValueError(
                     f"Field '{field_props}' does not have a supported avro_type. Type should be one of "
-                    f" {AVRO_TYPE_MAPPING.keys()}"
+                    f" {[*AVRO_TYPE_MAPPING.keys(), *NAMED_AVRO_TYPES]}"
                 )
-            avro_type_dict["type"] = AVRO_TYPE_MAPPING[at]
+            if at == "fixed":
+                avro_type_dict["type"] = self._fixed_to_avro(field_props)
+            elif at == "decimal":
+                avro_type_dict["type"] = self._decimal_to_avro(field_props)
+            else:
+                avro_type_dict["type"] = AVRO_TYPE_MAPPING[at]
         elif t == "array":
             return self._array_to_avro(field_props, avro_type_dict)
         elif t == "string":
@@ -188,12 +219,15 @@ class AvroTypeConverter:
 
         return avro_type_dict
 
+    @profiled("references")
     def _handle_references(self, r: str, avro_type_dict: dict) -> dict:
         """Finds the type of a reference field"""
         class_name = r.replace(f"#/{DEFS_NAME}/", "")
         if class_name in self.classes_seen:
+            self._count("references_reused")
             avro_type_dict["type"] = class_name
             return avro_type_dict
+        self._count("definitions")
 
         d = get_definition(r, self.root_schema)
         if "enum" in d:
@@ -221,6 +255,55 @@ class AvroTypeConverter:
             return "string"
         return STRING_TYPE_MAPPING[f]
 
+    def _decimal_to_avro(self, field_props: dict):
+        """Returns a type of a decimal field, using max_digits and decimal_places as precision and scale"""
+        precision = field_props.get("maxDigits")
+        scale = field_props.get("decimalPlaces")
+        size = get_avro_option(field_props, "avro_fixed_size")
+
+        if size is None:
+            avro_type: Dict[str, Any] = {"type": "bytes", "logicalType": "decimal"}
+            if precision is not None:
+                avro_type["precision"] = precision
+            if scale is not None:
+                avro_type["scale"] = scale
+            return avro_type
+
+        # The most digits that fit in the fixed
+        max_precision = len(str(2 ** (8 * size - 1) - 1)) - 1
+        if precision is None:
+            precision = max_precision
+        elif precision > max_precision:
+            raise ValueError(f"Decimal with {precision} digits does not fit in a fixed of {size} bytes")
+        # Fixed types are named, decimals with the same size, precision and scale share a definition
+        name = f"decimal_{size}_{precision}_{scale or 0}"
+        if name in self.classes_seen:
+            return name
+        self.classes_seen.add(name)
+        return {
+            "type": "fixed",
+            "name": name,
+            "size": size,
+            "logicalType": "decimal",
+            "precision": precision,
+            "scale": scale or 0,
+        }
+
+    def _fixed_to_avro(self, field_props: dict):
+        """Returns a type of a fixed field, the size is avro_fixed_size or the length of constrained bytes"""
+        size = get_avro_option(field_props, "avro_fixed_size")
+        if size is None and field_props.get("minLength") is not None:
+            if field_props.get("minLength") == field_props.get("maxLength"):
+                size = field_props["minLength"]
+        if size is None:
+            raise ValueError(f"Field '{field_props}' of avro_type fixed needs an avro_fixed_size or a fixed length")
+        # Fixed types are named, fixed fields of the same size share a definition
+        name = f"fixed_{size}"
+        if name in self.classes_seen:
+            return name
+        self.classes_seen.add(name)
+        return {"type": "fixed", "name": name, "size": size}
+
     @staticmethod
     def _integer_to_avro(field_props: dict) -> str:
         """Returns a type of an integer field"""
@@ -252,12 +335,23 @@ class AvroTypeConverter:
         temporal_avro_types = {"timestamp-millis", "timestamp-micros", "time-millis", "time-micros", "date"}
         if parent_avro_type in temporal_avro_types:
             return element_format in {"date-time", "date", "time"}
+        if parent_avro_type == "fixed":
+            return element_format == "binary"
         
         # For other avro_types, only propagate if there's no format (meaning it's not already specialized)
         return element_format is None
 
-    def _union_to_avro(self, field_props: list, avro_type_dict: dict, discriminator: Optional[dict] = None, parent_avro_type: Optional[str] = None) -> dict:
+    @profiled("unions")
+    def _union_to_avro(
+        self,
+        field_props: list,
+        avro_type_dict: dict,
+        discriminator: Optional[dict] = None,
+        parent_avro_type: Optional[str] = None,
+        parent_fixed_size: Optional[int] = None,
+    ) -> dict:
         """Returns a type of a union field, including discriminated unions"""
+        self._count("unions")
         # Handle discriminated unions
         if discriminator is not None:
             return self._discriminated_union_to_avro(field_props, avro_type_dict, discriminator)
@@ -267,9 +361,10 @@ class AvroTypeConverter:
         for union_element in field_props:
             # Propagate parent avro_type to compatible union elements
             if parent_avro_type is not None and self._should_propagate_avro_type(union_element, parent_avro_type):
-                # Create a deep copy to avoid modifying the original
-                union_element = deepcopy(union_element)
-                union_element["avro_type"] = parent_avro_type
+                # Create a copy to avoid modifying the original
+                union_element = {**union_element, "avro_type": parent_avro_type}
+                if parent_fixed_size is not None:
+                    union_element["avro_fixed_size"] = parent_fixed_size
             
             t = self._get_avro_type_dict(union_element)
             avro_type_dict["type"].append(t["type"])
@@ -0,0 +1,105 @@
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastavro import reader
+
+from pydantic_avro.binary import AsyncOcfWriter, avro_decode_stream, iter_avro_models
+from pydantic_avro.binary.models import model_discriminators
+from tests.test_binary import EVENTS, Country, Envelope, Event, Variants, parse, write_ocf
+
+
+class AsyncReader:
+    """Mimics asyncio.StreamReader"""
+
+    def __init__(self, data: bytes):
+        self._fo = io.BytesIO(data)
+
+    async def read(self, n: int) -> bytes:
+        await asyncio.sleep(0)
+        return self._fo.read(n)
+
+
+class AsyncSink:
+    """Mimics an aiofiles file"""
+
+    def __init__(self):
+        self.fo = io.BytesIO()
+
+    async def write(self, data: bytes) -> None:
+        await asyncio.sleep(0)
+        self.fo.write(data)
+
+
+async def chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        await asyncio.sleep(0)
+        yield data[i : i + size]
+
+
+async def collect(stream):
+    return [instance async for instance in stream]
+
+
+@pytest.mark.parametrize("codec", ["null", "deflate"])
+def test_avro_decode_stream(codec):
+    data = write_ocf(Event, EVENTS, codec=codec, block_size=1000).getvalue()
+    assert asyncio.run(collect(avro_decode_stream(Event, chunks(data, 333)))) == EVENTS
+    assert asyncio.run(collect(avro_decode_stream(Event, AsyncReader(data), chunk_size=500, max_pending=1))) == EVENTS
+
+
+def test_avro_decode_stream_filters_and_executor():
+    data = write_ocf(Event, EVENTS, block_size=1000).getvalue()
+    with ThreadPoolExecutor(2) as executor:
+        stream = avro_decode_stream(Event, chunks(data, 4096), filters=[("country", "==", "BE")], executor=executor)
+        result = asyncio.run(collect(stream))
+    assert result == [e for e in EVENTS if e.country == Country.BE]
+
+
+def test_avro_decode_stream_truncated():
+    data = write_ocf(Event, EVENTS).getvalue()
+    with pytest.raises(EOFError):
+        asyncio.run(collect(avro_decode_stream(Event, chunks(data[:-1], 1000))))
+
+
+@pytest.mark.parametrize("codec", ["null", "deflate"])
+def test_async_ocf_writer(codec):
+    sink = AsyncSink()
+
+    async def write():
+        async with AsyncOcfWriter(sink, Event.avro_schema(), codec=codec, block_records=30, max_pending=2) as writer:
+            await writer.write_many(EVENTS)
+
+    asyncio.run(write())
+    sink.fo.seek(0)
+    assert [parse(Event, record) for record in reader(sink.fo)] == EVENTS
+    sink.fo.seek(0)
+    assert list(iter_avro_models(Event, sink.fo)) == EVENTS
+
+
+def test_async_ocf_writer_discriminated_union():
+    sink = AsyncSink()
+    envelopes = [Envelope(payload=Variants[i % 40](kind=f"v{i % 40}", value=i)) for i in range(100)]
+
+    async def write():
+        async with AsyncOcfWriter(
+            sink, Envelope.avro_schema(), block_records=30, discriminators=model_discriminators(Envelope)
+        ) as writer:
+            await writer.write_many(envelopes)
+
+    asyncio.run(write())
+    sink.fo.seek(0)
+    assert list(iter_avro_models(Envelope, sink.fo)) == envelopes
+
+
+def test_async_ocf_writer_empty():
+    sink = AsyncSink()
+
+    async def write():
+        async with AsyncOcfWriter(sink, Event.avro_schema()):
+            pass
+
+    asyncio.run(write())
+    sink.fo.seek(0)
+    assert list(reader(sink.fo)) == []
@@ -0,0 +1,547 @@
+import enum
+import io
+import math
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List, Literal, Optional, Type, Union
+from uuid import UUID, uuid4
+
+import pytest
+from fastavro import parse_schema
+from fastavro import reader as fastavro_reader
+from fastavro import schemaless_writer, writer
+from pydantic import Field, create_model
+
+from pydantic_avro.base import AvroBase
+from pydantic_avro.binary import (
+    OcfReader,
+    OcfStreamParser,
+    compile_decoder,
+    compile_encoder,
+    compile_skipper,
+    iter_avro_models,
+    read_columns,
+    write_avro_models,
+)
+from pydantic_avro.binary.models import model_discriminators
+from pydantic_avro.binary.size import SizeEstimator, estimate_size
+from pydantic_avro.to_avro.config import PYDANTIC_V2
+
+
+def dump(obj: AvroBase):
+    return obj.model_dump() if PYDANTIC_V2 else obj.dict()
+
+
+def parse(model: Type[AvroBase], data: dict):
+    return model.model_validate(data) if PYDANTIC_V2 else model.parse_obj(data)
+
+
+def write_ocf(model: Type[AvroBase], records: List[AvroBase], codec: str = "null", block_size: int = 16000):
+    fo = io.BytesIO()
+    writer(fo, parse_schema(model.avro_schema()), [dump(r) for r in records], codec=codec, sync_interval=block_size)
+    fo.seek(0)
+    return fo
+
+
+class Country(str, enum.Enum):
+    NL = "NL"
+    BE = "BE"
+    DE = "DE"
+
+
+class Address(AvroBase):
+    street: str
+    number: int
+
+
+class Event(AvroBase):
+    id: UUID
+    name: str
+    country: Country
+    amount: float
+    count: int = Field(..., ge=0, le=1000)
+    created: datetime
+    created_millis: datetime = Field(..., avro_type="timestamp-millis")
+    day: date
+    at: time
+    active: bool
+    payload: bytes
+    tags: List[str]
+    attributes: Dict[str, int]
+    address: Address
+    previous: Optional[Address] = None
+    comment: Optional[str] = None
+
+
+def make_event(i: int) -> Event:
+    return Event(
+        id=uuid4(),
+        name=f"event-{i}",
+        country=[Country.NL, Country.BE, Country.DE][i % 3],
+        amount=i * 1.5,
+        count=i % 1000,
+        created=datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=i),
+        created_millis=datetime(2024, 1, 1, 0, 0, 0, 123000, tzinfo=timezone.utc),
+        day=date(2024, 1, 1) + timedelta(days=i),
+        at=time(12, 30, 15, 250),
+        active=i % 2 == 0,
+        payload=bytes([i % 256]) * 3,
+        tags=[f"t{j}" for j in range(i % 4)],
+        attributes={f"k{j}": j for j in range(i % 3)},
+        address=Address(street="Main", number=i),
+        previous=Address(street="Old", number=i) if i % 5 == 0 else None,
+        comment="note" if i % 7 == 0 else None,
+    )
+
+
+EVENTS = [make_event(i) for i in range(200)]
+
+
+def test_decoder_matches_fastavro():
+    schema = Event.avro_schema()
+    decode = compile_decoder(schema)
+    skip = compile_skipper(schema)
+    for event in EVENTS[:20]:
+        fo = io.BytesIO()
+        schemaless_writer(fo, parse_schema(schema), dump(event))
+        data = fo.getvalue()
+        record, pos = decode(data, 0)
+        assert pos == len(data)
+        assert skip(data, 0) == len(data)
+        assert parse(Event, record) == event
+
+
+def test_decoder_primitives():
+    assert compile_decoder("long")(b"\x01", 0) == (-1, 1)
+    assert compile_decoder("long")(b"\x80\x01", 0) == (64, 2)
+    assert compile_decoder("string")(b"\x06foo", 0) == ("foo", 4)
+    assert compile_decoder(["null", "boolean"])(b"\x02\x01", 0) == (True, 2)
+    assert compile_decoder({"type": "fixed", "name": "F", "size": 2})(b"ab", 0) == (b"ab", 2)
+    decimal_schema = {"type": "bytes", "logicalType": "decimal", "precision": 5, "scale": 2}
+    assert compile_decoder(decimal_schema)(b"\x04\xff\x85", 0) == (Decimal("-1.23"), 3)
+
+
+def test_decoder_recursive_record():
+    schema = {
+        "type": "record",
+        "name": "Node",
+        "fields": [{"name": "value", "type": "long"}, {"name": "next", "type": ["null", "Node"]}],
+    }
+    datum = {"value": 1, "next": {"value": 2, "next": None}}
+    fo = io.BytesIO()
+    schemaless_writer(fo, parse_schema(schema), datum)
+    assert compile_decoder(schema)(fo.getvalue(), 0)[0] == datum
+    assert compile_skipper(schema)(fo.getvalue(), 0) == len(fo.getvalue())
+
+
+@pytest.mark.parametrize("codec", ["null", "deflate"])
+def test_ocf_reader(codec):
+    reader = OcfReader(write_ocf(Event, EVENTS, codec=codec, block_size=1000))
+    assert reader.codec == codec
+    assert reader.schema["name"].endswith("Event")
+    blocks = list(reader.iter_blocks())
+    assert len(blocks) > 1
+    assert sum(block.num_records for block in blocks) == len(EVENTS)
+
+
+def test_ocf_reader_invalid_file():
+    with pytest.raises(ValueError, match="Not an avro object container file"):
+        OcfReader(io.BytesIO(b"nope"))
+
+
+def test_iter_avro_models():
+    assert list(iter_avro_models(Event, write_ocf(Event, EVENTS, block_size=1000))) == EVENTS
+
+
+@pytest.mark.parametrize(
+    "filters,expected",
+    [
+        ([("country", "==", Country.NL)], lambda e: e.country == Country.NL),
+        ([("country", "in", ["BE", "DE"])], lambda e: e.country in (Country.BE, Country.DE)),
+        ([("name", "==", "event-42")], lambda e: e.name == "event-42"),
+        ([("name", ">=", "event-5")], lambda e: e.name >= "event-5"),
+        ([("count", ">", 10), ("count", "<=", 20)], lambda e: 10 < e.count <= 20),
+        ([("amount", "<", 3.0)], lambda e: e.amount < 3.0),
+        ([("active", "==", True), ("count", "<", 10)], lambda e: e.active and e.count < 10),
+        (
+            [("created", ">=", datetime(2024, 1, 1, 1, tzinfo=timezone.utc))],
+            lambda e: e.created >= datetime(2024, 1, 1, 1, tzinfo=timezone.utc),
+        ),
+        ([("day", "<", date(2024, 1, 10))], lambda e: e.day < date(2024, 1, 10)),
+        ([("comment", "==", None)], lambda e: e.comment is None),
+        ([("comment", "==", "note")], lambda e: e.comment == "note"),
+        ([("comment", ">", "a")], lambda e: e.comment is not None),
+        ([("previous", "!=", None)], lambda e: e.previous is not None),
+        ([("address", "==", {"street": "Main", "number": 3})], lambda e: e.address.number == 3),
+        ([("payload", "==", b"\x05\x05\x05")], lambda e: e.payload == b"\x05\x05\x05"),
+    ],
+)
+def test_iter_avro_models_filters(filters, expected):
+    result = list(iter_avro_models(Event, write_ocf(Event, EVENTS, block_size=1000), filters=filters))
+    assert result == [e for e in EVENTS if expected(e)]
+    assert result
+
+
+def test_iter_avro_models_filter_errors():
+    with pytest.raises(ValueError, match="do not exist"):
+        list(iter_avro_models(Event, write_ocf(Event, EVENTS), filters=[("unknown", "==", 1)]))
+    with pytest.raises(ValueError, match="not supported"):
+        list(iter_avro_models(Event, write_ocf(Event, EVENTS), filters=[("count", "~", 1)]))
+    with pytest.raises(ValueError, match="not a symbol"):
+        list(iter_avro_models(Event, write_ocf(Event, EVENTS), filters=[("country", "==", "FR")]))
+
+
+def test_encoder_matches_fastavro():
+    schema = Event.avro_schema()
+    encode = compile_encoder(schema)
+    for event in EVENTS[:20]:
+        fo = io.BytesIO()
+        schemaless_writer(fo, parse_schema(schema), dump(event))
+        buf = bytearray()
+        encode(buf, dump(event))
+        assert bytes(buf) == fo.getvalue()
+
+
+def test_encoder_errors():
+    with pytest.raises(ValueError, match="does not match any type of union"):
+        compile_encoder(["null", "long"])(bytearray(), "nope")
+    with pytest.raises(ValueError, match="is missing"):
+        compile_encoder(Address.avro_schema())(bytearray(), {"street": "Main"})
+    with pytest.raises(ValueError, match="not a symbol"):
+        compile_encoder({"type": "enum", "name": "E", "symbols": ["A"]})(bytearray(), "B")
+
+
+def test_union_dispatch_matches_fastavro():
+    schema = [
+        "null",
+        "boolean",
+        "long",
+        "double",
+        {"type": "enum", "name": "Color", "symbols": ["RED", "GREEN"]},
+        "string",
+        {"type": "fixed", "name": "Hash", "size": 4},
+        "bytes",
+        {"type": "record", "name": "Point", "fields": [{"name": "x", "type": "long"}]},
+        {"type": "array", "items": "long"},
+        {"type": "long", "logicalType": "timestamp-micros"},
+    ]
+    values = [None, True, 3, 2.5, "RED", Country.NL, "text", b"abcd", b"abc", {"x": 1}, [1, 2], datetime(2024, 1, 1)]
+    encode = compile_encoder(schema)
+    # The second pass uses the branches selected by type in the first pass
+    for value in values + values:
+        fo = io.BytesIO()
+        schemaless_writer(fo, parse_schema(schema), value)
+        buf = bytearray()
+        encode(buf, value)
+        assert bytes(buf) == fo.getvalue(), value
+
+
+Variants = [
+    create_model(f"Variant{i}", __base__=AvroBase, kind=(Literal[f"v{i}"], ...), value=(int, ...)) for i in range(40)
+]
+
+
+class Envelope(AvroBase):
+    payload: Union[tuple(Variants)] = Field(..., discriminator="kind")  # type: ignore[valid-type]
+
+
+def test_discriminated_union_dispatch():
+    assert model_discriminators(Envelope)["Variant7"] == ("kind", "v7")
+    envelopes = [Envelope(payload=Variants[i % 40](kind=f"v{i % 40}", value=i)) for i in range(100)]
+    fo = io.BytesIO()
+    write_avro_models(Envelope, fo, envelopes)
+    fo.seek(0)
+    # The variants all have the same fields, so only the discriminator tells them apart
+    assert list(iter_avro_models(Envelope, fo)) == envelopes
+
+
+@pytest.mark.parametrize("codec", ["null", "deflate"])
+def test_write_avro_models(codec):
+    fo = io.BytesIO()
+    write_avro_models(Event, fo, EVENTS, codec=codec, block_size=1000)
+    fo.seek(0)
+    assert [parse(Event, r) for r in fastavro_reader(fo)] == EVENTS
+    fo.seek(0)
+    assert list(iter_avro_models(Event, fo)) == EVENTS
+
+
+def test_ocf_stream_parser():
+    data = write_ocf(Event, EVENTS, codec="deflate", block_size=1000).getvalue()
+    parser = OcfStreamParser()
+    blocks = []
+    for i in range(0, len(data), 100):
+        blocks.extend(parser.feed(data[i : i + 100]))
+    parser.close()
+    assert parser.codec == "deflate"
+    assert [b.num_records for b in blocks] == [b.num_records for b in OcfReader(io.BytesIO(data)).iter_blocks()]
+
+    parser = OcfStreamParser()
+    parser.feed(data[:-3])
+    with pytest.raises(EOFError, match="Truncated"):
+        parser.close()
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        {"type": "bytes", "logicalType": "decimal", "precision": 38, "scale": 4},
+        {"type": "fixed", "name": "Amount", "size": 16, "logicalType": "decimal", "precision": 38, "scale": 4},
+    ],
+)
+def test_decimal_matches_fastavro(schema):
+    encode = compile_encoder(schema)
+    decode = compile_decoder(schema)
+    for value in ["0", "-1.5", "12345.6789", "-9999999999999999999999999999999999.9999", "1E+3"]:
+        fo = io.BytesIO()
+        schemaless_writer(fo, parse_schema(schema), Decimal(value))
+        buf = bytearray()
+        encode(buf, Decimal(value))
+        assert bytes(buf) == fo.getvalue()
+        assert decode(bytes(buf), 0) == (Decimal(value), len(buf))
+
+
+class Prices(AvroBase):
+    low: Decimal = Field(..., avro_type="decimal", avro_fixed_size=8, max_digits=10, decimal_places=2)
+    high: Decimal = Field(..., avro_type="decimal", avro_fixed_size=8, max_digits=10, decimal_places=2)
+
+
+def test_shared_fixed_decimals():
+    schema = Prices.avro_schema()
+    # The second field refers to the fixed of the first by name
+    assert isinstance(schema["fields"][1]["type"], str)
+    prices = [Prices(low=Decimal("-1.25"), high=Decimal("12345678.99")), Prices(low=Decimal(0), high=Decimal("0.01"))]
+    fo = io.BytesIO()
+    write_avro_models(Prices, fo, prices)
+    fo.seek(0)
+    assert [Prices(**record) for record in fastavro_reader(fo)] == prices
+    fo = io.BytesIO()
+    writer(fo, parse_schema(schema), [dump(p) for p in prices])
+    fo.seek(0)
+    assert list(iter_avro_models(Prices, fo)) == prices
+
+
+class OptionalPrice(AvroBase):
+    price: Optional[Decimal] = Field(None, avro_type="decimal", avro_fixed_size=8, max_digits=10, decimal_places=2)
+
+
+def test_optional_fixed_decimal():
+    prices = [OptionalPrice(price=Decimal("1.25")), OptionalPrice(), OptionalPrice(price=Decimal("-99999999.99"))]
+    fo = io.BytesIO()
+    write_avro_models(OptionalPrice, fo, prices)
+    fo.seek(0)
+    assert [OptionalPrice(**record) for record in fastavro_reader(fo)] == prices
+    fo.seek(0)
+    assert list(iter_avro_models(OptionalPrice, fo)) == prices
+
+
+def test_decimal_errors():
+    with pytest.raises(ValueError, match="more than 2 decimal places"):
+        compile_encoder({"type": "bytes", "logicalType": "decimal", "precision": 5, "scale": 2})(
+            bytearray(), Decimal("1.234")
+        )
+    fixed = {"type": "fixed", "name": "Small", "size": 1, "logicalType": "decimal", "precision": 2, "scale": 0}
+    with pytest.raises(ValueError, match="does not fit in 1 bytes"):
+        compile_encoder(fixed)(bytearray(), Decimal("300"))
+
+
+def test_zero_copy_decoding():
+    schema = {
+        "type": "record",
+        "name": "Hashes",
+        "fields": [
+            {"name": "id", "type": {"type": "fixed", "name": "Id", "size": 16}},
+            {"name": "digest", "type": "bytes"},
+            {"name": "parent", "type": ["null", "Id"]},
+        ],
+    }
+    records = [
+        {"id": bytes([i]) * 16, "digest": bytes([i]) * i, "parent": None if i % 2 else bytes(16)} for i in range(50)
+    ]
+    fo = io.BytesIO()
+    writer(fo, parse_schema(schema), records)
+
+    fo.seek(0)
+    decoded = list(OcfReader(fo, zero_copy=True))
+    assert all(isinstance(r["id"], memoryview) and isinstance(r["digest"], memoryview) for r in decoded)
+    assert [{k: v if v is None else bytes(v) for k, v in r.items()} for r in decoded] == records
+
+    datum = io.BytesIO()
+    schemaless_writer(datum, parse_schema(schema), records[3])
+    record, pos = compile_decoder(schema, zero_copy=True)(datum.getvalue(), 0)
+    assert isinstance(record["id"], memoryview) and bytes(record["id"]) == records[3]["id"]
+    assert pos == len(datum.getvalue())
+
+
+TIMESTAMP_SCHEMA = {
+    "type": "record",
+    "name": "Timestamped",
+    "fields": [
+        {"name": "id", "type": "long"},
+        {"name": "at", "type": {"type": "long", "logicalType": "timestamp-micros"}},
+        {"name": "day", "type": ["null", {"type": "int", "logicalType": "date"}]},
+        {"name": "name", "type": "string"},
+    ],
+}
+TIMESTAMPED = [
+    {
+        "id": i,
+        "at": datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=i),
+        "day": None if i % 3 == 0 else date(2024, 1, 1) + timedelta(days=i),
+        "name": f"event {i}",
+    }
+    for i in range(20)
+]
+
+
+def write_timestamped() -> io.BytesIO:
+    fo = io.BytesIO()
+    writer(fo, parse_schema(TIMESTAMP_SCHEMA), TIMESTAMPED)
+    fo.seek(0)
+    return fo
+
+
+def test_raw_timestamps():
+    decoded = list(OcfReader(write_timestamped(), raw_timestamps=True))
+    assert [r["at"] for r in decoded] == [1_704_067_200_000_000 + i * 1_000_000 for i in range(20)]
+    assert [r["day"] for r in decoded] == [None if i % 3 == 0 else 19723 + i for i in range(20)]
+
+    # The encoder writes ints as is
+    buf = bytearray()
+    compile_encoder(TIMESTAMP_SCHEMA)(buf, decoded[1])
+    assert compile_decoder(TIMESTAMP_SCHEMA)(bytes(buf), 0)[0] == TIMESTAMPED[1]
+
+
+def test_read_columns():
+    columns = read_columns(write_timestamped())
+    assert columns == {name: [e[name] for e in TIMESTAMPED] for name in ("id", "at", "day", "name")}
+
+    columns = read_columns(write_timestamped(), fields=["name", "day"], filters=[("id", ">=", 17)], raw_timestamps=True)
+    assert columns == {"name": ["event 17", "event 18", "event 19"], "day": [19740, None, 19742]}
+
+    with pytest.raises(ValueError, match="do not exist"):
+        read_columns(write_timestamped(), fields=["missing"])
+
+
+def test_read_columns_numpy():
+    np = pytest.importorskip("numpy")
+    columns = read_columns(write_timestamped(), numpy=True)
+    assert columns["id"].dtype == np.int64 and columns["id"].tolist() == list(range(20))
+    assert columns["at"].dtype == np.dtype("datetime64[us]")
+    assert columns["at"][1] == np.datetime64("2024-01-01T00:00:01")
+    assert columns["day"].dtype == np.dtype("datetime64[D]")
+    assert np.isnat(columns["day"][0]) and columns["day"][1] == np.datetime64("2024-01-02")
+    assert columns["name"] == [e["name"] for e in TIMESTAMPED]
+
+
+def test_read_columns_numpy_lists():
+    np = pytest.importorskip("numpy")
+    schema = {
+        "type": "record",
+        "name": "Visits",
+        "fields": [
+            {"name": "at", "type": {"type": "long", "logicalType": "timestamp-micros"}},
+            {"name": "days", "type": {"type": "array", "items": {"type": "int", "logicalType": "date"}}},
+            {"name": "first", "type": ["null", "string", {"type": "int", "logicalType": "date"}]},
+        ],
+    }
+    records = [
+        {"at": TIMESTAMPED[i]["at"], "days": [date(2024, 1, 1)] * i, "first": date(2024, 2, i + 1)} for i in range(3)
+    ]
+    fo = io.BytesIO()
+    writer(fo, parse_schema(schema), records)
+
+    # Only the columns that become arrays are read as raw timestamps
+    fo.seek(0)
+    columns = read_columns(fo, numpy=True)
+    assert columns["at"].dtype == np.dtype("datetime64[us]")
+    assert columns["days"] == [r["days"] for r in records]
+    assert columns["first"] == [r["first"] for r in records]
+    fo.seek(0)
+    columns = read_columns(fo, numpy=True, raw_timestamps=True)
+    assert columns["at"].dtype == np.dtype("datetime64[us]")
+    assert columns["days"] == [[], [19723], [19723, 19723]]
+
+
+def test_intern_strings():
+    schema = {
+        "type": "record",
+        "name": "Row",
+        "fields": [
+            {"name": "name", "type": "string"},
+            {"name": "status", "type": ["null", "string"]},
+            {"name": "tags", "type": {"type": "array", "items": "string"}},
+        ],
+    }
+    records = [{"name": f"row-{i}", "status": ["open", "closed", None][i % 3], "tags": ["a", "b"]} for i in range(9)]
+    fo = io.BytesIO()
+    writer(fo, parse_schema(schema), records)
+    fo.seek(0)
+    decoded = list(OcfReader(fo, intern_strings={"Row.status": 2, "tags": 10}))
+    assert decoded == records
+    assert decoded[0]["status"] is decoded[3]["status"]
+    assert decoded[0]["tags"][0] is decoded[1]["tags"][0]
+    assert decoded[0]["name"] is not decoded[3]["name"]
+
+    with pytest.raises(ValueError, match="Only strings can be interned, field 'Event.count' is of type 'int'"):
+        OcfReader(write_ocf(Event, EVENTS[:1]), intern_strings={"count": 10})
+
+    fo = io.BytesIO()
+    write_avro_models(Event, fo, EVENTS)
+    fo.seek(0)
+    events = list(iter_avro_models(Event, fo, intern_strings={"Address.street": 10}))
+    assert events == EVENTS
+    assert events[0].address.street is events[1].address.street
+
+
+def test_enum_types():
+    fo = write_ocf(Event, EVENTS[:3])
+    decoded = list(OcfReader(fo, enum_types=[Country]))
+    assert [record["country"] for record in decoded] == [Country.NL, Country.BE, Country.DE]
+    assert all(type(record["country"]) is Country for record in decoded)
+
+    class Other(str, enum.Enum):
+        NL = "NL"
+
+    Other.__name__ = "Country"
+    with pytest.raises(ValueError, match=r"Symbols \['BE', 'DE'\] of enum 'Country' are not in Country"):
+        compile_decoder(Event.avro_schema(), enum_types=[Other])
+
+
+def test_estimate_size():
+    schema = {
+        "type": "record",
+        "name": "Node",
+        "fields": [
+            {"name": "flag", "type": "boolean"},
+            {"name": "score", "type": "double"},
+            {"name": "id", "type": {"type": "fixed", "name": "Id", "size": 16}},
+            {"name": "count", "type": "long"},
+            {"name": "label", "type": ["null", "string"]},
+            {"name": "children", "type": {"type": "array", "items": "Node"}},
+        ],
+    }
+    assert estimate_size(schema) == 1 + 8 + 16 + 10 + 1 + 17 + 2
+
+    estimator = SizeEstimator(schema)
+    assert estimator.hint == estimate_size(schema)
+    estimator.observe(100, 3)
+    assert estimator.hint == 34
+
+
+def test_size_hint_and_block_size():
+    class Sized(AvroBase):
+        name: str
+        values: List[int]
+
+    assert Sized.avro_size_hint() == 17 + 2 + 4 * 10
+    instances = [Sized(name="x" * (i % 50), values=list(range(i % 7))) for i in range(2000)]
+    fo = io.BytesIO()
+    write_avro_models(Sized, fo, instances, block_size=2000)
+
+    fo.seek(0)
+    blocks = list(OcfReader(fo).iter_blocks())
+    hint = Sized.avro_size_hint()
+    assert hint == math.ceil(sum(len(b.data) for b in blocks) / len(instances))
+    # Blocks end before the next record is expected to exceed the block size
+    assert all(len(b.data) <= 2000 + hint for b in blocks)
+    assert all(len(b.data) > 2000 - 2 * hint for b in blocks[:-1])
@@ -0,0 +1,62 @@
+import io
+import zlib
+
+import pytest
+from fastavro import reader
+
+from pydantic_avro.binary import OcfReader, iter_avro_models, register_codec, write_avro_models
+from pydantic_avro.binary.codecs import CODECS, get_codec
+from tests.test_binary import EVENTS, Event, parse, write_ocf
+
+
+def optional_codecs():
+    codecs = ["snappy", "zstandard"]
+    return [pytest.param(c, marks=pytest.mark.skipif(not _installed(c), reason=f"{c} not installed")) for c in codecs]
+
+
+def _installed(name: str) -> bool:
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+@pytest.mark.parametrize("codec", ["null", "deflate", "bzip2", "xz", *optional_codecs()])
+@pytest.mark.parametrize("compression_workers", [0, 2])
+def test_write_with_codec(codec, compression_workers):
+    fo = io.BytesIO()
+    write_avro_models(Event, fo, EVENTS, codec=codec, block_size=1000, compression_workers=compression_workers)
+    fo.seek(0)
+    assert [parse(Event, record) for record in reader(fo)] == EVENTS
+    fo.seek(0)
+    assert OcfReader(fo).codec == codec
+    fo.seek(0)
+    assert list(iter_avro_models(Event, fo)) == EVENTS
+
+
+@pytest.mark.parametrize("codec", ["bzip2", "xz", *optional_codecs()])
+def test_read_with_codec(codec):
+    assert list(iter_avro_models(Event, write_ocf(Event, EVENTS, codec=codec, block_size=1000))) == EVENTS
+
+
+def test_unsupported_codec():
+    with pytest.raises(ValueError, match="Unsupported codec 'lz4'"):
+        write_avro_models(Event, io.BytesIO(), EVENTS, codec="lz4")
+
+
+@pytest.mark.skipif(_installed("zstandard"), reason="zstandard installed")
+def test_missing_optional_codec_package():
+    with pytest.raises(ImportError, match="requires the 'zstandard' package"):
+        get_codec("zstandard")
+
+
+def test_register_codec():
+    register_codec("zlib-test", zlib.compress, zlib.decompress)
+    try:
+        fo = io.BytesIO()
+        write_avro_models(Event, fo, EVENTS, codec="zlib-test", block_size=1000)
+        fo.seek(0)
+        assert list(iter_avro_models(Event, fo)) == EVENTS
+    finally:
+        del CODECS["zlib-test"]
@@ -0,0 +1,78 @@
+import io
+from pathlib import Path
+
+import pytest
+from fastavro import reader
+
+from pydantic_avro import __main__ as main_module
+from pydantic_avro.binary import OcfReader, concat_ocf, write_avro_models
+from pydantic_avro.binary.concat import concat_ocf_files
+from tests.test_binary import EVENTS, Address, Event
+
+
+def write_parts(tmp_path, codec="deflate"):
+    paths = []
+    for i in range(0, len(EVENTS), 40):
+        path = tmp_path / f"part-{i:03}.avro"
+        with open(path, "wb") as fo:
+            write_avro_models(Event, fo, EVENTS[i : i + 40], codec=codec, block_size=1000)
+        paths.append(str(path))
+    return paths
+
+
+def block_sizes(data: bytes):
+    return [block.num_records for block in OcfReader(io.BytesIO(data)).iter_blocks()]
+
+
+def test_concat_copies_blocks(tmp_path):
+    paths = write_parts(tmp_path)
+    out = io.BytesIO()
+    assert concat_ocf(paths, out) == len(EVENTS)
+    out.seek(0)
+    assert [Event(**record) for record in reader(out)] == EVENTS
+    parts = [block_sizes(Path(path).read_bytes()) for path in paths]
+    assert block_sizes(out.getvalue()) == [size for sizes in parts for size in sizes]
+    assert OcfReader(io.BytesIO(out.getvalue())).codec == "deflate"
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_concat_compacts_and_recompresses(tmp_path, workers):
+    paths = write_parts(tmp_path)
+    out = io.BytesIO()
+    concat_ocf(paths, out, codec="bzip2", block_size=16000, compression_workers=workers)
+    out.seek(0)
+    assert [Event(**record) for record in reader(out)] == EVENTS
+    assert len(block_sizes(out.getvalue())) < len(block_sizes(Path(paths[0]).read_bytes())) * len(paths)
+    assert OcfReader(io.BytesIO(out.getvalue())).codec == "bzip2"
+
+
+def test_concat_recompresses_blocks(tmp_path):
+    paths = write_parts(tmp_path)
+    out = io.BytesIO()
+    # The blocks are kept when they are only compressed again
+    concat_ocf([io.BytesIO(Path(path).read_bytes()) for path in paths], out, codec="null")
+    parts = [block_sizes(Path(path).read_bytes()) for path in paths]
+    assert block_sizes(out.getvalue()) == [size for sizes in parts for size in sizes]
+
+
+def test_concat_errors(tmp_path):
+    paths = write_parts(tmp_path)
+    other = tmp_path / "other.avro"
+    with open(other, "wb") as fo:
+        write_avro_models(Address, fo, [Address(street="Main", number=1)])
+    with pytest.raises(ValueError, match="other.avro differs from the schema of the first file"):
+        concat_ocf([*paths, str(other)], io.BytesIO())
+    with pytest.raises(ValueError, match="No files"):
+        concat_ocf([], io.BytesIO())
+    with pytest.raises(ValueError, match="is one of the files"):
+        concat_ocf_files(paths, paths[0])
+
+
+def test_main_concat_ocf(tmp_path):
+    write_parts(tmp_path)
+    output = tmp_path / "all.avro"
+    main_module.main(
+        ["concat_ocf", "--input", str(tmp_path / "part-*.avro"), "--output", str(output), "--workers", "2"]
+    )
+    with open(output, "rb") as fo:
+        assert [Event(**record) for record in reader(fo)] == EVENTS
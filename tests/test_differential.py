@@ -0,0 +1,301 @@
+"""Differential tests of the native encoding and decoding against fastavro and the reference avro library.
+
+Schemas are generated at random, covering nested records, enums, fixed, arrays, maps, logical types and unions of
+these, including discriminated unions of records, and datums for them with the DataGenerator. Run this module to print
+the speed of fastavro and avro relative to the native paths: python -m tests.test_differential
+"""
+
+import io
+import json
+import random
+import timeit
+from typing import Any, Callable, Dict, List, Tuple
+from uuid import UUID
+
+import avro.datafile
+import avro.io
+import avro.schema
+import fastavro
+import pytest
+from fastavro.schema import to_parsing_canonical_form
+
+from pydantic_avro.binary import OcfReader, OcfWriter, compile_decoder, compile_encoder
+from pydantic_avro.binary.generate import DataGenerator
+from tests.test_binary import Event
+from tests.test_from_avro_serializers import SCHEMA
+
+PRIMITIVES = ["boolean", "int", "long", "float", "double", "string", "bytes"]
+LOGICAL_TYPES = [
+    {"type": "long", "logicalType": "timestamp-millis"},
+    {"type": "long", "logicalType": "timestamp-micros"},
+    {"type": "int", "logicalType": "date"},
+    {"type": "int", "logicalType": "time-millis"},
+    {"type": "long", "logicalType": "time-micros"},
+    {"type": "string", "logicalType": "uuid"},
+    {"type": "bytes", "logicalType": "decimal", "precision": 20, "scale": 4},
+    {"type": "fixed", "size": 10, "logicalType": "decimal", "precision": 20, "scale": 4},
+]
+# Unions of distinct types, as avro does not allow two branches of the same type
+UNIONS = [["string", "long"], ["long", "string", "boolean"], ["double", "string"], ["bytes"], []]
+
+
+def random_schema(rng: random.Random, name: str, depth: int = 0) -> dict:
+    """Returns a random record schema, with nested types up to a depth of 3"""
+    fields = []
+    for i in range(rng.randint(1, 8)):
+        fields.append({"name": f"f{i}", "type": random_type(rng, f"{name}_{i}", depth)})
+    return {"type": "record", "name": name, "fields": fields}
+
+
+def random_type(rng: random.Random, name: str, depth: int) -> Any:
+    kind = rng.choice(["primitive", "primitive", "logical", "optional", "union", "enum", "fixed", "nested"])
+    if kind == "primitive" or (kind == "nested" and depth >= 3):
+        return rng.choice(PRIMITIVES)
+    if kind == "logical":
+        return random_logical(rng, name)
+    if kind == "optional":
+        inner = random_type(rng, name, depth + 1) if depth < 3 else "string"
+        # Unions can not be nested, the unions generated here already have null
+        return inner if isinstance(inner, list) else ["null", inner]
+    if kind == "union":
+        return random_union(rng, name, depth)
+    if kind == "enum":
+        return {"type": "enum", "name": f"{name}_enum", "symbols": [f"S{i}" for i in range(rng.randint(1, 5))]}
+    if kind == "fixed":
+        return {"type": "fixed", "name": f"{name}_fixed", "size": rng.randint(1, 16)}
+    return rng.choice(
+        [
+            lambda: random_schema(rng, f"{name}_record", depth + 1),
+            lambda: {"type": "array", "items": random_type(rng, name, depth + 1)},
+            lambda: {"type": "map", "values": random_type(rng, name, depth + 1)},
+        ]
+    )()
+
+
+def random_logical(rng: random.Random, name: str) -> dict:
+    schema = dict(rng.choice(LOGICAL_TYPES))
+    if schema["type"] == "fixed":
+        schema["name"] = f"{name}_decimal"
+    return schema
+
+
+def random_union(rng: random.Random, name: str, depth: int) -> list:
+    """Returns a union of null, primitives and some of a logical type, an enum, a fixed and records.
+
+    The records are either one record or the variants of a discriminated union, told apart by a single symbol enum
+    like the Literal discriminators of pydantic. The primitives come first, so a long is not written as a date.
+    """
+    branches: List[Any] = ["null", *rng.choice(UNIONS)]
+    extra: List[Any] = []
+    if rng.random() < 0.5:
+        logical = random_logical(rng, name)
+        # A logical type counts as its underlying type, which may only appear once
+        if logical["type"] not in branches:
+            extra.append(logical)
+    # Symbols are strings, fastavro writes them to a uuid branch and avro prefers the enum to a string branch before it,
+    # while the first branch that matches is the one written by the specification. The same goes for fixed and bytes.
+    uuid = any(branch.get("logicalType") == "uuid" for branch in extra)
+    if rng.random() < 0.5 and "string" not in branches and not uuid:
+        extra.append({"type": "enum", "name": f"{name}_enum", "symbols": [f"S{i}" for i in range(rng.randint(1, 5))]})
+    if rng.random() < 0.5 and "bytes" not in branches:
+        extra.append({"type": "fixed", "name": f"{name}_fixed", "size": rng.randint(1, 16)})
+    # avro fails to validate a record against a uuid
+    records = rng.choice([0, 0, 1, 2, 3]) if depth < 3 and not uuid else 0
+    if records == 1:
+        extra.append(random_schema(rng, f"{name}_record", depth + 1))
+    elif records > 1:
+        for i in range(records):
+            variant = f"{name}_V{i}"
+            fields = [
+                {"name": "kind", "type": {"type": "enum", "name": f"{variant}_kind", "symbols": [f"V{i}"]}},
+                {"name": "id", "type": "long"},
+                {"name": f"v{i}", "type": random_type(rng, f"{variant}_0", depth + 1)},
+            ]
+            extra.append({"type": "record", "name": variant, "fields": fields})
+    rng.shuffle(extra)
+    return branches + extra
+
+
+def schema_discriminators(schema: Any) -> Dict[str, Tuple[str, Any]]:
+    """Returns the discriminator property and value by record name of the variants of the discriminated unions"""
+    discriminators = {}
+    if isinstance(schema, list):
+        for branch in schema:
+            discriminators.update(schema_discriminators(branch))
+    elif isinstance(schema, dict):
+        if schema["type"] == "record":
+            kind = schema["fields"][0]["type"]
+            if schema["fields"][0]["name"] == "kind" and isinstance(kind, dict) and len(kind["symbols"]) == 1:
+                discriminators[schema["name"]] = ("kind", kind["symbols"][0])
+            for field in schema["fields"]:
+                discriminators.update(schema_discriminators(field["type"]))
+        elif schema["type"] in ("array", "map"):
+            discriminators.update(schema_discriminators(schema.get("items", schema.get("values"))))
+    return discriminators
+
+
+SCHEMAS = {
+    **{f"random_{seed}": random_schema(random.Random(seed), f"Random{seed}") for seed in range(40)},
+    "event": Event.avro_schema(),
+    "order": SCHEMA,
+}
+
+
+def fastavro_encoder(schema: dict) -> Callable[[Any], bytes]:
+    parsed = fastavro.parse_schema(schema)
+
+    def encode(datum):
+        fo = io.BytesIO()
+        fastavro.schemaless_writer(fo, parsed, datum)
+        return fo.getvalue()
+
+    return encode
+
+
+def avro_encoder(schema: dict) -> Callable[[Any], bytes]:
+    writer = avro.io.DatumWriter(avro.schema.parse(json.dumps(schema)))
+
+    def encode(datum):
+        fo = io.BytesIO()
+        writer.write(datum, avro.io.BinaryEncoder(fo))
+        return fo.getvalue()
+
+    return encode
+
+
+def native_encoder(schema: dict) -> Callable[[Any], bytes]:
+    write = compile_encoder(schema, schema_discriminators(schema))
+
+    def encode(datum):
+        buf = bytearray()
+        write(buf, datum)
+        return bytes(buf)
+
+    return encode
+
+
+def fastavro_decoder(schema: dict) -> Callable[[bytes], Any]:
+    parsed = fastavro.parse_schema(schema)
+    return lambda data: fastavro.schemaless_reader(io.BytesIO(data), parsed, None)
+
+
+def avro_decoder(schema: dict) -> Callable[[bytes], Any]:
+    reader = avro.io.DatumReader(avro.schema.parse(json.dumps(schema)))
+    return lambda data: reader.read(avro.io.BinaryDecoder(io.BytesIO(data)))
+
+
+def native_decoder(schema: dict) -> Callable[[bytes], Any]:
+    read = compile_decoder(schema)
+    return lambda data: read(data, 0)[0]
+
+
+ENCODERS = {"native": native_encoder, "fastavro": fastavro_encoder, "avro": avro_encoder}
+DECODERS = {"native": native_decoder, "fastavro": fastavro_decoder, "avro": avro_decoder}
+
+
+def plain(value: Any) -> Any:
+    """Returns a datum with UUIDs as strings, the avro library only encodes and decodes uuids as strings"""
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, dict):
+        return {k: plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [plain(v) for v in value]
+    return value
+
+
+# Conversion of the datums before they are encoded by a library
+PREPARE: Dict[str, Callable[[Any], Any]] = {"avro": plain}
+
+
+def normalize(schema: Any) -> Any:
+    """Returns a canonical form as JSON value, with {"type": "long"} written as "long" like fastavro does"""
+    if isinstance(schema, list):
+        return [normalize(s) for s in schema]
+    if isinstance(schema, dict):
+        if set(schema) == {"type"} and isinstance(schema["type"], str):
+            return schema["type"]
+        return {k: normalize(v) for k, v in schema.items()}
+    return schema
+
+
+@pytest.mark.parametrize("name", SCHEMAS)
+def test_schemas_agree(name):
+    schema = SCHEMAS[name]
+    from_fastavro = json.loads(to_parsing_canonical_form(fastavro.parse_schema(schema)))
+    from_avro = json.loads(avro.schema.parse(json.dumps(schema)).canonical_form)
+    assert normalize(from_fastavro) == normalize(from_avro)
+    # The native paths read what fastavro writes for the schema, and fastavro reads what they write
+    write, read = native_encoder(schema), native_decoder(schema)
+    fastavro_write, fastavro_read = fastavro_encoder(schema), fastavro_decoder(schema)
+    for datum in DataGenerator(schema, seed=len(name)).records(20):
+        assert read(fastavro_write(datum)) == datum
+        assert fastavro_read(write(datum)) == datum
+
+
+@pytest.mark.parametrize("name", SCHEMAS)
+def test_bytes_agree(name):
+    schema = SCHEMAS[name]
+    datums = DataGenerator(schema, seed=len(name)).records(50)
+    encoders = {library: compile(schema) for library, compile in ENCODERS.items()}
+    decoders = {library: compile(schema) for library, compile in DECODERS.items()}
+    for datum in datums:
+        encoded = {library: encode(PREPARE.get(library, lambda d: d)(datum)) for library, encode in encoders.items()}
+        assert encoded["native"] == encoded["fastavro"] == encoded["avro"], datum
+        decoded = {library: decode(encoded["native"]) for library, decode in decoders.items()}
+        assert decoded["native"] == datum
+        assert decoded["fastavro"] == datum
+        assert plain(datum) == decoded["avro"]
+
+
+@pytest.mark.parametrize("name", ["event", "order", "random_1", "random_2"])
+def test_object_container_files_agree(name):
+    schema = SCHEMAS[name]
+    datums = DataGenerator(schema, seed=1).records(200)
+
+    fo = io.BytesIO()
+    with OcfWriter(fo, schema, codec="deflate", block_size=2000) as writer:
+        writer.write_many(datums)
+    fo.seek(0)
+    assert list(fastavro.reader(fo)) == datums
+    fo.seek(0)
+    assert list(avro.datafile.DataFileReader(fo, avro.io.DatumReader())) == plain(datums)
+
+    fo = io.BytesIO()
+    fastavro.writer(fo, fastavro.parse_schema(schema), datums, codec="deflate", sync_interval=2000)
+    fo.seek(0)
+    assert list(OcfReader(fo)) == datums
+
+
+def speed_ratios(schema: dict, datums: List[Any], repeat: int = 3) -> Dict[str, float]:
+    """Returns the time fastavro and avro take to encode and decode the datums, relative to the native paths"""
+    seconds = {}
+    for operation, compilers in (("encode", ENCODERS), ("decode", DECODERS)):
+        encoded = [native_encoder(schema)(datum) for datum in datums]
+        for library, compile in compilers.items():
+            prepare = PREPARE.get(library, lambda d: d)
+            inputs = [prepare(datum) for datum in datums] if operation == "encode" else encoded
+            run = compile(schema)
+            seconds[(operation, library)] = min(
+                timeit.repeat(lambda: [run(value) for value in inputs], number=1, repeat=repeat)
+            )
+    return {
+        f"{operation}_{library}": seconds[(operation, library)] / seconds[(operation, "native")]
+        for operation, library in seconds
+        if library != "native"
+    }
+
+
+def test_speed_ratios():
+    ratios = speed_ratios(SCHEMAS["event"], DataGenerator(Event, seed=1).records(20), repeat=1)
+    assert set(ratios) == {"encode_fastavro", "encode_avro", "decode_fastavro", "decode_avro"}
+    assert all(ratio > 0 for ratio in ratios.values())
+
+
+if __name__ == "__main__":
+    columns = ["encode_fastavro", "encode_avro", "decode_fastavro", "decode_avro"]
+    print("Time of fastavro and avro relative to the native paths, higher is slower")
+    print(f"{'schema':<12}" + "".join(f"{column:>17}" for column in columns))
+    for name, schema in SCHEMAS.items():
+        ratios = speed_ratios(schema, DataGenerator(schema, seed=1).records(2000))
+        print(f"{name:<12}" + "".join(f"{ratios[column]:>17.2f}" for column in columns))
@@ -488,3 +488,46 @@ class Test(BaseModel):
     pass
 """
     assert output_file.read_text() == expected_output
+
+
+def test_decimal_precision_and_scale():
+    pydantic_code = avsc_to_pydantic(
+        {
+            "name": "Test",
+            "type": "record",
+            "fields": [
+                {"name": "amount", "type": {"type": "bytes", "logicalType": "decimal", "precision": 10, "scale": 2}},
+                {
+                    "name": "total",
+                    "type": [
+                        "null",
+                        {"type": "fixed", "name": "Total", "size": 9, "logicalType": "decimal", "precision": 20},
+                    ],
+                    "default": None,
+                },
+                {"name": "ratio", "type": {"type": "bytes", "logicalType": "decimal"}},
+            ],
+        }
+    )
+
+    assert "    amount: Decimal = Field(..., max_digits=10, decimal_places=2)" in pydantic_code
+    assert "    total: Optional[Decimal] = Field(None, max_digits=20, decimal_places=0)" in pydantic_code
+    assert "    ratio: Decimal\n" in pydantic_code
+
+
+def test_fixed():
+    pydantic_code = avsc_to_pydantic(
+        {
+            "name": "Test",
+            "type": "record",
+            "fields": [
+                {"name": "id", "type": {"type": "fixed", "name": "Hash", "size": 16}},
+                {"name": "parent", "type": ["null", "Hash"], "default": None},
+                {"name": "history", "type": {"type": "array", "items": "Hash"}},
+            ],
+        }
+    )
+
+    assert "    id: bytes = Field(..., min_length=16, max_length=16)" in pydantic_code
+    assert "    parent: Optional[bytes] = Field(None, min_length=16, max_length=16)" in pydantic_code
+    assert "    history: List[bytes]" in pydantic_code
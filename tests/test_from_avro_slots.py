@@ -0,0 +1,68 @@
+import pytest
+
+from pydantic_avro.from_avro.avro_to_pydantic import avsc_to_pydantic
+from pydantic_avro.from_avro.records import SlotsRecord
+from tests.test_from_avro_serializers import SCHEMA, make_order
+
+
+@pytest.fixture(scope="module")
+def generated():
+    namespace: dict = {}
+    exec(avsc_to_pydantic(SCHEMA, serializers=True, slots=True), namespace)
+    return namespace
+
+
+def test_slots_classes_generated():
+    code = avsc_to_pydantic(SCHEMA, slots=True)
+    assert "class OrderRecord(SlotsRecord):" in code
+    assert "__slots__ = ('price',)" in code
+    assert "to_avro_bytes" not in code
+    assert "OrderRecord" not in avsc_to_pydantic(SCHEMA)
+
+
+def test_slots_record_defaults():
+    schema = {
+        "type": "record",
+        "name": "Config",
+        "fields": [
+            {"name": "tags", "type": {"type": "array", "items": "string"}, "default": []},
+            {"name": "name", "type": "string"},
+            {"name": "enabled", "type": "boolean", "default": True},
+        ],
+    }
+    namespace: dict = {}
+    exec(avsc_to_pydantic(schema, slots=True), namespace)
+    first = namespace["ConfigRecord"](name="a")
+    second = namespace["ConfigRecord"](name="b")
+    first.tags.append("x")
+
+    assert second.tags == []
+    assert second.enabled is True
+    assert not hasattr(first, "__dict__")
+    assert first.to_model() == namespace["Config"](tags=["x"], name="a", enabled=True)
+
+
+def test_slots_record_serializers(generated):
+    for i in range(20):
+        order = make_order(generated, i)
+        data = order.to_avro_bytes()
+        record = generated["OrderRecord"].from_avro_bytes(data)
+
+        assert isinstance(record, SlotsRecord)
+        assert all(isinstance(line, generated["LineRecord"]) for line in record.lines)
+        assert record.to_avro_bytes() == data
+        assert record.to_model() == order
+        assert record == generated["OrderRecord"].from_avro_bytes(data)
+
+
+def test_slots_record_repr(generated):
+    assert repr(generated["LineRecord"](price=1.5)) == "LineRecord(price=1.5)"
+    assert generated["LineRecord"](price=1.5) != generated["LineRecord"](price=2.5)
+
+
+def test_slots_record_requires_to_model():
+    class Incomplete(SlotsRecord):
+        __slots__ = ("name",)
+
+    with pytest.raises(TypeError):
+        Incomplete()
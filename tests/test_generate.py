@@ -0,0 +1,80 @@
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Optional
+
+import pytest
+from fastavro import parse_schema
+from fastavro import reader as fastavro_reader
+from fastavro import schemaless_reader
+from pydantic import Field
+
+from pydantic_avro.base import AvroBase
+from pydantic_avro.binary.generate import DataGenerator
+from tests.test_binary import Event
+from tests.test_from_avro_serializers import SCHEMA
+
+
+class Bounded(AvroBase):
+    small: int = Field(..., ge=-3, le=3)
+    positive: Optional[int] = Field(None, gt=0, lt=10)
+    ratio: float = Field(..., ge=0, le=1)
+    code: str = Field(..., min_length=2, max_length=4)
+    items: List[int] = Field(..., max_length=2)
+    created: datetime
+    day: date
+    price: Decimal = Field(..., max_digits=6, decimal_places=2, json_schema_extra={"avro_type": "decimal"})
+
+
+def test_generate_seeded():
+    assert DataGenerator(Event, seed=7).records(50) == DataGenerator(Event, seed=7).records(50)
+    assert DataGenerator(Event, seed=7).encoded(50) == DataGenerator(Event, seed=7).encoded(50)
+    assert DataGenerator(Event, seed=7).records(50) != DataGenerator(Event, seed=8).records(50)
+
+
+def test_generate_respects_bounds():
+    generator = DataGenerator(Bounded, seed=1)
+    for instance in generator.instances(500):
+        assert -3 <= instance.small <= 3
+        assert instance.positive is None or 0 < instance.positive < 10
+        assert 0 <= instance.ratio <= 1
+        assert 2 <= len(instance.code) <= 4
+        assert len(instance.items) <= 2
+        assert abs(instance.price) < 10_000
+
+
+@pytest.mark.parametrize("source", [Event, SCHEMA])
+def test_generate_encoded_matches_records(source):
+    schema = parse_schema(DataGenerator(source).schema)
+    for data in DataGenerator(source, seed=3).encoded(200):
+        fo = io.BytesIO(data)
+        schemaless_reader(fo, schema, None)
+        assert fo.tell() == len(data)
+
+
+def test_generate_from_avsc(tmp_path):
+    path = tmp_path / "order.avsc"
+    path.write_text(json.dumps(SCHEMA))
+    generator = DataGenerator(str(path), seed=5)
+    fo = io.BytesIO()
+    generator.write(fo, 300, codec="deflate")
+    fo.seek(0)
+    assert len(list(fastavro_reader(fo))) == 300
+    with pytest.raises(ValueError, match="only be generated for a model"):
+        generator.instances(1)
+
+
+def test_generate_recursive_and_distinct():
+    schema = {
+        "type": "record",
+        "name": "Tree",
+        "fields": [
+            {"name": "children", "type": {"type": "array", "items": "Tree"}},
+            {"name": "parent", "type": ["null", "Tree"]},
+        ],
+    }
+    assert len(DataGenerator(schema, seed=1).records(5)) == 5
+
+    encoded = DataGenerator(Event, seed=1).encoded(10, distinct=3)
+    assert len(encoded) == 10 and len(set(encoded)) == 3 and encoded[3] == encoded[0]
@@ -0,0 +1,43 @@
+"""Imports are lazy, so importing the package stays fast, the imported modules are checked in a fresh interpreter"""
+
+import json
+import subprocess
+import sys
+from typing import List
+
+
+def import_in_subprocess(statement: str) -> List[str]:
+    """Returns the modules imported after running the statement in a new interpreter"""
+    code = f"import json, sys\n{statement}\nprint(json.dumps(list(sys.modules)))\n"
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def test_import_package_is_lazy():
+    modules = import_in_subprocess("import pydantic_avro")
+    # Only the package itself, no binary serialization, code generation, CLI or dependencies like pydantic
+    loaded = [module for module in modules if module.split(".")[0] in ("pydantic_avro", "pydantic", "pydantic_core")]
+    assert loaded == ["pydantic_avro"]
+
+
+def test_import_binary_is_lazy():
+    modules = import_in_subprocess("from pydantic_avro.binary import iter_avro_models")
+    assert "pydantic_avro.binary.ocf" in modules
+    for module in ["asyncio", "concurrent.futures", "bz2", "lzma", "pydantic_avro.binary.aio"]:
+        assert module not in modules
+
+
+def test_import_cli_is_lazy():
+    modules = import_in_subprocess("import pydantic_avro.__main__")
+    for module in ["pydantic", "pydantic_avro.to_avro", "pydantic_avro.binary.ocf"]:
+        assert module not in modules
+
+
+def test_lazy_attributes():
+    import pydantic_avro
+    import pydantic_avro.binary
+
+    assert "AvroBase" in dir(pydantic_avro)
+    assert "OcfWriter" in dir(pydantic_avro.binary)
+    assert pydantic_avro.from_avro.__name__ == "pydantic_avro.from_avro"
+    assert pydantic_avro.binary.OcfWriter.__name__ == "OcfWriter"
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from pydantic_avro.binary import IndexedOcfFile, build_key_index, write_avro_models
+from pydantic_avro.binary.index import KeyIndex
+from tests.test_binary import EVENTS, Country, Event
+
+
+@pytest.fixture
+def events_file(tmp_path):
+    path = str(tmp_path / "events.avro")
+    with open(path, "wb") as fo:
+        write_avro_models(Event, fo, EVENTS, codec="deflate", block_size=2000)
+    return path
+
+
+def test_string_key_index(events_file):
+    index_path = build_key_index(Event, events_file, "name")
+    assert index_path == f"{events_file}.name.idx"
+    index = KeyIndex(index_path)
+    assert len(index) == len(EVENTS)
+    index.close()
+
+    with IndexedOcfFile(Event, events_file, "name") as indexed:
+        assert indexed.get("event-150") == EVENTS[150]
+        assert indexed.get("event-3") == EVENTS[3]
+        assert indexed.get("unknown") is None
+        assert indexed.get_all("event-42") == [EVENTS[42]]
+
+
+def test_int_and_enum_key_index(events_file, tmp_path):
+    build_key_index(Event, events_file, "created", index_path=str(tmp_path / "created.idx"))
+    with IndexedOcfFile(Event, events_file, "created", index_path=str(tmp_path / "created.idx")) as indexed:
+        assert indexed.get(EVENTS[77].created) == EVENTS[77]
+
+    build_key_index(Event, events_file, "country")
+    with IndexedOcfFile(Event, events_file, "country") as indexed:
+        # Duplicate keys are returned in file order
+        assert indexed.get_all(Country.BE) == [event for event in EVENTS if event.country == Country.BE]
+
+
+def test_key_index_errors(events_file, tmp_path):
+    with pytest.raises(ValueError, match="has no field 'unknown'"):
+        build_key_index(Event, events_file, "unknown")
+    with pytest.raises(ValueError, match="Keys should be ints, strings or bytes"):
+        build_key_index(Event, events_file, "amount")
+
+    build_key_index(Event, events_file, "name")
+    other = str(tmp_path / "other.avro")
+    with open(other, "wb") as fo:
+        write_avro_models(Event, fo, EVENTS[:10])
+    os.rename(f"{events_file}.name.idx", f"{other}.name.idx")
+    with pytest.raises(ValueError, match="was built for another file"):
+        IndexedOcfFile(Event, other, "name")
@@ -0,0 +1,265 @@
+import io
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from fastavro import json_writer, parse_schema, reader, writer
+from pydantic import Field
+
+from pydantic_avro import __main__ as main_module
+from pydantic_avro.base import AvroBase
+from pydantic_avro.binary import (
+    OcfReader,
+    OcfWriter,
+    compile_json_decoder,
+    compile_json_encoder,
+    iter_avro_models,
+    ocf_to_json_lines,
+    write_avro_json,
+    write_avro_models,
+)
+from pydantic_avro.binary.generate import DataGenerator
+from pydantic_avro.binary.jsonl import JSON_FORMATS, json_lines_to_ocf
+from tests.test_binary import EVENTS, Envelope, Event, Variants
+
+SCHEMA = {
+    "type": "record",
+    "name": "Row",
+    "fields": [
+        {"name": "id", "type": "long"},
+        {"name": "price", "type": {"type": "bytes", "logicalType": "decimal", "precision": 10, "scale": 2}},
+        {"name": "hash", "type": {"type": "fixed", "name": "Hash", "size": 4}},
+        {"name": "seen", "type": ["null", {"type": "long", "logicalType": "timestamp-millis"}]},
+        {"name": "value", "type": ["null", "long", "double", "string", {"type": "array", "items": "int"}]},
+        {"name": "children", "type": {"type": "array", "items": "Row"}},
+    ],
+}
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_pydantic_json_lines(workers):
+    # Pydantic writes bytes as UTF-8 text, which the payloads of the later events are not
+    events = EVENTS[:128]
+    lines = [event.model_dump_json() + "\n" for event in events]
+    # Blank lines are skipped
+    lines.insert(3, "\n")
+    fo = io.BytesIO()
+    assert write_avro_json(Event, fo, lines, codec="deflate", workers=workers, chunk_size=30) == len(events)
+    fo.seek(0)
+    assert list(iter_avro_models(Event, fo)) == events
+
+
+def test_discriminated_json_lines():
+    envelopes = [Envelope(payload=Variants[i % 40](kind=f"v{i % 40}", value=i)) for i in range(100)]
+    fo = io.BytesIO()
+    write_avro_json(Envelope, fo, [envelope.model_dump_json().encode() for envelope in envelopes])
+    fo.seek(0)
+    assert list(iter_avro_models(Envelope, fo)) == envelopes
+
+
+class Aliased(AvroBase):
+    user_id: int = Field(..., alias="userId")
+
+
+def test_aliased_json_lines():
+    # The avro fields are named after the aliases
+    instances = [Aliased(userId=i) for i in range(3)]
+    fo = io.BytesIO()
+    write_avro_json(Aliased, fo, [instance.model_dump_json(by_alias=True) for instance in instances])
+    fo.seek(0)
+    assert list(iter_avro_models(Aliased, fo)) == instances
+    with pytest.raises(ValueError, match="Field 'userId' of record 'Aliased' is missing"):
+        write_avro_json(Aliased, io.BytesIO(), [instance.model_dump_json() for instance in instances])
+
+
+def test_avro_json_lines():
+    # The JSON writer of fastavro does not support recursive records
+    schema = dict(SCHEMA, fields=SCHEMA["fields"][:-1])
+    records = DataGenerator(schema, seed=7).records(100)
+    text = io.StringIO()
+    json_writer(text, parse_schema(schema), records)
+    fo = io.BytesIO()
+    assert json_lines_to_ocf(schema, text.getvalue().splitlines(), fo, json_format="avro") == len(records)
+    fo.seek(0)
+    assert list(reader(fo)) == records
+
+
+def test_json_values():
+    encode = compile_json_encoder(SCHEMA)
+    row = {
+        "id": 1,
+        "price": "12.50",
+        "hash": "abcd",
+        "seen": "2024-01-01T00:00:00.001Z",
+        "value": [1, 2],
+        "children": [
+            {"id": 2, "price": 3, "hash": "efgh", "seen": None, "value": 2.5, "children": []},
+            # Integral floats are written to the double, not to the long before it
+            {"id": 3, "price": 3, "hash": "efgh", "seen": None, "value": 1.0, "children": []},
+            {"id": 4, "price": 3, "hash": "efgh", "seen": None, "value": 1, "children": []},
+        ],
+    }
+    buf = bytearray()
+    encode(buf, row)
+    decoded = next(reader(_ocf(bytes(buf))))
+    assert decoded["price"] == Decimal("12.50")
+    assert decoded["seen"].timestamp() == 1704067200.001
+    assert decoded["children"][0]["value"] == 2.5
+    assert [type(child["value"]) for child in decoded["children"]] == [float, float, int]
+
+
+@pytest.mark.parametrize(
+    "change, message",
+    [
+        ({"id": "1"}, "Row.id: Expected an int"),
+        ({"price": "12.505"}, "more than 2 decimal places"),
+        ({"hash": "abc"}, "Row.hash: Fixed value should have 4 bytes"),
+        ({"seen": "yesterday"}, "Row.seen: Expected an ISO formatted timestamp-millis"),
+        ({"value": {"a": 1}}, "does not match any type of union"),
+        ({"children": [{"id": 2}]}, "Field 'price' of record 'Row' is missing"),
+    ],
+)
+def test_invalid_json_values(change, message):
+    row = {"id": 1, "price": "1", "hash": "abcd", "seen": None, "value": None, "children": []}
+    lines = [json.dumps(row), json.dumps(dict(row, **change))]
+    with pytest.raises(ValueError, match=message) as info:
+        json_lines_to_ocf(SCHEMA, lines, io.BytesIO())
+    assert str(info.value).startswith("Line 2: ")
+    with pytest.raises(ValueError, match="Line 1: Expecting"):
+        json_lines_to_ocf(SCHEMA, ["{invalid"], io.BytesIO())
+    with pytest.raises(ValueError, match="Unknown JSON format"):
+        compile_json_encoder(SCHEMA, json_format="yaml")
+
+
+DEFAULTS_SCHEMA = {
+    "type": "record",
+    "name": "Defaults",
+    "fields": [
+        {"name": "id", "type": "long"},
+        # As the schemas of AvroBase models hold defaults
+        {"name": "count", "type": ["null", "long"], "default": 5},
+        {
+            "name": "created",
+            "type": {"type": "long", "logicalType": "timestamp-micros"},
+            "default": "2024-01-01T00:00:00",
+        },
+        # As the avro specification defines defaults
+        {"name": "seen", "type": {"type": "long", "logicalType": "timestamp-millis"}, "default": 1000},
+        {"name": "raw", "type": "bytes", "default": "\u00ff"},
+        {"name": "label", "type": ["string", "null"], "default": "x"},
+        {"name": "comment", "type": ["null", "string"], "default": None},
+    ],
+}
+
+
+@pytest.mark.parametrize("json_format", JSON_FORMATS)
+def test_missing_fields_with_defaults(json_format):
+    fo = io.BytesIO()
+    json_lines_to_ocf(DEFAULTS_SCHEMA, [json.dumps({"id": 1}), json.dumps({"id": 2})], fo, json_format=json_format)
+    fo.seek(0)
+    records = list(OcfReader(fo))
+    assert records[1] == {
+        "id": 2,
+        "count": 5,
+        "created": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        "seen": datetime(1970, 1, 1, 0, 0, 1, tzinfo=timezone.utc),
+        "raw": b"\xff",
+        "label": "x",
+        "comment": None,
+    }
+
+    schema = dict(
+        DEFAULTS_SCHEMA, fields=DEFAULTS_SCHEMA["fields"][:1] + [{"name": "n", "type": "int", "default": "a"}]
+    )
+    with pytest.raises(ValueError, match="Defaults.n: Invalid default: Expected an int"):
+        json_lines_to_ocf(schema, [json.dumps({"id": 1})], io.BytesIO(), json_format=json_format)
+
+
+def _ocf(data: bytes) -> io.BytesIO:
+    fo = io.BytesIO()
+    with OcfWriter(fo, SCHEMA) as writer:
+        writer.write_encoded(data)
+    fo.seek(0)
+    return fo
+
+
+def test_main_json_to_avro(tmp_path):
+    events = EVENTS[:50]
+    source = tmp_path / "events.jsonl"
+    source.write_text("".join(event.model_dump_json() + "\n" for event in events))
+    output = tmp_path / "events.avro"
+    main_module.main(
+        ["json_to_avro", "--model", "tests.test_binary:Event", "--input", str(source), "--output", str(output)]
+    )
+    with open(output, "rb") as fo:
+        assert list(iter_avro_models(Event, fo)) == events
+
+    avsc = tmp_path / "event.avsc"
+    avsc.write_text(json.dumps(Event.avro_schema()))
+    main_module.main(["json_to_avro", "--avsc", str(avsc), "--input", str(source), "--output", str(output)])
+    with open(output, "rb") as fo:
+        assert list(iter_avro_models(Event, fo)) == events
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_export_pydantic_json_lines(workers):
+    events = EVENTS[:128]
+    fo = io.BytesIO()
+    write_avro_models(Event, fo, events, codec="deflate", block_size=2000)
+    fo.seek(0)
+    out = io.BytesIO()
+    assert ocf_to_json_lines(fo, out, workers=workers) == len(events)
+    # The same lines as pydantic writes them
+    assert out.getvalue().decode().splitlines() == [event.model_dump_json() for event in events]
+
+
+def test_export_avro_json_lines():
+    schema = dict(SCHEMA, fields=SCHEMA["fields"][:-1])
+    records = DataGenerator(schema, seed=7).records(100)
+    fo = io.BytesIO()
+    writer(fo, parse_schema(schema), records)
+    fo.seek(0)
+    out = io.BytesIO()
+    ocf_to_json_lines(fo, out, json_format="avro")
+    text = io.StringIO()
+    json_writer(text, parse_schema(schema), records)
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == [
+        json.loads(line) for line in text.getvalue().splitlines()
+    ]
+    # And back
+    back = io.BytesIO()
+    json_lines_to_ocf(schema, out.getvalue().splitlines(), back, json_format="avro")
+    back.seek(0)
+    assert list(reader(back)) == records
+
+
+def test_export_json_values():
+    row = {
+        "id": 1,
+        "price": Decimal("-12.50"),
+        "hash": b"\xffbcd",
+        "seen": None,
+        "value": float("nan"),
+        "children": [],
+    }
+    fo = io.BytesIO()
+    writer(fo, parse_schema(SCHEMA), [row])
+    decode = compile_json_decoder(SCHEMA)
+    with pytest.raises(ValueError, match="not valid UTF-8"):
+        decode(next(OcfReader(io.BytesIO(fo.getvalue())).iter_blocks()).data, 0)
+    row["hash"] = b"abcd"
+    fo = io.BytesIO()
+    writer(fo, parse_schema(SCHEMA), [row])
+    record, _ = decode(next(OcfReader(io.BytesIO(fo.getvalue())).iter_blocks()).data, 0)
+    assert record == {"id": 1, "price": "-12.50", "hash": "abcd", "seen": None, "value": None, "children": []}
+
+
+def test_main_avro_to_json(tmp_path):
+    events = EVENTS[:50]
+    source = tmp_path / "events.avro"
+    with open(source, "wb") as fo:
+        write_avro_models(Event, fo, events)
+    output = tmp_path / "events.jsonl"
+    main_module.main(["avro_to_json", "--input", str(source), "--output", str(output)])
+    assert output.read_text().splitlines() == [event.model_dump_json() for event in events]
@@ -0,0 +1,72 @@
+import io
+
+import pytest
+from pydantic import Field
+
+from pydantic_avro.base import AvroBase
+from pydantic_avro.binary import OcfWriter, compile_encoder, decode_lazy, iter_lazy_models, write_avro_models
+from pydantic_avro.binary.models import model_schema
+from tests.test_binary import EVENTS, Event, dump
+
+
+def encode(event: Event) -> bytes:
+    buf = bytearray()
+    compile_encoder(Event.avro_schema())(buf, dump(event))
+    return bytes(buf)
+
+
+def test_decode_lazy():
+    event = EVENTS[5]
+    data = b"prefix" + encode(event)
+    lazy = decode_lazy(Event, data, pos=6)
+    assert lazy.comment is None
+    assert lazy.address == {"street": "Main", "number": 5}
+    assert lazy["name"] == "event-5"
+    # Only the accessed fields are decoded
+    assert repr(lazy) == "LazyRecord[Event](name='event-5', address={'street': 'Main', 'number': 5}, comment=None)"
+    assert lazy.raw == data[6:]
+    assert lazy.end == len(data)
+    assert lazy.materialize() == event
+
+    with pytest.raises(AttributeError, match="has no field 'unknown'"):
+        lazy.unknown
+    with pytest.raises(KeyError):
+        lazy["unknown"]
+
+
+class Aliased(AvroBase):
+    kind: str = Field(..., alias="type")
+    value: int
+
+
+def test_decode_lazy_aliases():
+    buf = bytearray()
+    compile_encoder(Aliased.avro_schema())(buf, {"type": "a", "value": 1})
+    lazy = decode_lazy(Aliased, bytes(buf))
+    assert lazy.kind == lazy["type"] == "a"
+    assert lazy.materialize() == Aliased(type="a", value=1)
+
+
+def test_iter_lazy_models():
+    fo = io.BytesIO()
+    write_avro_models(Event, fo, EVENTS, codec="deflate", block_size=2000)
+    fo.seek(0)
+    lazy_records = list(iter_lazy_models(Event, fo, filters=[("country", "==", "NL")]))
+    assert [lazy.name for lazy in lazy_records] == [e.name for e in EVENTS if e.country == "NL"]
+    assert [lazy.materialize() for lazy in lazy_records] == [e for e in EVENTS if e.country == "NL"]
+
+    # Records are forwarded without decoding them
+    out = io.BytesIO()
+    with OcfWriter(out, model_schema(Event)) as writer:
+        for lazy in lazy_records:
+            writer.write_encoded(lazy.raw)
+    out.seek(0)
+    assert [lazy.materialize() for lazy in iter_lazy_models(Event, out)] == [e for e in EVENTS if e.country == "NL"]
+
+
+def test_iter_lazy_models_other_schema():
+    fo = io.BytesIO()
+    write_avro_models(Aliased, fo, [Aliased(type="a", value=1)])
+    fo.seek(0)
+    with pytest.raises(ValueError, match="does not have the fields of 'Event'"):
+        list(iter_lazy_models(Event, fo))
@@ -24,3 +24,27 @@ def test_root_main(mock_main):
 
     # Assert that main was called with the correct arguments
     mock_main.assert_called_once_with(["avro_to_pydantic", "--asvc", "test.avsc", "--output", "output.py"])
+
+
+@patch("pydantic_avro.to_avro.precompute.write_schema_cache")
+def test_main_precompute_schemas(mock_write_schema_cache):
+    test_args = ["precompute_schemas", "--module", "pkg.models", "--module", "pkg.events", "--output", "schemas.json"]
+    main_module.main(test_args)
+
+    mock_write_schema_cache.assert_called_once_with(["pkg.models", "pkg.events"], "schemas.json")
+
+
+@patch("pydantic_avro.__main__.convert_file")
+def test_main_avro_to_pydantic_serializers(mock_convert_file):
+    test_args = ["avro_to_pydantic", "--asvc", "test.avsc", "--output", "output.py", "--serializers"]
+    main_module.main(test_args)
+
+    mock_convert_file.assert_called_once_with("test.avsc", "output.py", serializers=True)
+
+
+@patch("pydantic_avro.__main__.convert_file")
+def test_main_avro_to_pydantic_slots(mock_convert_file):
+    test_args = ["avro_to_pydantic", "--asvc", "test.avsc", "--serializers", "--slots"]
+    main_module.main(test_args)
+
+    mock_convert_file.assert_called_once_with("test.avsc", None, serializers=True, slots=True)
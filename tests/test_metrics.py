@@ -0,0 +1,93 @@
+import asyncio
+import io
+
+import pytest
+
+from pydantic_avro.binary import (
+    AsyncOcfWriter,
+    InMemoryCollector,
+    avro_decode_stream,
+    iter_avro_models,
+    set_metrics_collector,
+    to_prometheus,
+    write_avro_models,
+)
+from pydantic_avro.binary.metrics import MetricsCollector
+from tests.test_aio import AsyncSink, chunks, collect
+from tests.test_binary import EVENTS, Event
+
+
+@pytest.fixture
+def collector():
+    collector = InMemoryCollector()
+    set_metrics_collector(collector)
+    yield collector
+    set_metrics_collector(None)
+
+
+def test_metrics(collector):
+    fo = io.BytesIO()
+    write_avro_models(Event, fo, EVENTS, block_size=1000)
+    fo.seek(0)
+    assert list(iter_avro_models(Event, fo, filters=[("country", "==", "NL")])) == [
+        e for e in EVENTS if e.country.value == "NL"
+    ]
+
+    metrics = collector.metrics()
+    encode, decode = metrics[("Event", "encode")], metrics[("Event", "decode")]
+    assert encode.records == len(EVENTS) and sum(encode.buckets) == len(EVENTS)
+    assert decode.records == len([e for e in EVENTS if e.country.value == "NL"])
+    assert encode.nbytes == decode.nbytes > 0
+    assert encode.records_per_second > 0 and decode.bytes_per_second > 0
+
+    text = to_prometheus(collector)
+    assert f'pydantic_avro_records_total{{model="Event",operation="encode"}} {len(EVENTS)}' in text
+    assert f'pydantic_avro_record_latency_seconds_bucket{{model="Event",operation="encode",le="+Inf"}} 200' in text
+    assert "# TYPE pydantic_avro_record_latency_seconds histogram" in text
+
+    collector.reset()
+    assert collector.metrics() == {}
+
+
+def test_metrics_async(collector):
+    sink = AsyncSink()
+
+    async def write():
+        async with AsyncOcfWriter(sink, Event.avro_schema(), block_records=30) as writer:
+            await writer.write_many(EVENTS)
+
+    asyncio.run(write())
+    assert asyncio.run(collect(avro_decode_stream(Event, chunks(sink.fo.getvalue(), 1000)))) == EVENTS
+    metrics = collector.metrics()
+    assert metrics[("Event", "encode")].records == metrics[("Event", "decode")].records == len(EVENTS)
+
+
+def test_metrics_disabled():
+    collector = InMemoryCollector()
+    fo = io.BytesIO()
+    write_avro_models(Event, fo, EVENTS)
+    fo.seek(0)
+    assert list(iter_avro_models(Event, fo)) == EVENTS
+    assert collector.metrics() == {}
+
+
+def test_custom_collector():
+    class Incomplete(MetricsCollector):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+    class Counter(MetricsCollector):
+        records = 0
+
+        def observe(self, model, operation, records, nbytes, seconds):
+            self.records += records
+
+    counter = Counter()
+    set_metrics_collector(counter)
+    try:
+        write_avro_models(Event, io.BytesIO(), EVENTS)
+    finally:
+        set_metrics_collector(None)
+    assert counter.records == len(EVENTS)
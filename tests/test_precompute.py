@@ -0,0 +1,131 @@
+import json
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple
+
+import pytest
+from pydantic import Field
+
+from pydantic_avro.base import AvroBase
+from pydantic_avro.to_avro.config import PYDANTIC_V2
+from pydantic_avro.to_avro.precompute import (
+    clear_schema_cache,
+    find_avro_models,
+    load_schema_cache,
+    model_fingerprint,
+    model_key,
+    precompute_schemas,
+    write_schema_cache,
+)
+
+SCHEMA_METHOD = "model_json_schema" if PYDANTIC_V2 else "schema"
+
+
+class Customer(AvroBase):
+    name: str
+    email: Optional[str] = None
+
+
+class Order(AvroBase):
+    id: int
+    customer: Customer
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    clear_schema_cache()
+    yield
+    clear_schema_cache()
+
+
+def test_find_avro_models():
+    assert set(find_avro_models(__name__)) == {Customer, Order}
+
+
+def test_find_avro_models_in_package():
+    models = set(find_avro_models("tests"))
+    assert {Customer, Order}.issubset(models)
+
+
+def test_precompute_schemas():
+    content = precompute_schemas([__name__])
+    assert content["schemas"][model_key(Order)] == {
+        "fingerprint": model_fingerprint(Order),
+        "schema": Order.avro_schema(),
+    }
+
+
+def test_load_schema_cache(tmp_path, mocker):
+    path = tmp_path / "schemas.json"
+    write_schema_cache([__name__], str(path))
+    expected = Order.avro_schema()
+
+    load_schema_cache(str(path))
+    derive = mocker.patch.object(Order, SCHEMA_METHOD, side_effect=AssertionError("schema derived"))
+    assert Order.avro_schema() == expected
+    assert Order.avro_schema(namespace="shop")["namespace"] == "shop"
+    # Returned schemas are copies
+    Order.avro_schema()["fields"].clear()
+    assert Order.avro_schema() == expected
+    derive.assert_not_called()
+
+
+def test_load_schema_cache_non_default_arguments(tmp_path, mocker):
+    path = tmp_path / "schemas.json"
+    write_schema_cache([__name__], str(path))
+    load_schema_cache(str(path))
+    spy = mocker.spy(Customer, SCHEMA_METHOD)
+    Customer.avro_schema(by_alias=False)
+    assert spy.call_count == 1
+
+
+def test_stale_schema_cache_is_ignored(tmp_path):
+    path = tmp_path / "schemas.json"
+    content = precompute_schemas([__name__])
+    content["schemas"][model_key(Customer)]["fingerprint"] = "stale"
+    content["schemas"][model_key(Customer)]["schema"] = {"stale": True}
+    path.write_text(json.dumps(content))
+
+    load_schema_cache(str(path))
+    assert Customer.avro_schema()["name"] == "Customer"
+
+
+class Unit:
+    """Has the default repr, which includes the address of the instance"""
+
+
+def basket_model(
+    max_digits: int = 10, max_quantity: int = 100, tags: Tuple[str, ...] = (), sku_length: int = 8
+) -> type:
+    class Item(AvroBase):
+        sku: str = Field(..., max_length=sku_length)
+
+    class Basket(AvroBase):
+        items: List[Item] = Field(default_factory=lambda: [])
+        unit: Any = Unit()
+        total: Decimal = Field(..., max_digits=max_digits, decimal_places=2, json_schema_extra={"avro_type": "decimal"})
+        quantity: int = Field(..., ge=0, le=max_quantity)
+        labels: List[str] = list(tags)
+        note: Optional[str] = None
+
+    return Basket
+
+
+def test_fingerprint_is_stable():
+    # The default factories are different lambdas and the defaults different objects, only the parts of the fields
+    # that make the schema count
+    assert model_fingerprint(basket_model()) == model_fingerprint(basket_model())
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"max_digits": 12},
+        # A long instead of an int
+        {"max_quantity": 2**40},
+        {"tags": ("new",)},
+        # In a nested model
+        {"sku_length": 10},
+    ],
+)
+def test_fingerprint_changes(changes):
+    assert model_fingerprint(basket_model()) != model_fingerprint(basket_model(**changes))
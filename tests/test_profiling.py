@@ -0,0 +1,54 @@
+from typing import List, Optional, Union
+
+from pydantic_avro.base import AvroBase
+from pydantic_avro.from_avro.avro_to_pydantic import avsc_to_pydantic
+from pydantic_avro.profiling import active_profile, profile_conversions
+
+
+class Address(AvroBase):
+    street: str
+    number: Optional[int] = None
+
+
+class Person(AvroBase):
+    name: str
+    home: Address
+    work: Optional[Address] = None
+    previous: List[Address] = []
+    value: Union[int, str, None] = None
+
+
+def test_profile_avro_schema():
+    phases = []
+    with profile_conversions(on_phase=lambda *args: phases.append(args)) as profile:
+        schema = Person.avro_schema()
+    assert active_profile() is None
+    assert schema == Person.avro_schema()
+
+    timings = profile.timings["Person"]
+    assert set(timings) == {"model_json_schema", "fields", "references", "unions"}
+    assert all(seconds >= 0 for seconds in timings.values())
+    assert dict(profile.counts["Person"]) == {
+        "fields": 7,
+        "definitions": 1,
+        "references_reused": 2,
+        "unions": 3,
+    }
+    assert {phase for _, phase, _ in phases} == set(timings)
+    assert abs(sum(seconds for _, _, seconds in phases) - sum(timings.values())) < 1e-9
+    assert profile.slowest(1)[0][2] == max(timings.values())
+
+
+def test_profile_avsc_to_pydantic():
+    schema = {
+        "type": "record",
+        "name": "Order",
+        "fields": [
+            {"name": "id", "type": "long"},
+            {"name": "line", "type": {"type": "record", "name": "Line", "fields": [{"name": "n", "type": "int"}]}},
+        ],
+    }
+    with profile_conversions() as profile:
+        avsc_to_pydantic(schema, serializers=True, slots=True)
+    assert set(profile.timings["Order"]) == {"types", "slots", "serializers"}
+    assert profile.to_dict()["counts"] == {"Order": {"definitions": 2}}
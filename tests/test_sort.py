@@ -0,0 +1,90 @@
+import io
+import random
+
+import pytest
+from fastavro import parse_schema, reader, schemaless_reader, schemaless_writer, writer
+
+from pydantic_avro.binary import compile_comparator, compile_sort_key, sort_ocf
+from pydantic_avro.binary.generate import DataGenerator
+
+SCHEMA = {
+    "type": "record",
+    "name": "Row",
+    "fields": [
+        {"name": "country", "type": {"type": "enum", "name": "Country", "symbols": ["NL", "BE", "DE"]}},
+        {"name": "day", "type": {"type": "int", "logicalType": "date"}, "order": "descending"},
+        {"name": "name", "type": "string"},
+        {"name": "score", "type": ["null", "double"]},
+        {"name": "tags", "type": {"type": "array", "items": "string"}},
+        {"name": "attributes", "type": {"type": "map", "values": "long"}, "order": "ignore"},
+    ],
+}
+SYMBOLS = ["NL", "BE", "DE"]
+
+
+def expected_key(row: dict) -> tuple:
+    score = (0, None) if row["score"] is None else (1, row["score"])
+    return SYMBOLS.index(row["country"]), -row["day"].toordinal(), row["name"].encode(), score, row["tags"]
+
+
+def encode(row: dict) -> bytes:
+    fo = io.BytesIO()
+    schemaless_writer(fo, parse_schema(SCHEMA), row)
+    return fo.getvalue()
+
+
+ROWS = DataGenerator(SCHEMA, seed=3).records(300)
+for i, row in enumerate(ROWS):
+    # Few distinct values, so the later fields decide the order too
+    row["day"] = ROWS[i % 4]["day"]
+    row["name"] = ["ä", "a", "z", "é"][i % 3]
+    row["tags"] = [["x"], ["x", "y"], []][i % 3]
+
+
+def test_sort_key():
+    read_key = compile_sort_key(SCHEMA)
+    encoded = sorted((encode(row) for row in ROWS), key=lambda data: read_key(data, 0)[0])
+    decoded = [schemaless_reader(io.BytesIO(data), parse_schema(SCHEMA), None) for data in encoded]
+    assert [expected_key(row) for row in decoded] == sorted(expected_key(row) for row in ROWS)
+
+
+def test_comparator():
+    compare = compile_comparator(SCHEMA)
+    a, b = ROWS[0], dict(ROWS[0], attributes={"other": 1})
+    # Ignored fields are not compared
+    assert compare(encode(a), encode(b)) == 0
+    assert compare(encode(dict(a, name="a")), encode(dict(a, name="b"))) == -1
+    assert compare(encode(dict(a, country="DE")), encode(dict(a, country="BE"))) == 1
+    assert compare(encode(dict(a, score=None)), encode(dict(a, score=-1.0))) == -1
+
+    by_name = compile_comparator(SCHEMA, fields=["name", "country"])
+    assert by_name(encode(dict(a, name="a", country="DE")), encode(dict(a, name="b", country="NL"))) == -1
+
+
+def test_sort_key_errors():
+    with pytest.raises(ValueError, match="Maps can not be compared"):
+        compile_sort_key({"type": "map", "values": "long"})
+    with pytest.raises(ValueError, match=r"Fields \['unknown'\] do not exist"):
+        compile_sort_key(SCHEMA, fields=["unknown"])
+    with pytest.raises(ValueError, match="Invalid order 'up'"):
+        compile_sort_key({"type": "record", "name": "R", "fields": [{"name": "a", "type": "int", "order": "up"}]})
+
+
+@pytest.mark.parametrize("memory_limit", [100, 1_000_000])
+def test_sort_ocf(memory_limit, tmp_path):
+    rows = list(ROWS)
+    random.Random(1).shuffle(rows)
+    fo = io.BytesIO()
+    writer(fo, parse_schema(SCHEMA), rows, codec="deflate", metadata={"origin": "test"})
+    fo.seek(0)
+    out = io.BytesIO()
+    assert sort_ocf(fo, out, fields=["name", "day"], memory_limit=memory_limit, tmp_dir=str(tmp_path)) == len(rows)
+    out.seek(0)
+    sorted_rows = list(reader(out))
+    # A stable sort on the name and descending day
+    assert sorted_rows == sorted(rows, key=lambda row: (row["name"].encode(), -row["day"].toordinal()))
+    out.seek(0)
+    assert reader(out).metadata["origin"] == "test"
+    assert reader(io.BytesIO(out.getvalue())).codec == "deflate"
+    # The temporary files are removed
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,94 @@
+import io
+import os
+import random
+
+import pytest
+
+from pydantic_avro.binary import (
+    InMemoryCollector,
+    file_splits,
+    iter_avro_models,
+    iter_split_models,
+    ocf,
+    set_metrics_collector,
+    write_avro_models,
+)
+from pydantic_avro.binary.split import iter_split_records
+from pydantic_avro.binary.stats import FileStats
+from tests.test_binary import EVENTS, Event
+
+
+@pytest.fixture(scope="module")
+def events_file(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("split") / "events.avro")
+    with open(path, "wb") as fo:
+        write_avro_models(Event, fo, EVENTS, codec="deflate", block_size=1000)
+    return path
+
+
+@pytest.mark.parametrize("split_size", [10, 333, 4096, 10**9])
+def test_splits_read_every_record_once(events_file, split_size):
+    splits = file_splits(events_file, split_size)
+    assert sum(length for _, length in splits) == os.path.getsize(events_file)
+    events = [event for start, length in splits for event in iter_split_models(Event, events_file, start, length)]
+    assert events == EVENTS
+
+
+def test_uneven_splits(events_file, monkeypatch):
+    # Sync markers that cross the scanned chunks are found
+    monkeypatch.setattr(ocf, "SCAN_SIZE", 7)
+    size = os.path.getsize(events_file)
+    bounds = sorted({0, size, *random.Random(5).sample(range(size), 20)})
+    names = [
+        record["name"]
+        for start, end in zip(bounds, bounds[1:])
+        for record in iter_split_records(events_file, start, end - start)
+    ]
+    assert names == [event.name for event in EVENTS]
+
+
+def test_split_filters(events_file):
+    filters = [("count", ">=", 150)]
+    splits = file_splits(events_file, 2000)
+    events = [
+        event for start, length in splits for event in iter_split_models(Event, events_file, start, length, filters)
+    ]
+    assert events == EVENTS[150:]
+    with pytest.raises(ValueError, match="split size should be positive"):
+        file_splits(events_file, 0)
+
+
+def test_split_options(tmp_path):
+    path = str(tmp_path / "events.avro")
+    with open(path, "wb") as fo:
+        stats = write_avro_models(Event, fo, EVENTS, block_size=1000, stats_fields=["name", "country"])
+    splits = file_splits(path, 3000)
+    filters = [("name", ">=", "event-50"), ("country", "==", "NL")]
+    with open(path, "rb") as fo:
+        expected = list(iter_avro_models(Event, fo, filters=filters, intern_strings={"name": 10}, stats=stats))
+    assert expected
+
+    # Statistics that were stored with the file, e.g. next to it
+    text = io.StringIO()
+    stats.dump(text)
+    text.seek(0)
+    stats = FileStats.load(text)
+    collector = InMemoryCollector()
+    set_metrics_collector(collector)
+    try:
+        events = [
+            event
+            for start, length in splits
+            for event in iter_split_models(
+                Event, path, start, length, filters, intern_strings={"name": 10}, stats=stats
+            )
+        ]
+    finally:
+        set_metrics_collector(None)
+    assert events == expected
+    assert collector.metrics()[("Event", "decode")].records == len(expected)
+
+    # The offsets of the blocks are needed to match the blocks of a split with their statistics
+    stats.offsets = []
+    with pytest.raises(ValueError, match="no block offsets"):
+        list(iter_split_models(Event, path, 0, 3000, filters, stats=stats))
@@ -0,0 +1,83 @@
+import io
+from datetime import timedelta
+
+import pytest
+
+from pydantic_avro.binary import FileStats, OcfReader, iter_avro_models, write_avro_models
+from tests.test_binary import EVENTS, Country, Event
+
+STATS_FIELDS = ["created", "name", "country", "amount", "comment"]
+
+
+@pytest.fixture(scope="module")
+def written():
+    fo = io.BytesIO()
+    stats = write_avro_models(Event, fo, EVENTS, codec="deflate", block_size=2000, stats_fields=STATS_FIELDS)
+    return fo.getvalue(), stats
+
+
+def test_block_stats(written):
+    data, stats = written
+    reader = OcfReader(io.BytesIO(data))
+    blocks = list(reader.iter_blocks())
+    assert len(blocks) > 5
+    assert len(stats.blocks) == len(blocks)
+    assert stats.sync_marker == reader.sync_marker
+    # In the order of the record
+    assert stats.fields == ["name", "country", "amount", "created", "comment"]
+
+    first = stats.blocks[0]
+    assert first["name"][0] == b"event-0"
+    assert first["amount"][:2] == [0.0, (blocks[0].num_records - 1) * 1.5]
+    assert first["country"] == [0, 2, 0]
+    assert first["comment"][2] == sum(1 for event in EVENTS[: blocks[0].num_records] if event.comment is None)
+
+    # Strings are kept as bytes through JSON
+    out = io.StringIO()
+    stats.dump(out)
+    out.seek(0)
+    loaded = FileStats.load(out)
+    assert loaded.blocks == stats.blocks
+    assert loaded.sync_marker == stats.sync_marker
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        [("created", ">=", EVENTS[150].created)],
+        [("created", "<", EVENTS[10].created), ("country", "==", Country.BE)],
+        [("amount", "in", [3.0, 250.5])],
+        [("name", "==", "event-99")],
+        [("comment", "==", None)],
+        [("comment", "!=", "note")],
+        [("count", ">", 190)],
+    ],
+)
+def test_skip_blocks(written, filters):
+    data, stats = written
+    expected = list(iter_avro_models(Event, io.BytesIO(data), filters=filters))
+    assert list(iter_avro_models(Event, io.BytesIO(data), filters=filters, stats=stats)) == expected
+
+
+def test_skipped_blocks_are_not_decompressed(written):
+    data, stats = written
+    may_match = stats.block_filter(Event.avro_schema(), [("created", ">", EVENTS[-1].created - timedelta(minutes=1))])
+    assert [i for i in range(len(stats.blocks)) if may_match(i)] == [len(stats.blocks) - 1]
+    may_match = stats.block_filter(Event.avro_schema(), [("created", ">", EVENTS[-1].created)])
+    assert not any(may_match(i) for i in range(len(stats.blocks)))
+    # Filters on fields without statistics keep all blocks
+    may_match = stats.block_filter(Event.avro_schema(), [("count", "==", -1)])
+    assert all(may_match(i) for i in range(len(stats.blocks)))
+
+
+def test_stats_errors(written):
+    data, stats = written
+    with pytest.raises(ValueError, match="Field 'tags' has no statistics"):
+        write_avro_models(Event, io.BytesIO(), EVENTS, stats_fields=["tags"])
+    with pytest.raises(ValueError, match=r"Fields \['unknown'\] do not exist"):
+        write_avro_models(Event, io.BytesIO(), EVENTS, stats_fields=["unknown"])
+
+    other = io.BytesIO()
+    write_avro_models(Event, other, EVENTS[:3])
+    with pytest.raises(ValueError, match="written for another file"):
+        list(iter_avro_models(Event, io.BytesIO(other.getvalue()), filters=[("name", "==", "x")], stats=stats))
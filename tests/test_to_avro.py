@@ -5,10 +5,12 @@ import sys
 import tempfile
 import uuid
 from datetime import date, datetime, time, timezone
+from decimal import Decimal
 from pprint import pprint
 from typing import Dict, List, Literal, Optional, Tuple, Type, Union
 from uuid import UUID
 
+import pytest
 from avro import schema as avro_schema
 from fastavro import parse_schema, reader, writer
 from pydantic import Field
@@ -754,3 +756,115 @@ def test_union_with_avro_type():
         for t in field_types
     )
     assert has_timestamp_millis
+
+
+def test_decimal_precision_and_scale():
+    """Test that max_digits and decimal_places become the precision and scale of decimals"""
+    if not PYDANTIC_V2:
+        # Pydantic v1 leaves the decimal constraints out of the JSON schema
+        return
+
+    class DecimalModel(AvroBase):
+        amount: Decimal = Field(..., max_digits=10, decimal_places=2, json_schema_extra={"avro_type": "decimal"})
+        fee: Optional[Decimal] = Field(None, max_digits=6, decimal_places=3, json_schema_extra={"avro_type": "decimal"})
+        total: Decimal = Field(
+            ..., max_digits=20, decimal_places=4, json_schema_extra={"avro_type": "decimal", "avro_fixed_size": 9}
+        )
+        subtotal: Decimal = Field(
+            ..., max_digits=20, decimal_places=4, json_schema_extra={"avro_type": "decimal", "avro_fixed_size": 9}
+        )
+
+    result = DecimalModel.avro_schema()
+    assert result["fields"] == [
+        {"name": "amount", "type": {"type": "bytes", "logicalType": "decimal", "precision": 10, "scale": 2}},
+        {
+            "name": "fee",
+            "type": ["null", {"type": "bytes", "logicalType": "decimal", "precision": 6, "scale": 3}],
+            "default": None,
+        },
+        {
+            "name": "total",
+            "type": {
+                "type": "fixed",
+                "name": "decimal_9_20_4",
+                "size": 9,
+                "logicalType": "decimal",
+                "precision": 20,
+                "scale": 4,
+            },
+        },
+        {"name": "subtotal", "type": "decimal_9_20_4"},
+    ]
+
+    record = DecimalModel(amount=Decimal("12.34"), fee=None, total=Decimal("-1.5"), subtotal=Decimal("100"))
+    with tempfile.TemporaryDirectory() as dir:
+        with open(os.path.join(dir, "test.avro"), "wb") as fh:
+            writer(fh, parse_schema(result), [dump(record)])
+        with open(os.path.join(dir, "test.avro"), "rb") as fh:
+            records = list(reader(fh))
+    assert parse(DecimalModel, records[0]) == record
+
+
+def test_decimal_does_not_fit_fixed():
+    if not PYDANTIC_V2:
+        return
+
+    class TooSmall(AvroBase):
+        amount: Decimal = Field(..., max_digits=10, json_schema_extra={"avro_type": "decimal", "avro_fixed_size": 2})
+
+    with pytest.raises(ValueError, match="does not fit in a fixed of 2 bytes"):
+        TooSmall.avro_schema()
+
+
+def test_fixed():
+    """Test that avro_type fixed takes the size from avro_fixed_size or a fixed length"""
+
+    class FixedModel(AvroBase):
+        id: bytes = Field(..., min_length=16, max_length=16, json_schema_extra={"avro_type": "fixed"})
+        digest: bytes = Field(..., json_schema_extra={"avro_type": "fixed", "avro_fixed_size": 32})
+        parent: Optional[bytes] = Field(None, json_schema_extra={"avro_type": "fixed", "avro_fixed_size": 16})
+
+    result = FixedModel.avro_schema()
+    assert result["fields"] == [
+        {"name": "id", "type": {"type": "fixed", "name": "fixed_16", "size": 16}},
+        {"name": "digest", "type": {"type": "fixed", "name": "fixed_32", "size": 32}},
+        {"name": "parent", "type": ["null", "fixed_16"], "default": None},
+    ]
+
+    record = FixedModel(id=b"a" * 16, digest=b"b" * 32, parent=b"c" * 16)
+    with tempfile.TemporaryDirectory() as dir:
+        with open(os.path.join(dir, "test.avro"), "wb") as fh:
+            writer(fh, parse_schema(result), [dump(record)])
+        with open(os.path.join(dir, "test.avro"), "rb") as fh:
+            records = list(reader(fh))
+    assert parse(FixedModel, records[0]) == record
+
+
+def test_fixed_without_size():
+    class NoSize(AvroBase):
+        id: bytes = Field(..., json_schema_extra={"avro_type": "fixed"})
+
+    with pytest.raises(ValueError, match="needs an avro_fixed_size or a fixed length"):
+        NoSize.avro_schema()
+
+
+def test_avro_order():
+    """Test that avro_order becomes the sort order of a field"""
+
+    class Sorted(AvroBase):
+        day: date = Field(..., json_schema_extra={"avro_order": "descending"})
+        name: str
+        note: Optional[str] = Field(None, json_schema_extra={"avro_order": "ignore"})
+
+    result = Sorted.avro_schema()
+    assert result["fields"] == [
+        {"name": "day", "type": {"type": "int", "logicalType": "date"}, "order": "descending"},
+        {"name": "name", "type": "string"},
+        {"name": "note", "type": ["null", "string"], "default": None, "order": "ignore"},
+    ]
+
+    class Invalid(AvroBase):
+        name: str = Field(..., json_schema_extra={"avro_order": "random"})
+
+    with pytest.raises(ValueError, match="avro_order 'random'"):
+        Invalid.avro_schema()